@@ -7,6 +7,7 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLabel,
 from PyQt6.QtCore import Qt, pyqtSignal
 from utils.json_utils import load_json, save_json
 from utils.helpers import resource_path
+from utils import startup_profiler
 
 
 class AdminLoginDialog(QDialog):
@@ -92,7 +93,8 @@ class AuthController:
 
     def __init__(self, json_path: str = None):
         self.json_file = json_path or resource_path("data/admins.json")
-        self._init_json()
+        with startup_profiler.span("AuthController._init_json"):
+            self._init_json()
 
     def _init_json(self):
         """Инициализация файла JSON для хранения администраторов"""
@@ -1,6 +1,6 @@
-import json
 from PyQt6.QtWidgets import (QDialog, QFormLayout, QLineEdit, QPushButton,
                              QVBoxLayout, QLabel, QFileDialog, QMessageBox, QSpinBox, QHBoxLayout)
+from core import category_manager
 
 
 class CategoryEditor(QDialog):
@@ -50,17 +50,13 @@ class CategoryEditor(QDialog):
             self.icon_path_input.setText(file_path)
 
     def load_category_data(self):
-        """Загрузка данных категории из JSON"""
-        try:
-            with open("categories.json", "r", encoding="utf-8") as file:
-                categories = json.load(file)
-
-            category = next((cat for cat in categories if cat["id"] == self.category_id), None)
-            if category:
-                self.name_input.setText(category["name"])
-                self.icon_path_input.setText(category.get("icon_path", ""))
-                self.sort_order_input.setValue(category.get("sort_order", 1))
-        except (FileNotFoundError, json.JSONDecodeError):
+        """Загрузка данных категории из каталога"""
+        category = category_manager.get_category(self.category_id)
+        if category:
+            self.name_input.setText(category["name"])
+            self.icon_path_input.setText(category.get("icon_path") or "")
+            self.sort_order_input.setValue(category.get("sort_order", 1))
+        else:
             QMessageBox.critical(self, "Ошибка", "Не удалось загрузить данные категории!")
 
     def save_category(self):
@@ -74,33 +70,11 @@ class CategoryEditor(QDialog):
             return
 
         try:
-            # Загрузка существующих категорий
-            try:
-                with open("categories.json", "r", encoding="utf-8") as file:
-                    categories = json.load(file)
-            except (FileNotFoundError, json.JSONDecodeError):
-                categories = []
-
-            # Обновление или добавление категории
+            # Изменения попадают в общий каталог и записываются очередью отложенной записи
             if self.category_id:
-                for category in categories:
-                    if category["id"] == self.category_id:
-                        category["name"] = name
-                        category["icon_path"] = icon_path
-                        category["sort_order"] = sort_order
-                        break
+                category_manager.update_category(self.category_id, name, icon_path, sort_order)
             else:
-                new_id = max((cat["id"] for cat in categories), default=0) + 1
-                categories.append({
-                    "id": new_id,
-                    "name": name,
-                    "icon_path": icon_path,
-                    "sort_order": sort_order
-                })
-
-            # Сохранение данных в JSON
-            with open("categories.json", "w", encoding="utf-8") as file:
-                json.dump(categories, file, indent=4, ensure_ascii=False)
+                category_manager.add_category(name, icon_path, sort_order)
 
             QMessageBox.information(self, "Успех", "Категория успешно сохранена!")
             self.accept()
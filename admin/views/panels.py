@@ -2,12 +2,16 @@ import json
 import os
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTabWidget, QListWidget, QPushButton,
                              QHBoxLayout, QFormLayout, QLineEdit, QLabel, QSlider,
-                             QFontComboBox, QMessageBox, QListWidgetItem, QDialog, QFileDialog, QColorDialog)
+                             QFontComboBox, QMessageBox, QDialog, QFileDialog, QColorDialog)
 from PyQt6.QtGui import QColor
 from PyQt6.QtCore import Qt
 from .dialogs.auth import ChangePasswordDialog
 from .dialogs.category import CategoryEditor
 from .dialogs.app import main
+from core import app_manager, category_manager
+from core.catalog_store import get_store
+from ui.components.keyed_layout import reconcile_list_widget
+from utils.json_utils import load_json, save_json_deferred
 
 
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTabWidget, QMessageBox, QDialog
@@ -158,23 +162,18 @@ class AdminPanel(QWidget):
 
 
     def load_categories(self):
-        """Загрузка списка категорий из JSON"""
-        self.categories_list.clear()
+        """Загрузка списка категорий из JSON (меняются только изменившиеся строки)"""
         try:
-            with open(self.categories_file, "r", encoding="utf-8") as file:
-                categories = json.load(file)
-            for category in categories:
-                item = QListWidgetItem(category["name"])
-                item.setData(Qt.ItemDataRole.UserRole, category["id"])
-                self.categories_list.addItem(item)
+            categories = category_manager.get_all_categories(self.categories_file)
+            reconcile_list_widget(self.categories_list, categories, lambda category: category["name"],
+                                  key=lambda category: category["id"])
         except (FileNotFoundError, json.JSONDecodeError):
             QMessageBox.warning(self, "Ошибка", "Не удалось загрузить категории!")
 
     def save_categories(self, categories):
         """Сохранение списка категорий в JSON"""
         try:
-            with open(self.categories_file, "w", encoding="utf-8") as file:
-                json.dump(categories, file, indent=4, ensure_ascii=False)
+            get_store(self.categories_file).replace_all(categories)
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить категории: {e}")
 
@@ -205,10 +204,7 @@ class AdminPanel(QWidget):
 
         cat_id = selected.data(Qt.ItemDataRole.UserRole)
         try:
-            with open(self.categories_file, "r", encoding="utf-8") as file:
-                categories = json.load(file)
-            categories = [cat for cat in categories if cat["id"] != cat_id]
-            self.save_categories(categories)
+            category_manager.delete_category(cat_id, self.categories_file)
             self.load_categories()
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось удалить категорию: {e}")
@@ -220,24 +216,19 @@ class AdminPanel(QWidget):
 
 
     def load_apps(self):
-        """Загрузка списка приложений из JSON"""
-        self.apps_list.clear()
+        """Загрузка списка приложений из JSON (меняются только изменившиеся строки)"""
         try:
-            with open(self.apps_file, "r", encoding="utf-8") as file:
-                apps = json.load(file)
-            for app in apps:
-                item_text = f"{app['name']} ({app.get('category_id', 'Без категории')})"
-                item = QListWidgetItem(item_text)
-                item.setData(Qt.ItemDataRole.UserRole, app["id"])
-                self.apps_list.addItem(item)
+            apps = app_manager.get_all_apps(self.apps_file)
+            reconcile_list_widget(self.apps_list, apps,
+                                  lambda app: f"{app['name']} ({app.get('category_id', 'Без категории')})",
+                                  key=lambda app: app["id"])
         except (FileNotFoundError, json.JSONDecodeError):
             QMessageBox.warning(self, "Ошибка", "Не удалось загрузить приложения!")
 
     def save_apps(self, apps):
         """Сохранение списка приложений в JSON"""
         try:
-            with open(self.apps_file, "w", encoding="utf-8") as file:
-                json.dump(apps, file, indent=4, ensure_ascii=False)
+            get_store(self.apps_file).replace_all(apps)
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить приложения: {e}")
 
@@ -268,10 +259,7 @@ class AdminPanel(QWidget):
 
         app_id = selected.data(Qt.ItemDataRole.UserRole)
         try:
-            with open(self.apps_file, "r", encoding="utf-8") as file:
-                apps = json.load(file)
-            apps = [app for app in apps if app["id"] != app_id]
-            self.save_apps(apps)
+            app_manager.delete_app(app_id, self.apps_file)
             self.load_apps()
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось удалить приложение: {e}")
@@ -283,8 +271,10 @@ class AdminPanel(QWidget):
     def load_settings(self):
         """Загрузка настроек из JSON"""
         try:
-            with open(self.settings_file, "r", encoding="utf-8") as file:
-                settings = json.load(file)
+            settings = load_json(self.settings_file)
+            if settings is None:
+                QMessageBox.warning(self, "Ошибка", "Не удалось загрузить файл настроек!")
+                return
 
             # Проверяем, что загруженные данные — это словарь
             if not isinstance(settings, dict):
@@ -297,10 +287,6 @@ class AdminPanel(QWidget):
             self.bg_color_preview.color = bg_color
             self.opacity_slider.setValue(int(settings.get("opacity", 0.9) * 100))
             self.font_combo.setCurrentText(settings.get("font_family", "Arial"))
-        except FileNotFoundError:
-            QMessageBox.warning(self, "Ошибка", "Файл настроек не найден!")
-        except json.JSONDecodeError:
-            QMessageBox.critical(self, "Ошибка", "Файл настроек имеет неверный формат JSON!")
         except ValueError as e:
             QMessageBox.critical(self, "Ошибка", f"Ошибка в данных настроек: {e}")
 
@@ -318,8 +304,7 @@ class AdminPanel(QWidget):
             "font_family": font_family
         }
         try:
-            with open(self.settings_file, "w", encoding="utf-8") as file:
-                json.dump(settings, file, indent=4, ensure_ascii=False)
+            save_json_deferred(self.settings_file, settings)
             QMessageBox.information(self, "Сохранено", "Настройки успешно сохранены!")
             if self.main_window:
                 self.main_window.apply_settings()
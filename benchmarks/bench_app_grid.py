@@ -0,0 +1,81 @@
+"""Сетка плиток (модель/представление) против кнопки на каждое приложение.
+
+Запуск из корня репозитория: python -m benchmarks.bench_app_grid
+Работает на платформе Qt offscreen. Оба варианта строятся, показываются в
+окне одного размера и отрисовываются одинаково: печатается время построения
+и время до первой отрисовки.
+"""
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QHBoxLayout, QPushButton, QWidget  # noqa: E402
+
+from benchmarks.bench_snapshot import make_apps  # noqa: E402
+from ui.components.app_grid import AppGridView, AppListModel  # noqa: E402
+
+
+def build_buttons(apps):
+    container = QWidget()
+    layout = QHBoxLayout(container)
+    for app in apps:
+        button = QPushButton(app["name"])
+        button.setStyleSheet(f"QPushButton {{ background-color: {app['bg_color']}; border-radius: 10px; }}")
+        layout.addWidget(button)
+    return container
+
+
+def build_grid(apps):
+    return AppGridView(AppListModel(apps))
+
+
+def first_paint(widget):
+    """Показать виджет, обработать события раскладки и отрисовать его"""
+    widget.resize(1280, 800)
+    widget.show()
+    QApplication.processEvents()
+    widget.repaint()
+
+
+def scroll_frames(grid, frames=100):
+    """Время кадра при прокрутке на высоту окна"""
+    bar = grid.verticalScrollBar()
+    samples = []
+    for i in range(frames):
+        start = time.perf_counter()
+        bar.setValue(min(bar.maximum(), i * grid.viewport().height()))
+        grid.viewport().repaint()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    app = QApplication(sys.argv)
+    for count in (1_000, 10_000):
+        container, ms = timed(build_buttons, make_apps(count))
+        _, paint_ms = timed(first_paint, container)
+        print(f"Кнопки {count:>7}: построение {ms:9.1f} мс  первая отрисовка {paint_ms:9.1f} мс")
+        container.deleteLater()
+        QApplication.processEvents()
+    for count in (1_000, 10_000, 100_000):
+        grid, ms = timed(build_grid, make_apps(count))
+        _, paint_ms = timed(first_paint, grid)
+        median, worst = scroll_frames(grid)
+        print(f"Сетка  {count:>7}: построение {ms:9.1f} мс  первая отрисовка {paint_ms:9.1f} мс  "
+              f"кадр прокрутки p50 {median:.2f} мс, max {worst:.2f} мс")
+        grid.deleteLater()
+        QApplication.processEvents()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
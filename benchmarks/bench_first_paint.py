@@ -0,0 +1,58 @@
+"""Время до первой отрисовки лаунчера: все экраны сразу против ленивого построения.
+
+Запуск из корня репозитория: python -m benchmarks.bench_first_paint
+Каждый замер идёт в отдельном процессе (платформа Qt offscreen).
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+
+
+def child():
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication, QStackedWidget
+    from core.launcher import Launcher
+    from utils import style_manager
+
+    app = QApplication(sys.argv)
+    style_manager.apply(app)
+    launcher = Launcher(QStackedWidget())
+    launcher.show()
+
+    def wait_for_paint():
+        if launcher.first_paint_ms is None:
+            QTimer.singleShot(1, wait_for_paint)
+            return
+        print(f"{launcher.first_paint_ms:.3f}")
+        app.quit()
+
+    QTimer.singleShot(0, wait_for_paint)
+    app.exec()
+
+
+def measure(lazy):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", LAUNCHER_PREFETCH="0",
+               LAUNCHER_LAZY_SCREENS="1" if lazy else "0")
+    samples = []
+    for _ in range(RUNS):
+        result = subprocess.run([sys.executable, "-m", "benchmarks.bench_first_paint", "--child"],
+                                env=env, capture_output=True, text=True, check=True)
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def main():
+    eager_ms = measure(lazy=False)
+    lazy_ms = measure(lazy=True)
+    print(f"Все экраны сразу: {eager_ms:8.1f} мс")
+    print(f"Ленивые экраны:   {lazy_ms:8.1f} мс  ускорение x{eager_ms / lazy_ms:.1f}")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        child()
+    else:
+        main()
@@ -0,0 +1,52 @@
+"""Задержка автодополнения на каждое нажатие клавиши на синтетическом каталоге.
+
+Запуск из корня репозитория: python -m benchmarks.bench_prefix [--entries 100000] [--max-ms N]
+Каталог тот же, что в bench_search (названия по закону Ципфа, наполовину
+кириллицей). Каждое название набирается по одной букве, как в строке
+поиска: после первой буквы следующие сужают закэшированный результат
+предыдущей. Печатаются p50/p99 задержки и счётчики кэша. С --max-ms код
+возврата 1, если p99 нажатия превысил порог.
+"""
+import argparse
+import gc
+import random
+import statistics
+import sys
+import time
+
+from benchmarks.bench_search import make_catalog, percentile
+from core.prefix_index import PrefixIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=8, help="подсказок на нажатие")
+    parser.add_argument("--max-ms", type=float, help="порог p99 задержки нажатия")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    records = make_catalog(rng, args.entries)
+    index = PrefixIndex()
+    start = time.perf_counter()
+    index.load("apps", records)
+    print(f"Построение индекса на {args.entries} записей: {time.perf_counter() - start:.2f} с")
+    gc.freeze()  # сборщик мусора не должен попадать в замеры отдельных нажатий
+
+    keystrokes = []
+    for record in rng.sample(records, args.queries):
+        name = record["name"]
+        for length in range(1, len(name) + 1):
+            start = time.perf_counter()
+            index.complete(name[:length], args.limit)
+            keystrokes.append((time.perf_counter() - start) * 1000)
+
+    p99 = percentile(keystrokes, 0.99)
+    print(f"нажатие: p50 {statistics.median(keystrokes):6.3f} мс  p99 {p99:6.3f} мс  ({len(keystrokes)} запросов)")
+    print(f"кэш: попаданий {index.cache_hits}, сужений {index.narrowed}, поисков по массиву {index.misses}")
+    return 1 if args.max_ms is not None and p99 > args.max_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Задержка одного сохранения каталога для каждой политики fsync.
+
+Запуск из корня репозитория: python -m benchmarks.bench_save_json
+"""
+import os
+import statistics
+import tempfile
+import time
+
+from utils import file_storage
+
+
+def make_apps(count):
+    return [{
+        "id": i,
+        "name": f"Приложение {i}",
+        "path": f"C:\\Apps\\app{i}.exe",
+        "category_id": i % 10,
+        "icon_path": "",
+        "bg_color": "#4682B4",
+        "is_square": bool(i % 2)
+    } for i in range(1, count + 1)]
+
+
+def bench(mode, apps, repeats):
+    file_storage.set_durability(mode)
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "apps.json")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            file_storage.atomic_write_json(path, apps)
+            samples.append((time.perf_counter() - start) * 1000)
+        file_storage.sync_pending()
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    for count in (100, 5000):
+        apps = make_apps(count)
+        for mode in file_storage.DURABILITY_MODES:
+            p50, p99 = bench(mode, apps, repeats=200 if count <= 100 else 50)
+            print(f"{count:>6} записей  {mode:<8} p50={p50:7.3f} мс  p99={p99:7.3f} мс")
+    file_storage.set_durability("always")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Задержка поиска на каждое нажатие клавиши на синтетическом каталоге.
+
+Запуск из корня репозитория: python -m benchmarks.bench_search [--entries 100000] [--max-ms N]
+Названия собираются из словаря с частотами по закону Ципфа (как в живых
+каталогах, где одни слова встречаются гораздо чаще других), наполовину
+кириллицей. Запросы — названия случайных записей, набираемые по одной
+букве, и те же названия с одной пропущенной буквой. С --max-ms код
+возврата 1, если p99 нажатия превысил порог.
+"""
+import argparse
+import gc
+import random
+import statistics
+import sys
+import time
+
+from core.search_index import SearchIndex
+
+CONSONANTS = "бвгдзклмнпрстфхцчшжbcdfgklmnprstvz"
+VOWELS = "аеиоуыэюяaeiou"
+
+
+def make_vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        syllables = rng.randint(1, 4)
+        words.add("".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) + rng.choice(["", "", rng.choice(CONSONANTS)])
+                          for _ in range(syllables)))
+    return sorted(words)
+
+
+def make_catalog(rng, entries):
+    vocabulary = make_vocabulary(rng, 40000)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [{"id": i, "name": " ".join(w.capitalize() for w in rng.choices(vocabulary, weights, k=rng.randint(1, 3)))}
+            for i in range(entries)]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--max-ms", type=float, help="порог p99 задержки нажатия")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    records = make_catalog(rng, args.entries)
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.load("apps", records)
+    print(f"Построение индекса на {args.entries} записей: {time.perf_counter() - start:.2f} с")
+    gc.freeze()  # сборщик мусора не должен попадать в замеры отдельных нажатий
+
+    sample = rng.sample(records, args.queries)
+    keystrokes = []
+    for record in sample:
+        name = record["name"]
+        for length in range(1, len(name) + 1):
+            start = time.perf_counter()
+            index.search(name[:length])
+            keystrokes.append((time.perf_counter() - start) * 1000)
+
+    typos, found = [], 0
+    for record in sample:
+        name = record["name"]
+        position = rng.randrange(len(name))
+        start = time.perf_counter()
+        results = index.search(name[:position] + name[position + 1:])
+        typos.append((time.perf_counter() - start) * 1000)
+        found += any(r is record for _, r in results)
+
+    p99 = percentile(keystrokes, 0.99)
+    print(f"нажатие:  p50 {statistics.median(keystrokes):6.2f} мс  p99 {p99:6.2f} мс  ({len(keystrokes)} запросов)")
+    print(f"опечатка: p50 {statistics.median(typos):6.2f} мс  p99 {percentile(typos, 0.99):6.2f} мс  "
+          f"найдено {found / len(sample):.0%}")
+    return 1 if args.max_ms is not None and p99 > args.max_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
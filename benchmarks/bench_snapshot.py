@@ -0,0 +1,65 @@
+"""Холодный старт каталога: разбор JSON против чтения из снимка.
+
+Запуск из корня репозитория: python -m benchmarks.bench_snapshot
+"""
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from utils.snapshot import Snapshot
+
+
+def make_apps(count):
+    return [{
+        "id": i,
+        "name": f"Приложение {i}",
+        "path": f"C:\\Apps\\app{i}.exe",
+        "category_id": i % 50,
+        "icon_path": f"icons/app{i}.png",
+        "bg_color": "#4682B4",
+        "is_square": bool(i % 2)
+    } for i in range(1, count + 1)]
+
+
+def measure(func, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    for count in (100, 10_000, 100_000):
+        with tempfile.TemporaryDirectory() as data_dir:
+            apps_path = os.path.join(data_dir, "apps.json")
+            with open(apps_path, "w", encoding="utf-8") as file:
+                json.dump(make_apps(count), file, indent=4, ensure_ascii=False)
+
+            Snapshot(data_dir).rebuild()
+            repeats = 50 if count < 100_000 else 10
+
+            def load_json():
+                with open(apps_path, "r", encoding="utf-8") as file:
+                    return json.load(file)
+
+            def load_snapshot():
+                # Полный холодный путь: открыть снимок, проверить файл, разобрать запись
+                snap = Snapshot(data_dir)
+                snap.open()
+                found, data = snap.lookup(apps_path)
+                snap.close()
+                assert found
+                return data
+
+            json_ms = measure(load_json, repeats)
+            snapshot_ms = measure(load_snapshot, repeats)
+            print(f"{count:>7} записей  JSON {json_ms:8.2f} мс  снимок {snapshot_ms:8.2f} мс  "
+                  f"ускорение x{json_ms / snapshot_ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Профиль холодного старта лаунчера для CI.
+
+Запуск из корня репозитория: python -m benchmarks.bench_startup [--max-ms N] [--output префикс]
+Лаунчер поднимается на платформе Qt offscreen до первой отрисовки, затем
+сохраняется Chrome Trace и сводка. С --max-ms код возврата 1, если время до
+первой отрисовки превысило порог.
+"""
+import argparse
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from utils import startup_profiler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="startup_trace", help="префикс файлов отчёта")
+    parser.add_argument("--max-ms", type=float, help="порог времени до первой отрисовки")
+    args = parser.parse_args()
+
+    profiler = startup_profiler.enable(args.output)
+
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication, QStackedWidget
+    from core.launcher import Launcher
+    from utils import style_manager
+
+    with startup_profiler.span("QApplication"):
+        app = QApplication(sys.argv[:1])
+    with startup_profiler.span("style_manager.apply"):
+        style_manager.apply(app)
+    with startup_profiler.span("Launcher.__init__"):
+        launcher = Launcher(QStackedWidget())
+    with startup_profiler.span("Launcher.show"):
+        launcher.show()
+
+    def wait_for_paint():
+        if launcher.first_paint_ms is None:
+            QTimer.singleShot(1, wait_for_paint)
+        else:
+            app.quit()
+
+    QTimer.singleShot(0, wait_for_paint)
+    app.exec()
+    startup_profiler.finish()
+
+    print(profiler.summary())
+    if args.max_ms is not None and launcher.first_paint_ms > args.max_ms:
+        print(f"Время до первой отрисовки {launcher.first_paint_ms:.1f} мс превышает порог {args.max_ms:.1f} мс")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
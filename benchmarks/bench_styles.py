@@ -0,0 +1,71 @@
+"""Число вызовов setStyleSheet и время построения каждого экрана.
+
+Запуск из корня репозитория: python -m benchmarks.bench_styles
+Работает на платформе Qt offscreen. После перехода на общую таблицу стилей
+(utils/style_manager.py) построение экранов не должно вызывать setStyleSheet.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QWidget  # noqa: E402
+
+from ui.browser_menu import BrowserMenu  # noqa: E402
+from ui.chat_menu import ChatMenu  # noqa: E402
+from ui.games_menu import GamesMenu  # noqa: E402
+from ui.main_menu import MainMenu  # noqa: E402
+from ui.settings_menu import SettingsMenu  # noqa: E402
+from utils import style_manager  # noqa: E402
+
+SCREENS = {
+    "main": lambda: MainMenu(lambda name: None, lambda: None),
+    "games": lambda: GamesMenu(lambda name: None, is_admin=True),
+    "browser": lambda: BrowserMenu(lambda name: None, is_admin=True),
+    "chat": lambda: ChatMenu(lambda name: None, is_admin=True),
+    "settings": lambda: SettingsMenu(lambda name: None, is_admin=True),
+}
+
+
+class StyleSheetCounter:
+    """Подсчёт вызовов QWidget.setStyleSheet на время построения экрана"""
+
+    def __init__(self):
+        self.calls = 0
+        self._original = QWidget.setStyleSheet
+
+    def __enter__(self):
+        counter = self
+
+        def counting(widget, sheet):
+            counter.calls += 1
+            counter._original(widget, sheet)
+
+        QWidget.setStyleSheet = counting
+        return self
+
+    def __exit__(self, *exc):
+        QWidget.setStyleSheet = self._original
+
+
+def main():
+    app = QApplication(sys.argv)
+    style_manager.apply(app)
+    total = 0
+    for name, factory in SCREENS.items():
+        with StyleSheetCounter() as counter:
+            start = time.perf_counter()
+            screen = factory()
+            screen.show()
+            app.processEvents()
+            elapsed = (time.perf_counter() - start) * 1000
+        total += counter.calls
+        print(f"{name:<10} setStyleSheet: {counter.calls:3d}  построение {elapsed:8.1f} мс")
+        screen.deleteLater()
+    print(f"Всего setStyleSheet при построении экранов: {total}")
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""Массовый импорт и экспорт каталогов (apps, games, sites, chats).
+
+Импорт из JSON Lines или CSV:
+    python catalog_io.py import apps новые_приложения.jsonl [--batch-size 5000] [--max-errors 100] [--dry-run]
+Экспорт:
+    python catalog_io.py export apps apps.csv
+Обе команды принимают --format jsonl|csv (иначе — по расширению) и
+--data-dir (каталог с data/*.json, по умолчанию data). В CSV пустая
+ячейка — отсутствующее поле, как пропущенный ключ в JSON Lines.
+
+Записи читаются потоком и проверяются по схеме каталога; повторы (по пути,
+у сайтов — по адресу) с уже имеющимися и между собой пропускаются.
+Множество виденных ключей лежит во временной базе SQLite на диске, так
+что память не растёт с размером входного файла. Принятые записи получают
+новые id из последовательности каталога и дописываются в его конец одной
+транзакцией (в SQLite — BEGIN…COMMIT пачками по batch-size, в JSON —
+атомарная перезапись файла): при ошибке каталог остаётся прежним.
+Бэкенд хранения выбирается как обычно, переменной LAUNCHER_STORAGE.
+База SQLite общая для каталогов data, поэтому с LAUNCHER_STORAGE=sqlite
+другой --data-dir требует и своей базы в LAUNCHER_DB. Лаунчер подхватит изменения сам (CatalogWatcher).
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from utils.storage import create_backend, get_backend, set_backend
+
+# Поля каталогов: имя -> тип. Ключ повторов — поле, по которому записи считаются одинаковыми
+SCHEMAS = {
+    "apps": {
+        "fields": {"name": str, "path": str, "category_id": int, "icon_path": str, "bg_color": str, "is_square": bool},
+        "required": ("name", "path", "category_id"),
+        "key": "path",
+    },
+    "games": {
+        "fields": {"name": str, "path": str, "icon_path": str},
+        "required": ("name", "path"),
+        "key": "path",
+    },
+    "sites": {
+        "fields": {"name": str, "url": str},
+        "required": ("name", "url"),
+        "key": "url",
+    },
+    "chats": {
+        "fields": {"name": str},
+        "required": ("name",),
+        "key": "name",
+    },
+}
+
+FORMATS = ("jsonl", "csv")
+LOGGED_ERRORS = 20  # сколько ошибок проверки выводится построчно
+PROGRESS_EVERY = 100000  # строк между сообщениями о ходе импорта
+
+_TRUE = {"1", "true", "yes", "да", "y"}
+_FALSE = {"0", "false", "no", "нет", "n", ""}
+
+
+class ImportAborted(Exception):
+    """Импорт прерван (слишком много ошибок); каталог не изменён"""
+
+
+def detect_format(path, fmt=None):
+    """Формат файла: явно заданный или по расширению"""
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_rows(file, fmt):
+    """Строки входного файла по одной: (номер строки, словарь или ошибка разбора)"""
+    if fmt == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            # Пустые ячейки (и недостающие в короткой строке) — отсутствующие поля
+            yield reader.line_num, {field: value for field, value in row.items() if value not in (None, "")}
+        return
+    for number, line in enumerate(file, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, ValueError(f"некорректный JSON: {e}")
+
+
+def _convert(value, kind):
+    """Привести значение поля к типу схемы (в CSV все значения — строки)"""
+    if value is None or (isinstance(value, str) and kind is not str and not value.strip()):
+        return None
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in _TRUE or text in _FALSE:
+            return text in _TRUE
+        raise ValueError(f"ожидалось логическое значение, получено {value!r}")
+    if kind is int:
+        if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"ожидалось целое число, получено {value!r}")
+        return int(value)
+    if not isinstance(value, str):
+        raise ValueError(f"ожидалась строка, получено {value!r}")
+    return value.strip()
+
+
+def validate(row, schema, categories=None):
+    """Запись по схеме каталога из строки входного файла; ValueError при ошибке"""
+    if isinstance(row, Exception):
+        raise row
+    if not isinstance(row, dict):
+        raise ValueError("строка должна быть объектом")
+    record = {}
+    for field, kind in schema["fields"].items():
+        try:
+            record[field] = _convert(row.get(field), kind)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"поле {field}: {e}") from None
+    missing = [field for field in schema["required"] if record[field] in (None, "")]
+    if missing:
+        raise ValueError(f"не заполнены поля: {', '.join(missing)}")
+    if categories is not None and record.get("category_id") not in categories:
+        raise ValueError(f"категория {record['category_id']} не существует")
+    return record
+
+
+def dedupe_key(value):
+    """Нормализованное значение ключа повторов (регистр и разделители путей Windows)"""
+    return value.strip().replace("\\", "/").rstrip("/").casefold()
+
+
+class SeenKeys:
+    """Множество ключей во временной базе SQLite: память не зависит от числа записей"""
+
+    def __init__(self, directory):
+        self._conn = sqlite3.connect(os.path.join(directory, "seen.db"), isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE seen (key TEXT PRIMARY KEY) WITHOUT ROWID")
+        self._conn.execute("BEGIN")
+
+    def add(self, key):
+        """Добавить ключ; False, если он уже был"""
+        return self._conn.execute("INSERT OR IGNORE INTO seen VALUES (?)", (key,)).rowcount == 1
+
+    def close(self):
+        self._conn.close()
+
+
+class Importer:
+    """Поток проверенных записей без повторов для дописывания в каталог"""
+
+    def __init__(self, catalog, seen, max_errors=None, categories=None, reserve_ids=None, id_block=1000):
+        self.catalog = catalog
+        self.schema = SCHEMAS[catalog]
+        self.seen = seen
+        self.max_errors = max_errors
+        self.categories = categories
+        # reserve_ids(count, floor) -> первый id из последовательности хранилища;
+        # без неё (проверка без записи) id считаются локально
+        self.reserve_ids = reserve_ids
+        self.id_block = id_block
+        self.max_id = 0
+        self.next_id = self.id_limit = 1
+        self.lines = self.imported = self.duplicates = self.invalid = 0
+        self.started = time.perf_counter()
+
+    def scan_existing(self, records):
+        """Запомнить ключи и наибольший id уже имеющихся записей"""
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            if isinstance(record.get("id"), int):
+                self.max_id = max(self.max_id, record["id"])
+            value = record.get(self.schema["key"])
+            if isinstance(value, str) and value.strip():
+                self.seen.add(dedupe_key(value))
+
+    def records(self, rows):
+        """Принятые записи из строк входного файла"""
+        key_field = self.schema["key"]
+        for number, row in rows:
+            self.lines += 1
+            if self.lines % PROGRESS_EVERY == 0:
+                logging.info(f"Прочитано строк: {self.lines} ({self.lines / self.elapsed():.0f} строк/с)")
+            try:
+                record = validate(row, self.schema, self.categories)
+            except ValueError as e:
+                self.invalid += 1
+                if self.invalid <= LOGGED_ERRORS:
+                    logging.warning(f"Строка {number}: {e}")
+                if self.max_errors is not None and self.invalid > self.max_errors:
+                    raise ImportAborted(f"ошибок больше {self.max_errors}, импорт отменён")
+                continue
+            if not self.seen.add(dedupe_key(record[key_field])):
+                self.duplicates += 1
+                continue
+            record = {"id": self.allocate_id(), **record}
+            self.imported += 1
+            yield record
+
+    def allocate_id(self):
+        """Следующий id; из хранилища они резервируются блоками по id_block"""
+        if self.next_id >= self.id_limit:
+            if self.reserve_ids is None:
+                self.next_id = max(self.next_id, self.max_id + 1)
+            else:
+                self.next_id = self.reserve_ids(self.id_block, self.max_id)
+            self.id_limit = self.next_id + self.id_block
+        self.next_id += 1
+        return self.next_id - 1
+
+    def elapsed(self):
+        return max(time.perf_counter() - self.started, 1e-9)
+
+    def report(self):
+        return (f"Строк: {self.lines}, добавлено: {self.imported}, повторов: {self.duplicates}, "
+                f"с ошибками: {self.invalid}; {self.elapsed():.2f} с, {self.lines / self.elapsed():.0f} строк/с")
+
+
+def open_backend(data_dir):
+    """Бэкенд хранения (LAUNCHER_STORAGE) для каталогов data_dir.
+
+    ValueError, если записи ушли бы не туда: SQLite без LAUNCHER_DB хранит
+    каталоги data в общей launcher.db.
+    """
+    name = os.getenv("LAUNCHER_STORAGE", "json")
+    if name == "sqlite" and not os.getenv("LAUNCHER_DB") and os.path.abspath(data_dir) != os.path.abspath("data"):
+        raise ValueError(f"для --data-dir {data_dir} с LAUNCHER_STORAGE=sqlite укажите его базу в LAUNCHER_DB")
+    return create_backend(name, data_dir)
+
+
+def category_ids(backend, data_dir):
+    """id существующих категорий для проверки category_id"""
+    return {c.get("id") for c in backend.iter_records(os.path.join(data_dir, "categories.json")) if isinstance(c, dict)}
+
+
+def import_catalog(catalog, input_path, data_dir="data", fmt=None, batch_size=1000, max_errors=None, dry_run=False):
+    """Импортировать файл в каталог. Возвращает Importer со счётчиками"""
+    backend = get_backend()
+    file_path = os.path.join(data_dir, f"{catalog}.json")
+    categories = category_ids(backend, data_dir) if "category_id" in SCHEMAS[catalog]["fields"] else None
+    with tempfile.TemporaryDirectory(prefix="catalog_import_") as scratch, \
+            open(input_path, encoding="utf-8-sig", newline="") as file:
+        seen = SeenKeys(scratch)
+        try:
+            reserve_ids = None if dry_run else lambda count, floor: backend.next_ids(file_path, count, floor)
+            importer = Importer(catalog, seen, max_errors, categories, reserve_ids, batch_size)
+            importer.scan_existing(backend.iter_records(file_path))
+            records = importer.records(read_rows(file, detect_format(input_path, fmt)))
+            if dry_run:
+                for _ in records:
+                    pass
+            else:
+                backend.append_records(file_path, records, batch_size)
+        finally:
+            seen.close()
+    return importer
+
+
+def export_catalog(catalog, output_path, data_dir="data", fmt=None):
+    """Выгрузить каталог в JSON Lines или CSV. Возвращает число записей"""
+    records = get_backend().iter_records(os.path.join(data_dir, f"{catalog}.json"))
+    count = 0
+    with open(output_path, "w", encoding="utf-8", newline="") as file:
+        if detect_format(output_path, fmt) == "csv":
+            fields = ["id", *SCHEMAS[catalog]["fields"]]
+            writer = csv.DictWriter(file, fields, extrasaction="ignore")
+            writer.writeheader()
+            for record in records:
+                writer.writerow(record)
+                count += 1
+        else:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Общие аргументы обеих команд
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--format", choices=FORMATS, help="по умолчанию — по расширению файла")
+    common.add_argument("--data-dir", default="data", help="каталог с data/*.json (по умолчанию data)")
+
+    import_parser = commands.add_parser("import", parents=[common], help="дописать записи из файла в каталог")
+    import_parser.add_argument("catalog", choices=SCHEMAS)
+    import_parser.add_argument("input")
+    import_parser.add_argument("--batch-size", type=int, default=1000)
+    import_parser.add_argument("--max-errors", type=int, help="отменить импорт, если строк с ошибками больше")
+    import_parser.add_argument("--dry-run", action="store_true", help="только проверить файл, каталог не менять")
+
+    export_parser = commands.add_parser("export", parents=[common], help="выгрузить каталог в файл")
+    export_parser.add_argument("catalog", choices=SCHEMAS)
+    export_parser.add_argument("output")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+    try:
+        set_backend(open_backend(args.data_dir))
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        if args.command == "import":
+            importer = import_catalog(args.catalog, args.input, args.data_dir, args.format,
+                                      args.batch_size, args.max_errors, args.dry_run)
+            print(("Проверка: " if args.dry_run else "Импорт: ") + importer.report())
+        else:
+            started = time.perf_counter()
+            count = export_catalog(args.catalog, args.output, args.data_dir, args.format)
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            print(f"Экспорт: {count} записей, {elapsed:.2f} с, {count / elapsed:.0f} записей/с")
+    except (OSError, ImportAborted) as e:
+        logging.error(f"Ошибка: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,24 @@
-from utils.json_utils import load_json, save_json
+from core.catalog_store import get_store
+from core.category_manager import get_category
+
+# Поля нового приложения, не заданные в операции пакета
+APP_DEFAULTS = {"icon_path": None, "bg_color": None, "is_square": False}
 
 
 def get_all_apps(file_path="data/apps.json"):
     """Получить все приложения"""
-    apps = load_json(file_path)
-    if apps is None:
-        apps = []
-        save_json(file_path, apps)
-    return apps
+    return get_store(file_path).all()
 
 
 def get_apps_by_category(category_id, file_path="data/apps.json"):
     """Получить приложения по категории"""
-    apps = get_all_apps(file_path)
-    return [app for app in apps if app["category_id"] == category_id]
+    return get_store(file_path).get_group(category_id)
 
 
 def add_app(name, path, category_id, icon_path=None, bg_color=None, is_square=False, file_path="data/apps.json"):
     """Добавить приложение"""
-    apps = get_all_apps(file_path)
-    new_id = max((app["id"] for app in apps), default=0) + 1
-    apps.append({
-        "id": new_id,
+    get_store(file_path).add({
+        "id": None,
         "name": name,
         "path": path,
         "category_id": category_id,
@@ -29,28 +26,46 @@ def add_app(name, path, category_id, icon_path=None, bg_color=None, is_square=Fa
         "bg_color": bg_color,
         "is_square": is_square
     })
-    save_json(file_path, apps)
 
 
 def update_app(app_id, name, path, category_id, icon_path=None, bg_color=None, is_square=False, file_path="data/apps.json"):
     """Обновить приложение"""
-    apps = get_all_apps(file_path)
-    for app in apps:
-        if app["id"] == app_id:
-            app.update({
-                "name": name,
-                "path": path,
-                "category_id": category_id,
-                "icon_path": icon_path,
-                "bg_color": bg_color,
-                "is_square": is_square
-            })
-            break
-    save_json(file_path, apps)
+    get_store(file_path).update(app_id, {
+        "name": name,
+        "path": path,
+        "category_id": category_id,
+        "icon_path": icon_path,
+        "bg_color": bg_color,
+        "is_square": is_square
+    })
 
 
 def delete_app(app_id, file_path="data/apps.json"):
     """Удалить приложение"""
-    apps = get_all_apps(file_path)
-    apps = [app for app in apps if app["id"] != app_id]
-    save_json(file_path, apps)
\ No newline at end of file
+    get_store(file_path).delete(app_id)
+
+
+def validate_app(app):
+    """Проверка приложения перед записью; ValueError при ошибке"""
+    for field in ("name", "path"):
+        if not isinstance(app.get(field), str) or not app[field].strip():
+            raise ValueError(f"Приложение {app.get('id')}: не заполнено поле {field}")
+    if get_category(app.get("category_id")) is None:
+        raise ValueError(f"Приложение {app.get('id')}: категория {app.get('category_id')} не существует")
+
+
+def apply_batch(ops, file_path="data/apps.json"):
+    """Применить пакет изменений приложений с одной записью в хранилище.
+
+    ops — ("add", поля), ("update", app_id, поля), ("delete", app_id).
+    id новым приложениям выдаются в памяти. Если какая-то операция не
+    проходит проверку, пакет откатывается целиком и бросается ValueError.
+    Возвращает id затронутых приложений.
+    """
+    return get_store(file_path).apply_batch(ops, validate_app, APP_DEFAULTS)
+
+
+def transaction(file_path="data/apps.json"):
+    """Транзакция над приложениями: add_app/update_app/delete_app внутри блока
+    записываются один раз в конце и откатываются при исключении"""
+    return get_store(file_path).transaction()
@@ -0,0 +1,65 @@
+def record_key(record):
+    """Ключ записи каталога: id, а для записей без id — url, путь или имя"""
+    record_id = record.get("id")
+    if record_id is not None:
+        return record_id
+    return record.get("url") or record.get("path") or record.get("name")
+
+
+class CatalogDiff:
+    """Разница между двумя версиями списка записей каталога"""
+
+    def __init__(self, records, added=(), removed=(), updated=(), reordered=False):
+        self.records = records  # новая версия целиком, в порядке файла
+        self.added = list(added)
+        self.removed = list(removed)
+        self.updated = list(updated)
+        self.reordered = reordered
+
+    def is_empty(self):
+        return not (self.added or self.removed or self.updated or self.reordered)
+
+    def __repr__(self):
+        return (f"CatalogDiff(added={len(self.added)}, removed={len(self.removed)}, "
+                f"updated={len(self.updated)}, reordered={self.reordered})")
+
+
+def diff_records(old, new, key=record_key):
+    """Сравнить две версии списка записей по ключу"""
+    old = old or []
+    new = new or []
+    old_by_key = {key(r): r for r in old}
+    new_by_key = {key(r): r for r in new}
+    added = [r for r in new if key(r) not in old_by_key]
+    removed = [r for r in old if key(r) not in new_by_key]
+    updated = [r for r in new if key(r) in old_by_key and old_by_key[key(r)] != r]
+    common_old = [key(r) for r in old if key(r) in new_by_key]
+    common_new = [key(r) for r in new if key(r) in old_by_key]
+    return CatalogDiff(new, added, removed, updated, reordered=common_old != common_new)
+
+
+def merge_diffs(diffs, records, key=record_key):
+    """Одна разница из нескольких последовательных (например, изменений одной транзакции).
+
+    records — итоговая версия списка целиком, в порядке файла.
+    """
+    changes = {}  # ключ -> ("added" | "removed" | "updated", запись)
+    reordered = False
+    for diff in diffs:
+        reordered = reordered or diff.reordered
+        for record in diff.removed:
+            kind = changes.get(key(record), ("",))[0]
+            if kind == "added":
+                del changes[key(record)]
+            else:
+                changes[key(record)] = ("removed", record)
+        for record in diff.added:
+            kind = changes.get(key(record), ("",))[0]
+            changes[key(record)] = ("updated" if kind == "removed" else "added", record)
+        for record in diff.updated:
+            kind = changes.get(key(record), ("",))[0]
+            changes[key(record)] = ("added" if kind == "added" else "updated", record)
+    grouped = {"added": [], "removed": [], "updated": []}
+    for kind, record in changes.values():
+        grouped[kind].append(record)
+    return CatalogDiff(records, grouped["added"], grouped["removed"], grouped["updated"], reordered)
@@ -0,0 +1,411 @@
+import bisect
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+from core.catalog_diff import CatalogDiff, diff_records, merge_diffs
+from utils import write_queue
+from utils.file_cache import copy_data
+from utils.json_utils import load_json, save_json, save_json_deferred
+from utils.storage import get_backend
+
+
+class CatalogStore:
+    """Каталог записей в памяти со сквозной записью в хранилище.
+
+    Поддерживает индексы: id -> запись и значение group_field (по умолчанию
+    category_id) -> упорядоченный по файлу список id.
+
+    Изменения внутри transaction() применяются в памяти сразу, а в хранилище
+    записываются один раз при выходе из блока; исключение в блоке откатывает
+    их по журналу отмены.
+
+    После записи подписчики listeners получают разницу (CatalogDiff): по
+    одной на изменение вне транзакции, одну общую на транзакцию и одну на
+    перечитывание файла, изменённого извне (refresh).
+    """
+
+    def __init__(self, file_path, group_field="category_id"):
+        self.file_path = file_path
+        self.group_field = group_field
+        self._lock = threading.RLock()
+        self._records = None  # ключ -> запись, в порядке файла
+        self._seq = {}  # ключ -> порядковый номер записи в файле
+        self._groups = {}  # значение группы -> ([порядковые номера], [ключи])
+        self._next_seq = 0
+        self._max_id = 0  # наибольший целый id с момента загрузки: нижняя граница последовательности
+        self._reserved = (0, 0)  # [первый, предел) id, зарезервированных в последовательности хранилища
+        self._txn = None  # открытая транзакция: накопленные изменения и журнал отмены
+        self.listeners = []  # callback(CatalogDiff) после записанного изменения
+
+    def _ensure_loaded(self):
+        """Однократная загрузка каталога с диска"""
+        if self._records is not None:
+            return
+        records = load_json(self.file_path)
+        if records is None:
+            records = []
+            save_json(self.file_path, records)
+        # Свои копии: кэш файлов и очередь записи отдают общие данные, а каталог меняет записи на месте
+        records = copy_data(records)
+        self._rebuild(records)
+        logging.debug(f"Каталог {self.file_path} загружен в память: {len(records)} записей")
+
+        # Записи без id (старые файлы, например sites.json) получают id из последовательности один раз
+        missing = [record for record in records if isinstance(record, dict) and record.get("id") is None]
+        if missing:
+            first = get_backend().next_ids(self.file_path, len(missing), floor=self._max_id)
+            for offset, record in enumerate(missing):
+                record["id"] = first + offset
+            self._rebuild(records)
+            self._persist()
+            logging.info(f"Каталог {self.file_path}: выданы id {len(missing)} записям без id")
+
+    def _rebuild(self, records):
+        """Полная перестройка индексов"""
+        self._records = {}
+        self._seq = {}
+        self._groups = {}
+        self._next_seq = 0
+        self._max_id = 0
+        for record in records:
+            self._index(record)
+
+    def _key(self, record):
+        """Ключ записи в индексе: id, а для записей без id или с дублем — служебный"""
+        record_id = record.get("id")
+        if record_id is None or record_id in self._records:
+            if record_id is not None:
+                logging.warning(f"Повторяющийся id {record_id} в {self.file_path}")
+            return ("row", self._next_seq)
+        return record_id
+
+    def _index(self, record):
+        key = self._key(record)
+        seq = self._next_seq
+        self._next_seq += 1
+        self._records[key] = record
+        self._seq[key] = seq
+        self._group_insert(key, record)
+        if isinstance(key, int) and not isinstance(key, bool):
+            self._max_id = max(self._max_id, key)
+        return key
+
+    def _group_insert(self, key, record):
+        if not self.group_field:
+            return
+        seqs, keys = self._groups.setdefault(record.get(self.group_field), ([], []))
+        pos = bisect.bisect_left(seqs, self._seq[key])
+        seqs.insert(pos, self._seq[key])
+        keys.insert(pos, key)
+
+    def _group_remove(self, key, record):
+        if not self.group_field:
+            return
+        group = record.get(self.group_field)
+        seqs, keys = self._groups.get(group, ([], []))
+        pos = bisect.bisect_left(seqs, self._seq[key])
+        if pos < len(seqs) and keys[pos] == key:
+            del seqs[pos]
+            del keys[pos]
+            if not seqs:
+                del self._groups[group]
+
+    def _persist(self, upserts=(), deletes=()):
+        """Сквозная запись изменений: построчно, если бэкенд это умеет, иначе целиком.
+
+        Очередь отложенной записи объединяет только полные перезаписи файлов.
+        Бэкенд с построчными изменениями получает их сразу, а полную запись
+        такой коллекции — синхронно, чтобы она не обогнала построчные.
+        """
+        backend = get_backend()
+        if backend.supports_records(self.file_path):
+            if (upserts or deletes) and all(record.get("id") is not None for record in upserts):
+                backend.apply_changes(self.file_path, upserts, deletes)
+            else:
+                save_json(self.file_path, list(self._records.values()))
+            return
+        if write_queue.get_queue() is not None:
+            save_json_deferred(self.file_path, list(self._records.values()))
+            return
+        save_json(self.file_path, list(self._records.values()))
+
+    def _unindex(self, key):
+        """Убрать запись из индексов (обратное к _index)"""
+        record = self._records.pop(key)
+        self._group_remove(key, record)
+        del self._seq[key]
+        return record
+
+    def _commit(self, undo, change, upserts=(), deletes=(), full=False):
+        """Записать изменение сразу или, внутри транзакции, отложить до её конца.
+
+        undo — функция, возвращающая каталог в памяти в состояние до изменения;
+        change — CatalogDiff изменения для подписчиков.
+        """
+        if self._txn is None:
+            self._persist(upserts=upserts, deletes=deletes)
+            self._notify([change])
+            return
+        txn = self._txn
+        txn["undo"].append(undo)
+        txn["changes"].append(change)
+        txn["full"] = txn["full"] or full
+        for record_id in deletes:
+            txn["upserts"].pop(record_id, None)
+            txn["deletes"].append(record_id)
+        for record in upserts:
+            txn["upserts"][record.get("id")] = record
+
+    @contextmanager
+    def transaction(self):
+        """Пакет изменений: одна запись в хранилище в конце, откат при исключении в блоке.
+
+        Блокировка каталога удерживается до конца блока, поэтому другие потоки
+        не видят незавершённых изменений. Вложенная транзакция — часть внешней.
+        Откат при ошибке записи возможен, только если бэкенд её сообщает:
+        построчная запись в SQLite (apply_changes) бросает исключение, а
+        полная запись JSON-файла (save_json) и очередь отложенной записи
+        ошибки только логируют — тогда изменения остаются в памяти.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._txn is not None:
+                yield self
+                return
+            txn = self._txn = {"undo": [], "changes": [], "upserts": {}, "deletes": [], "full": False,
+                               "max_id": self._max_id}
+            try:
+                yield self
+                if txn["full"]:
+                    self._persist()
+                elif txn["undo"]:
+                    self._persist(upserts=list(txn["upserts"].values()), deletes=txn["deletes"])
+            except BaseException:
+                # Исключение в блоке или от построчной записи: каталог в памяти возвращается к прежнему
+                self._rollback()
+                raise
+            finally:
+                self._txn = None
+            self._notify(txn["changes"])
+
+    def _rollback(self):
+        """Отменить изменения открытой транзакции в обратном порядке"""
+        txn = self._txn
+        for undo in reversed(txn["undo"]):
+            undo()
+        if self._records is not None:
+            # Восстановленные после удаления записи вернулись в конец словаря — порядок файла по _seq
+            self._records = dict(sorted(self._records.items(), key=lambda item: self._seq[item[0]]))
+        self._max_id = txn["max_id"]
+        logging.info(f"Транзакция каталога {self.file_path} отменена: изменений {len(txn['undo'])}")
+
+    def _notify(self, changes):
+        """Разослать подписчикам одну разницу записанных изменений"""
+        if not changes or not self.listeners:
+            return
+        diff = merge_diffs(changes, list(self._records.values()))
+        if diff.is_empty():
+            return
+        for listener in list(self.listeners):
+            try:
+                listener(diff)
+            except Exception as e:
+                logging.error(f"Ошибка подписчика каталога {self.file_path}: {e}")
+
+    def all(self):
+        """Все записи каталога (список копируется, сами записи — нет)"""
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._records.values())
+
+    def snapshot(self):
+        """Копии всех записей: их можно читать на другом потоке, пока каталог меняет свои на месте"""
+        with self._lock:
+            self._ensure_loaded()
+            return [dict(record) for record in self._records.values()]
+
+    def get(self, record_id):
+        """Запись по id или None"""
+        with self._lock:
+            self._ensure_loaded()
+            return self._records.get(record_id)
+
+    def get_group(self, value):
+        """Записи, у которых group_field равно value, в порядке файла"""
+        with self._lock:
+            self._ensure_loaded()
+            _, keys = self._groups.get(value, ((), ()))
+            return [self._records[key] for key in keys]
+
+    def reserve_ids(self, count):
+        """Зарезервировать в последовательности хранилища count id для следующих add"""
+        with self._lock:
+            self._ensure_loaded()
+            first = get_backend().next_ids(self.file_path, count, floor=self._max_id)
+            self._reserved = (first, first + count)
+
+    def next_id(self):
+        """Выдать новый id из последовательности хранилища.
+
+        Последовательность хранится вместе с каталогом и только растёт, поэтому
+        id не повторяются после удалений и перезапусков, а каталог не обходится.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            first, limit = self._reserved
+            # id, появившиеся в каталоге извне после резервирования, пропускаются
+            while first < limit and first in self._records:
+                first += 1
+            if first >= limit:
+                first = get_backend().next_ids(self.file_path, 1, floor=self._max_id)
+                limit = first + 1
+            self._reserved = (first + 1, limit)
+            return first
+
+    def add(self, record):
+        """Добавить запись; id выдаётся автоматически, если не задан"""
+        with self._lock:
+            self._ensure_loaded()
+            if record.get("id") is None:
+                record["id"] = self.next_id()
+            key = self._index(record)
+            self._commit(lambda: self._unindex(key), CatalogDiff(None, added=[record]), upserts=[record])
+            return record
+
+    def update(self, record_id, fields):
+        """Обновить поля записи. Возвращает False, если запись не найдена"""
+        with self._lock:
+            record = self.get(record_id)
+            if record is None:
+                return False
+            previous = dict(record)
+            regroup = self.group_field in fields and fields[self.group_field] != record.get(self.group_field)
+            if regroup:
+                self._group_remove(record_id, record)
+            record.update(fields)
+            if regroup:
+                self._group_insert(record_id, record)
+
+            def undo():
+                self._group_remove(record_id, record)
+                record.clear()
+                record.update(previous)
+                self._group_insert(record_id, record)
+
+            self._commit(undo, CatalogDiff(None, updated=[record]), upserts=[record])
+            return True
+
+    def delete(self, record_id):
+        """Удалить запись. Возвращает False, если запись не найдена"""
+        with self._lock:
+            record = self.get(record_id)
+            if record is None:
+                return False
+            seq = self._seq[record_id]
+            self._unindex(record_id)
+
+            def undo():
+                self._records[record_id] = record
+                self._seq[record_id] = seq
+                self._group_insert(record_id, record)
+
+            self._commit(undo, CatalogDiff(None, removed=[record]), deletes=[record_id])
+            return True
+
+    def replace_all(self, records):
+        """Заменить содержимое каталога целиком"""
+        with self._lock:
+            previous = None if self._records is None else list(self._records.values())
+            self._rebuild(list(records))
+            self._commit(lambda: self._rebuild(previous) if previous is not None else self.reload(),
+                         diff_records(previous, list(self._records.values())), full=True)
+
+    def apply_batch(self, ops, validate=None, defaults=None):
+        """Применить пакет операций одной транзакцией.
+
+        Операции: ("add", поля), ("update", id, поля), ("delete", id). Новые
+        записи собираются из defaults и полей. validate(запись) проверяет
+        добавленную или изменённую запись и бросает ValueError; ошибка, как и
+        неизвестная операция или id, откатывает весь пакет. Возвращает id
+        затронутых записей в порядке операций.
+        """
+        ops = list(ops)
+        with self.transaction():
+            # id для всех добавлений резервируются одним обращением к хранилищу
+            adds = sum(1 for op in ops if op and op[0] == "add" and op[1].get("id") is None)
+            if adds > 1:
+                self.reserve_ids(adds)
+            ids = []
+            for op in ops:
+                kind = op[0] if op else None
+                if kind == "add":
+                    record = self.add({"id": None, **(defaults or {}), **op[1]})
+                elif kind == "update":
+                    if not self.update(op[1], op[2]):
+                        raise ValueError(f"Запись {op[1]} не найдена в {self.file_path}")
+                    record = self.get(op[1])
+                elif kind == "delete":
+                    if not self.delete(op[1]):
+                        raise ValueError(f"Запись {op[1]} не найдена в {self.file_path}")
+                    ids.append(op[1])
+                    continue
+                else:
+                    raise ValueError(f"Неизвестная операция пакета: {op!r}")
+                if validate is not None:
+                    validate(record)
+                ids.append(record["id"])
+            return ids
+
+    def reload(self):
+        """Сбросить состояние в памяти; следующее обращение перечитает файл"""
+        with self._lock:
+            self._records = None
+
+    def refresh(self):
+        """Перечитать файл, изменённый извне, и разослать разницу с каталогом в памяти.
+
+        Незагруженный каталог не перечитывается: он прочтёт файл при первом обращении.
+        """
+        with self._lock:
+            if self._records is None:
+                return
+            previous = list(self._records.values())
+            # Файл после своей записи лаунчера совпадает с каталогом в памяти: сравнение
+            # списков намного дешевле перестройки индексов и разницы по всем записям
+            if load_json(self.file_path) == previous:
+                return
+            self._records = None
+            self._ensure_loaded()
+            diff = diff_records(previous, list(self._records.values()))
+            if not diff.is_empty():
+                logging.info(f"Каталог {self.file_path} изменён на диске: {diff}")
+                self._notify([diff])
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(file_path):
+    """Общий для процесса экземпляр каталога для указанного файла"""
+    key = os.path.abspath(file_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = CatalogStore(file_path)
+        return store
+
+
+def catalog_snapshot(names, data_dir="data"):
+    """Копии записей каталогов data_dir: {имя каталога: [записи]}"""
+    return {name: get_store(os.path.join(data_dir, f"{name}.json")).snapshot() for name in names}
+
+
+def reload_store(file_path):
+    """Перечитать каталог файла, изменённого извне, если он уже создан (см. CatalogStore.refresh)"""
+    with _stores_lock:
+        store = _stores.get(os.path.abspath(file_path))
+    if store is not None:
+        store.refresh()
@@ -0,0 +1,76 @@
+import logging
+import os
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from core.catalog_store import get_store, reload_store
+from utils.file_cache import file_signature
+
+
+class CatalogWatcher(QObject):
+    """Рассылка изменений каталогов data/*.json.
+
+    Наружу уходит только разница (CatalogDiff), чтобы меню обновили лишь
+    затронутые элементы. Изменения, сделанные в самом лаунчере, приходят
+    от каталогов в памяти (CatalogStore.listeners) сразу после записи, в
+    том числе в SQLite, где файлы не меняются. За правками файлов
+    сторонними программами следит QFileSystemWatcher (в Linux — inotify,
+    в Windows — ReadDirectoryChangesW); если путь не удалось поставить на
+    наблюдение, включается опрос по таймеру. Изменившийся файл
+    перечитывает его каталог в памяти, а разница приходит тем же путём.
+    """
+
+    catalog_changed = pyqtSignal(str, object)  # имя каталога, CatalogDiff
+
+    CATALOGS = ("apps", "categories", "games", "sites", "chats")
+    DEBOUNCE_MS = 200
+    POLL_INTERVAL_MS = 2000
+
+    def __init__(self, data_dir="data", parent=None):
+        super().__init__(parent)
+        self.data_dir = data_dir
+        self._paths = {name: os.path.join(data_dir, f"{name}.json") for name in self.CATALOGS}
+        self._signatures = {name: file_signature(path) for name, path in self._paths.items()}
+        for name, path in self._paths.items():
+            get_store(path).listeners.append(lambda diff, name=name: self.catalog_changed.emit(name, diff))
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.check)
+
+        self._poll = QTimer(self)
+        self._poll.setInterval(self.POLL_INTERVAL_MS)
+        self._poll.timeout.connect(self.check)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._schedule)
+        self._watcher.fileChanged.connect(self._schedule)
+        if not self._watcher.addPath(data_dir):
+            logging.warning(f"Не удалось наблюдать за {data_dir}, включён опрос каждые {self.POLL_INTERVAL_MS} мс")
+            self._poll.start()
+        self._watch_files()
+
+    def _watch_files(self):
+        """Поставить файлы на наблюдение (после атомарной замены файл снимается с него)"""
+        watched = set(self._watcher.files())
+        for path in self._paths.values():
+            if path not in watched and os.path.exists(path) and not self._watcher.addPath(path):
+                if not self._poll.isActive():
+                    logging.warning(f"Не удалось наблюдать за {path}, включён опрос")
+                    self._poll.start()
+
+    def _schedule(self, _path=None):
+        self._debounce.start()
+
+    def check(self):
+        """Перечитать каталоги, файлы которых изменились на диске"""
+        self._watch_files()
+        for name, path in self._paths.items():
+            signature = file_signature(path)
+            if signature == self._signatures[name]:
+                continue
+            self._signatures[name] = signature
+            # Свои записи лаунчера дают пустую разницу; незагруженный каталог
+            # прочтёт файл при первом обращении
+            reload_store(path)
@@ -1,45 +1,61 @@
-import os
-from utils.json_utils import load_json, save_json
+from core.catalog_store import get_store
+
+# Поля новой категории, не заданные в операции пакета
+CATEGORY_DEFAULTS = {"icon_path": None, "sort_order": 1}
 
 
 def get_all_categories(file_path="data/categories.json"):
     """Получить все категории"""
-    categories = load_json(file_path)
-    if categories is None:
-        categories = []
-        save_json(file_path, categories)
-    return categories
+    return get_store(file_path).all()
+
+
+def get_category(category_id, file_path="data/categories.json"):
+    """Получить категорию по id"""
+    return get_store(file_path).get(category_id)
 
 
 def add_category(name, icon_path=None, sort_order=1, file_path="data/categories.json"):
     """Добавить категорию"""
-    categories = get_all_categories(file_path)
-    new_id = max((cat["id"] for cat in categories), default=0) + 1
-    categories.append({
-        "id": new_id,
+    get_store(file_path).add({
+        "id": None,
         "name": name,
         "icon_path": icon_path,
         "sort_order": sort_order
     })
-    save_json(file_path, categories)
 
 
 def update_category(category_id, name, icon_path=None, sort_order=1, file_path="data/categories.json"):
     """Обновить категорию"""
-    categories = get_all_categories(file_path)
-    for category in categories:
-        if category["id"] == category_id:
-            category.update({
-                "name": name,
-                "icon_path": icon_path,
-                "sort_order": sort_order
-            })
-            break
-    save_json(file_path, categories)
+    get_store(file_path).update(category_id, {
+        "name": name,
+        "icon_path": icon_path,
+        "sort_order": sort_order
+    })
 
 
 def delete_category(category_id, file_path="data/categories.json"):
     """Удалить категорию"""
-    categories = get_all_categories(file_path)
-    categories = [cat for cat in categories if cat["id"] != category_id]
-    save_json(file_path, categories)
\ No newline at end of file
+    get_store(file_path).delete(category_id)
+
+
+def validate_category(category):
+    """Проверка категории перед записью; ValueError при ошибке"""
+    if not isinstance(category.get("name"), str) or not category["name"].strip():
+        raise ValueError(f"Категория {category.get('id')}: не заполнено поле name")
+    if not isinstance(category.get("sort_order"), int):
+        raise ValueError(f"Категория {category.get('id')}: sort_order должен быть целым числом")
+
+
+def apply_batch(ops, file_path="data/categories.json"):
+    """Применить пакет изменений категорий с одной записью в хранилище.
+
+    ops — ("add", поля), ("update", category_id, поля), ("delete", category_id).
+    При ошибке проверки пакет откатывается целиком и бросается ValueError.
+    Возвращает id затронутых категорий.
+    """
+    return get_store(file_path).apply_batch(ops, validate_category, CATEGORY_DEFAULTS)
+
+
+def transaction(file_path="data/categories.json"):
+    """Транзакция над категориями: изменения внутри блока записываются один раз в конце"""
+    return get_store(file_path).transaction()
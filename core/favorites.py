@@ -0,0 +1,176 @@
+import heapq
+import os
+import time
+
+from core.usage_stats import APP, get_usage_stats
+
+
+class IndexedMaxHeap:
+    """Двоичная max-куча ключей с позициями в словаре.
+
+    Увеличение оценки ключа и удаление — O(log n); top(n) обходит кучу
+    вспомогательной кучей за O(n log n), не трогая остальные элементы.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._scores = []
+        self._pos = {}  # ключ -> индекс в куче
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._pos
+
+    def score(self, key):
+        return self._scores[self._pos[key]]
+
+    def add(self, key, delta):
+        """Прибавить delta > 0 к оценке key (новый ключ появляется с оценкой delta)"""
+        index = self._pos.get(key)
+        if index is None:
+            index = len(self._keys)
+            self._keys.append(key)
+            self._scores.append(delta)
+            self._pos[key] = index
+        else:
+            self._scores[index] += delta
+        self._sift_up(index)
+
+    def remove(self, key):
+        index = self._pos.pop(key, None)
+        if index is None:
+            return
+        last_key = self._keys.pop()
+        last_score = self._scores.pop()
+        if index == len(self._keys):
+            return
+        self._keys[index] = last_key
+        self._scores[index] = last_score
+        self._pos[last_key] = index
+        self._sift_up(index)
+        self._sift_down(self._pos[last_key])
+
+    def scale(self, factor):
+        """Умножить все оценки на factor > 0 (порядок не меняется)"""
+        self._scores = [score * factor for score in self._scores]
+
+    def top(self, n):
+        """До n ключей с наибольшей оценкой, по убыванию"""
+        result = []
+        frontier = [(-self._scores[0], 0)] if self._keys else []
+        while frontier and len(result) < n:
+            _, index = heapq.heappop(frontier)
+            result.append(self._keys[index])
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self._keys):
+                    heapq.heappush(frontier, (-self._scores[child], child))
+        return result
+
+    def _swap(self, i, j):
+        self._keys[i], self._keys[j] = self._keys[j], self._keys[i]
+        self._scores[i], self._scores[j] = self._scores[j], self._scores[i]
+        self._pos[self._keys[i]] = i
+        self._pos[self._keys[j]] = j
+
+    def _sift_up(self, index):
+        while index > 0:
+            parent = (index - 1) // 2
+            if self._scores[parent] >= self._scores[index]:
+                break
+            self._swap(parent, index)
+            index = parent
+
+    def _sift_down(self, index):
+        size = len(self._keys)
+        while True:
+            largest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and self._scores[child] > self._scores[largest]:
+                    largest = child
+            if largest == index:
+                return
+            self._swap(index, largest)
+            index = largest
+
+
+class FrequencyRanking:
+    """Рейтинг записей по частоте запусков с экспоненциальным затуханием.
+
+    Вклад запуска в момент t равен 2^(-(now - t) / half_life). Все оценки
+    затухают с одной скоростью, поэтому в куче хранится вклад относительно
+    фиксированной эпохи, 2^((t - epoch) / half_life): порядок от течения
+    времени не меняется, и запуск обновляет только свой ключ за O(log n).
+    Когда показатель становится слишком большим, эпоха сдвигается и все
+    оценки один раз масштабируются.
+    """
+
+    MAX_EXPONENT = 512
+
+    def __init__(self, half_life_days=7.0, epoch=None):
+        self.half_life = half_life_days * 86400
+        self.epoch = time.time() if epoch is None else epoch
+        self.heap = IndexedMaxHeap()
+
+    def record(self, key, ts=None):
+        ts = time.time() if ts is None else ts
+        exponent = (ts - self.epoch) / self.half_life
+        if exponent > self.MAX_EXPONENT:
+            self.heap.scale(2.0 ** -exponent)
+            self.epoch = ts
+            exponent = 0.0
+        self.heap.add(key, 2.0 ** exponent)
+
+    def remove(self, key):
+        self.heap.remove(key)
+
+    def score(self, key, now=None):
+        """Текущая затухшая оценка key (0, если запусков не было)"""
+        if key not in self.heap:
+            return 0.0
+        now = time.time() if now is None else now
+        return self.heap.score(key) * 2.0 ** ((self.epoch - now) / self.half_life)
+
+    def top(self, n):
+        return self.heap.top(n)
+
+
+class FavoriteApps:
+    """Рейтинг приложений для домашнего ряда главного меню.
+
+    Строится один раз из журнала запусков и дальше обновляется
+    подпиской на UsageStats. Ключи — нормализованные пути (usage_key).
+    """
+
+    def __init__(self, stats=None, half_life_days=None):
+        self.stats = stats or get_usage_stats()
+        half_life_days = half_life_days or float(os.getenv("LAUNCHER_FAVORITES_HALF_LIFE_DAYS", "7"))
+        events = self.stats.events()
+        self.ranking = FrequencyRanking(half_life_days, epoch=events[0][1] if events else None)
+        for _, ts, kind, key, _ in events:
+            if kind == APP:
+                self.ranking.record(key, ts)
+        self.listeners = []  # callback() после изменения рейтинга
+        self.stats.listeners.append(self._on_launch)
+
+    def _on_launch(self, aggregate):
+        if aggregate.kind != APP:
+            return
+        self.ranking.record(aggregate.key, aggregate.last_ts)
+        for listener in list(self.listeners):
+            listener()
+
+    def top_keys(self, n):
+        return self.ranking.top(n)
+
+
+_favorites = None
+
+
+def get_favorites():
+    """Общий рейтинг приложений (строится при первом обращении)"""
+    global _favorites
+    if _favorites is None:
+        _favorites = FavoriteApps()
+    return _favorites
@@ -0,0 +1,115 @@
+import gc
+import logging
+import time
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from core import prefix_index, search_index
+from core.catalog_store import catalog_snapshot
+
+
+class _Signals(QObject):
+    # {имя индекса: индекс} или None, если построить не удалось
+    finished = pyqtSignal(object)
+
+
+class _BuildTask(QRunnable):
+    """Построение индексов в пуле потоков по одному общему снимку каталогов"""
+
+    def __init__(self, data_dir, signals):
+        super().__init__()
+        self.data_dir = data_dir
+        self.signals = signals
+
+    def run(self):
+        indexes = None
+        # Полные проходы сборщика мусора по миллионам новых объектов индекса держат GIL
+        # и останавливали бы поток GUI на сотни миллисекунд
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            names = dict.fromkeys(search_index.CATALOGS + prefix_index.CATALOGS)
+            snapshot = catalog_snapshot(names, self.data_dir)
+            # Индексы только читают записи снимка, поэтому копии у них общие
+            indexes = {
+                "search": search_index.load_search_index(snapshot),
+                "prefix": prefix_index.load_prefix_index(snapshot),
+            }
+            # Индексы живут до выхода: замороженные объекты не обходят и следующие полные сборки
+            gc.freeze()
+            logging.info(f"Индексы поиска построены за {time.perf_counter() - started:.2f} с")
+        except Exception as e:
+            logging.error(f"Ошибка построения индексов поиска: {e}")
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self.signals.finished.emit(indexes)
+
+
+class IndexBuilder(QObject):
+    """Фоновое построение индексов поиска и автодополнения.
+
+    Оба индекса строятся одной задачей на рабочем потоке по одному снимку
+    каталогов (копиям записей), а устанавливаются на потоке GUI.
+    Изменения каталогов, пришедшие во время построения, копятся и
+    применяются к готовым индексам (снимок мог их уже включать —
+    применение идемпотентно). До сигнала ready меню показывает
+    «Индексация…» и не предлагает подсказок.
+    """
+
+    ready = pyqtSignal()
+
+    def __init__(self, data_dir="data", parent=None):
+        super().__init__(parent)
+        self.data_dir = data_dir
+        self._ready = False
+        self._building = False
+        self._pending = []  # (имя каталога, CatalogDiff), пришедшие во время построения
+        self._signals = _Signals(self)
+        self._signals.finished.connect(self._finished)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+    def is_ready(self):
+        return self._ready
+
+    def start(self):
+        """Начать построение, если индексы ещё не построены и не строятся"""
+        if self._ready or self._building:
+            return
+        self._building = True
+        self._pending = []
+        self.pool.start(_BuildTask(self.data_dir, self._signals))
+
+    def apply_catalog_diff(self, name, diff):
+        """Передать индексам изменение каталога (во время построения — отложить)"""
+        if self._building:
+            self._pending.append((name, diff))
+            return
+        search_index.apply_catalog_diff(name, diff)
+        prefix_index.apply_catalog_diff(name, diff)
+
+    def _finished(self, indexes):
+        self._building = False
+        pending, self._pending = self._pending, []
+        if indexes is None:
+            # Следующий запрос поиска начнёт построение заново
+            return
+        search_index.set_search_index(indexes["search"])
+        prefix_index.set_prefix_index(indexes["prefix"])
+        for name, diff in pending:
+            self.apply_catalog_diff(name, diff)
+        self._ready = True
+        self.ready.emit()
+
+
+_builder = None
+
+
+def get_index_builder():
+    """Общий построитель индексов поиска"""
+    global _builder
+    if _builder is None:
+        _builder = IndexBuilder()
+    return _builder
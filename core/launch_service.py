@@ -0,0 +1,139 @@
+import logging
+import os
+import subprocess
+import sys
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+# Результаты LaunchService.launch
+STARTED = "started"
+ALREADY_RUNNING = "already_running"
+LIMIT_REACHED = "limit_reached"
+FAILED = "failed"
+
+WINDOWS_EXECUTABLES = (".exe", ".com", ".bat", ".cmd")
+
+
+def launch_key(path):
+    """Ключ запуска: нормализованный абсолютный путь"""
+    return os.path.normcase(os.path.abspath(path))
+
+
+class LaunchService(QObject):
+    """Неблокирующий запуск приложений и игр.
+
+    Процесс создаётся без оболочки (subprocess.Popen со списком аргументов)
+    в отдельной сессии, поэтому переживает закрытие лаунчера. За каждым
+    дочерним процессом следит поток-жнец, который ждёт его завершения и
+    передаёт код выхода в GUI-поток сигналом. Повторный запуск уже
+    работающего приложения и превышение max_running отклоняются.
+
+    Отслеживаются только исполняемые файлы, запущенные напрямую. Документы
+    и ссылки открываются через xdg-open/open (или os.startfile в Windows):
+    эта программа сразу завершается, передав файл другой, поэтому такие
+    запуски не считаются работающими и повторно не блокируются.
+    """
+
+    started = pyqtSignal(str, int)  # ключ, PID
+    finished = pyqtSignal(str, int)  # ключ, код выхода
+    failed = pyqtSignal(str, str)  # ключ, сообщение
+    running_changed = pyqtSignal(str, bool)  # ключ, запущено ли
+
+    _exited = pyqtSignal(str, int)
+
+    def __init__(self, max_running=None, parent=None):
+        super().__init__(parent)
+        self.max_running = max_running or int(os.getenv("LAUNCHER_MAX_RUNNING", "5"))
+        self._processes = {}  # ключ -> subprocess.Popen
+        self._exited.connect(self._on_exited)
+
+    @staticmethod
+    def command_for(path):
+        """Команда запуска файла без оболочки или None, если нужен os.startfile"""
+        if os.name == "nt":
+            return [path] if path.lower().endswith(WINDOWS_EXECUTABLES) else None
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return [path]
+        return ["open" if sys.platform == "darwin" else "xdg-open", path]
+
+    def is_running(self, path):
+        return launch_key(path) in self._processes
+
+    def running(self):
+        """{ключ: PID} запущенных процессов"""
+        return {key: process.pid for key, process in self._processes.items()}
+
+    def launch(self, path):
+        """Запустить файл; возвращает STARTED, ALREADY_RUNNING, LIMIT_REACHED или FAILED"""
+        key = launch_key(path)
+        if key in self._processes:
+            logging.info(f"Приложение уже запущено: {path} (PID {self._processes[key].pid})")
+            return ALREADY_RUNNING
+        if len(self._processes) >= self.max_running:
+            logging.warning(f"Достигнут предел одновременно запущенных приложений ({self.max_running}): {path}")
+            return LIMIT_REACHED
+
+        command = self.command_for(path)
+        try:
+            if command is None:
+                # Документы и ярлыки Windows открываются ассоциированной программой, без отслеживания
+                os.startfile(path)
+                logging.info(f"Открыт файл: {path}")
+                return STARTED
+            process = subprocess.Popen(command, **self._popen_options(path))
+        except Exception as e:
+            logging.error(f"Не удалось запустить {path}: {e}")
+            self.failed.emit(key, str(e))
+            return FAILED
+
+        if command != [path]:
+            # Открывающая программа завершится сразу: её только дожидаемся, чтобы не оставить зомби
+            threading.Thread(target=process.wait, name=f"opener-{process.pid}", daemon=True).start()
+            logging.info(f"Открыт файл: {path}")
+            return STARTED
+
+        self._processes[key] = process
+        threading.Thread(target=self._reap, args=(key, process), name=f"reaper-{process.pid}", daemon=True).start()
+        logging.info(f"Запущено {path} (PID {process.pid})")
+        self.started.emit(key, process.pid)
+        self.running_changed.emit(key, True)
+        return STARTED
+
+    @staticmethod
+    def _popen_options(path):
+        options = {
+            "cwd": os.path.dirname(os.path.abspath(path)) or None,
+            "stdin": subprocess.DEVNULL,
+            "stdout": subprocess.DEVNULL,
+            "stderr": subprocess.DEVNULL,
+            "close_fds": True,
+        }
+        if os.name == "nt":
+            options["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            options["start_new_session"] = True
+        return options
+
+    def _reap(self, key, process):
+        exit_code = process.wait()
+        self._exited.emit(key, exit_code)
+
+    def _on_exited(self, key, exit_code):
+        process = self._processes.pop(key, None)
+        if process is None:
+            return
+        logging.info(f"Процесс {process.pid} ({key}) завершился с кодом {exit_code}")
+        self.finished.emit(key, exit_code)
+        self.running_changed.emit(key, False)
+
+
+_service = None
+
+
+def get_launch_service():
+    """Общий сервис запуска (создаётся при первом обращении)"""
+    global _service
+    if _service is None:
+        _service = LaunchService()
+    return _service
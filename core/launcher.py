@@ -1,10 +1,11 @@
 import logging
 import sys
 import os
+import time
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QStackedWidget, QPushButton,
                              QHBoxLayout, QMessageBox, QDialog)
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QPixmap, QPalette, QBrush, QColor, QIcon
+from PyQt6.QtCore import Qt, QSize, QTimer
+from PyQt6.QtGui import QPalette, QBrush, QColor
 
 from ui.main_menu import MainMenu
 from ui.browser_menu import BrowserMenu
@@ -13,14 +14,28 @@ from ui.chat_menu import ChatMenu
 from ui.settings_menu import SettingsMenu
 from admin.auth import AdminLoginDialog, AuthController
 from admin.views.panels import AdminPanel
+from core.catalog_watcher import CatalogWatcher
+from core.index_builder import get_index_builder
+from ui.components.background import BackgroundRenderer
+from utils import prewarm, startup_profiler
+from utils.icon_loader import get_icon_loader
+from utils.style_manager import set_role
 
 
 class Launcher(QWidget):
+    # Экраны, которые строятся в простое после первой отрисовки, в порядке вероятности перехода
+    PREFETCH_SCREENS = ("games", "browser", "chat", "settings")
+    BACKGROUND_SETTLE_MS = 150
+    PREWARM_DELAY_MS = 2000
+
     def __init__(self, stacked_widget):
         super().__init__()
+        self.created_at = time.perf_counter()
+        self.first_paint_ms = None
 
         # Настройка логирования
-        self.setup_logging()
+        with startup_profiler.span("Launcher.setup_logging"):
+            self.setup_logging()
 
         # Основные настройки окна
         self.is_fullscreen = False
@@ -33,11 +48,18 @@ class Launcher(QWidget):
         self.admin_panel = None
         self.admin_button = QPushButton()
         self.toggle_button = QPushButton()
-        self.menus = {}
+        self.menus = {}  # построенные экраны
+        self.background = None
+        self.applied_background = None  # (корзина размера, сглаженный ли) текущего фона
+        self.screen_factories = {}  # имя экрана -> функция создания
+        self.lazy_screens = os.getenv("LAUNCHER_LAZY_SCREENS", "1") != "0"
+        self.prefetch_queue = []
 
         # Настройка фона и интерфейса
-        self.setup_background()
-        self.setup_ui()
+        with startup_profiler.span("Launcher.setup_background"):
+            self.setup_background()
+        with startup_profiler.span("Launcher.setup_ui"):
+            self.setup_ui()
 
     def setup_logging(self):
         """Настройка системы логирования"""
@@ -53,53 +75,56 @@ class Launcher(QWidget):
     def setup_background(self):
         """Настройка фонового изображения"""
         bg_path = self.resource_path('assets/background.jpg')
-        palette = self.palette()
+        self.background = BackgroundRenderer(bg_path)
 
-        if os.path.exists(bg_path):
-            pixmap = QPixmap(bg_path)
-            if not pixmap.isNull():
-                palette.setBrush(QPalette.ColorRole.Window,
-                                 QBrush(pixmap.scaled(
-                                     self.size(),
-                                     Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                                     Qt.TransformationMode.SmoothTransformation)))
-            else:
-                logging.warning(f"Не удалось загрузить фоновое изображение: {bg_path}")
-                palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
-        else:
+        # Сглаженное масштабирование откладывается до конца изменения размера окна
+        self.background_timer = QTimer(self)
+        self.background_timer.setSingleShot(True)
+        self.background_timer.setInterval(self.BACKGROUND_SETTLE_MS)
+        self.background_timer.timeout.connect(lambda: self.apply_background(smooth=True))
+
+        if not os.path.exists(bg_path):
             logging.warning(f"Фоновое изображение не найдено: {bg_path}")
+        if os.path.exists(bg_path) and self.background.load():
+            self.apply_background(smooth=True)
+        else:
+            palette = self.palette()
             palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
-
+            self.setPalette(palette)
+
+    def apply_background(self, smooth):
+        """Поставить фон под текущий размер окна"""
+        applied = (self.background.bucket_size(self.size()), smooth)
+        if applied == self.applied_background:
+            return
+        pixmap = self.background.pixmap(self.size(), smooth)
+        if pixmap is None:
+            return
+        self.applied_background = applied
+        palette = self.palette()
+        palette.setBrush(QPalette.ColorRole.Window, QBrush(pixmap))
         self.setPalette(palette)
 
     def setup_ui(self):
         """Настройка пользовательского интерфейса"""
         # Стилизация стека
-        self.stack.setStyleSheet("""
-            QStackedWidget {
-                background: transparent;
-                border: none;
-            }
-        """)
-
-        # Инициализация пользовательских меню
-        try:
-            self.menus = {
-                "main": MainMenu(self.switch_to, self.show_admin_auth),
-                "games": GamesMenu(self.switch_to),
-                "browser": BrowserMenu(self.switch_to),
-                "chat": ChatMenu(self.switch_to),
-                "settings": SettingsMenu(self.switch_to),
-            }
-
-            # Добавление меню в стек
-            for name, menu in self.menus.items():
-                menu.setStyleSheet("background: transparent;")
-                self.stack.addWidget(menu)
-                logging.debug(f"Меню '{name}' успешно добавлено")
-        except Exception as e:
-            logging.error(f"Ошибка при инициализации меню: {e}")
-            QMessageBox.critical(self, "Ошибка", "Не удалось загрузить интерфейс")
+        self.stack.setObjectName("screenStack")
+
+        # Регистрация пользовательских меню: экран создаётся при первом переходе на него
+        self.screen_factories = {
+            "main": lambda: MainMenu(self.switch_to, self.show_admin_auth),
+            "games": lambda: GamesMenu(self.switch_to),
+            "browser": lambda: BrowserMenu(self.switch_to),
+            "chat": lambda: ChatMenu(self.switch_to),
+            "settings": lambda: SettingsMenu(self.switch_to),
+        }
+        if not self.lazy_screens:
+            for name in self.screen_factories:
+                self.get_menu(name)
+
+        # Изменения каталогов: сделанные в лаунчере и сторонними программами на диске
+        self.catalog_watcher = CatalogWatcher("data", self)
+        self.catalog_watcher.catalog_changed.connect(self.on_catalog_changed)
 
         # Основной layout
         main_layout = QVBoxLayout()
@@ -127,59 +152,85 @@ class Launcher(QWidget):
         self.switch_to("main")
         self.showFullScreen()
 
+    def get_menu(self, screen_name):
+        """Экран по имени; при первом обращении он создаётся и добавляется в стек"""
+        menu = self.menus.get(screen_name)
+        if menu is not None:
+            return menu
+
+        factory = self.screen_factories.get(screen_name)
+        if factory is None:
+            return None
+
+        try:
+            started = time.perf_counter()
+            with startup_profiler.span(f"screen:{screen_name}"):
+                menu = factory()
+            menu.setProperty("screen", True)
+            self.stack.addWidget(menu)
+            self.menus[screen_name] = menu
+            logging.debug(f"Меню '{screen_name}' создано за {(time.perf_counter() - started) * 1000:.1f} мс")
+            return menu
+        except Exception as e:
+            logging.error(f"Ошибка при инициализации меню '{screen_name}': {e}", exc_info=True)
+            QMessageBox.critical(self, "Ошибка", "Не удалось загрузить интерфейс")
+            return None
+
+    def paintEvent(self, event):
+        """Замер времени до первой отрисовки и запуск предварительного построения экранов"""
+        super().paintEvent(event)
+        if self.first_paint_ms is None:
+            self.first_paint_ms = (time.perf_counter() - self.created_at) * 1000
+            logging.info(f"Время до первой отрисовки: {self.first_paint_ms:.1f} мс")
+            startup_profiler.mark("first_paint")
+            startup_profiler.finish()
+            # Индексы поиска строятся на рабочем потоке, когда первый экран уже на месте
+            QTimer.singleShot(0, get_index_builder().start)
+            if os.getenv("LAUNCHER_PREFETCH", "1") != "0":
+                self.prefetch_queue = [name for name in self.PREFETCH_SCREENS if name not in self.menus]
+                QTimer.singleShot(0, self.prefetch_next)
+            if prewarm.enabled():
+                # Прогрев частых программ — когда интерфейс уже построен и пользователь осматривается
+                QTimer.singleShot(self.PREWARM_DELAY_MS, prewarm.start_background)
+
+    def prefetch_next(self):
+        """Построить один экран из очереди и уступить цикл событий до следующего"""
+        while self.prefetch_queue:
+            name = self.prefetch_queue.pop(0)
+            if name not in self.menus:
+                self.get_menu(name)
+                break
+        if self.prefetch_queue:
+            QTimer.singleShot(0, self.prefetch_next)
+
+    def on_catalog_changed(self, name, diff):
+        """Передать разницу каталога меню, которые умеют обновляться точечно"""
+        for menu_name, menu in self.menus.items():
+            if hasattr(menu, "apply_catalog_diff"):
+                try:
+                    menu.apply_catalog_diff(name, diff)
+                except Exception as e:
+                    logging.error(f"Ошибка обновления меню '{menu_name}' по каталогу {name}: {e}")
+
     def setup_admin_button(self, layout):
         """Настройка кнопки администратора"""
-        admin_icon = self.load_icon("assets/admin_icon.png")
-        self.admin_button.setIcon(admin_icon)
-        self.admin_button.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(255, 255, 255, 0.2);
-                border-radius: 15px;
-                padding: 8px;
-                border: 1px solid rgba(255, 255, 255, 0.4);
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 255, 255, 0.3);
-            }
-            QPushButton:pressed {
-                background-color: rgba(255, 255, 255, 0.4);
-            }
-        """)
-        self.admin_button.setIconSize(QSize(30, 30))
+        set_role(self.admin_button, "top")
+        self.load_icon("assets/admin_icon.png", self.admin_button)
         self.admin_button.setToolTip("Админ-панель")
         self.admin_button.clicked.connect(self.show_admin_auth)
         layout.addWidget(self.admin_button)
 
     def setup_toggle_button(self, layout):
         """Настройка кнопки переключения режима"""
-        fullscreen_icon = self.load_icon("assets/fullscreen_icon.png")
-        self.toggle_button.setIcon(fullscreen_icon)
-        self.toggle_button.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(255, 255, 255, 0.2);
-                border-radius: 15px;
-                padding: 8px;
-                border: 1px solid rgba(255, 255, 255, 0.4);
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 255, 255, 0.3);
-            }
-            QPushButton:pressed {
-                background-color: rgba(255, 255, 255, 0.4);
-            }
-        """)
-        self.toggle_button.setIconSize(QSize(30, 30))
+        set_role(self.toggle_button, "top")
+        self.load_icon("assets/fullscreen_icon.png", self.toggle_button)
         self.toggle_button.setToolTip("Полноэкранный режим")
         self.toggle_button.clicked.connect(self.toggle_fullscreen)
         layout.addWidget(self.toggle_button)
 
-    def load_icon(self, path):
-        """Загрузка иконки с обработкой ошибок"""
-        icon_path = self.resource_path(path)
-        if os.path.exists(icon_path):
-            return QIcon(icon_path)
-        logging.warning(f"Иконка не найдена: {icon_path}")
-        return QIcon()
+    def load_icon(self, path, button, size=QSize(30, 30)):
+        """Фоновая загрузка иконки кнопки (до загрузки показывается заглушка)"""
+        get_icon_loader().set_button_icon(button, self.resource_path(path), size)
 
     def show_admin_auth(self):
         """Показывает диалог авторизации администратора"""
@@ -204,11 +255,15 @@ class Launcher(QWidget):
     def switch_to(self, screen_name):
         """Переключение между экранами"""
         try:
-            if screen_name not in self.menus:
+            if screen_name not in self.screen_factories:
                 logging.error(f"Попытка переключения на несуществующий экран: {screen_name}")
                 return
 
-            self.stack.setCurrentWidget(self.menus[screen_name])
+            menu = self.get_menu(screen_name)
+            if menu is None:
+                return
+
+            self.stack.setCurrentWidget(menu)
             self.admin_button.setVisible(screen_name == "main")
             logging.debug(f"Переключено на экран: {screen_name}")
         except Exception as e:
@@ -227,8 +282,7 @@ class Launcher(QWidget):
                 icon_path = "assets/fullscreen_icon.png"
                 self.toggle_button.setToolTip("Переключить в оконный режим")
 
-            icon = self.load_icon(icon_path)
-            self.toggle_button.setIcon(icon)
+            self.load_icon(icon_path, self.toggle_button)
             logging.debug(f"Режим переключен: {'Полноэкранный' if self.isFullScreen() else 'Оконный'}")
         except Exception as e:
             logging.error(f"Ошибка при переключении режима: {e}", exc_info=True)
@@ -236,16 +290,12 @@ class Launcher(QWidget):
     def resizeEvent(self, event):
         """Обработка изменения размера окна"""
         try:
-            palette = self.palette()
-            brush = palette.brush(QPalette.ColorRole.Window)
-            if not brush.texture().isNull():
-                pixmap = brush.texture()
-                palette.setBrush(QPalette.ColorRole.Window,
-                                 QBrush(pixmap.scaled(
-                                     self.size(),
-                                     Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                                     Qt.TransformationMode.SmoothTransformation)))
-                self.setPalette(palette)
+            if self.background is not None and self.background.is_loaded():
+                # Пока окно тянут — быстрый вариант, сглаженный строится после паузы
+                smooth = self.background.has_smooth(self.size())
+                self.apply_background(smooth)
+                if not smooth:
+                    self.background_timer.start()
             super().resizeEvent(event)
         except Exception as e:
             logging.error(f"Ошибка при обработке изменения размера: {e}")
@@ -0,0 +1,175 @@
+import bisect
+from collections import OrderedDict
+
+from core.catalog_diff import record_key
+from core.catalog_store import catalog_snapshot
+from core.search_index import canonical, sort_in_chunks
+
+# Каталоги, по названиям которых работает автодополнение
+CATALOGS = ("apps", "games")
+
+
+class _Entry:
+    __slots__ = ("catalog", "record", "name", "suffixes", "rank")
+
+    def __init__(self, catalog, record, name, suffixes, rank):
+        self.catalog = catalog
+        self.record = record
+        self.name = name
+        self.suffixes = suffixes  # канонические хвосты названия, начиная с каждого слова
+        self.rank = rank
+
+
+class PrefixIndex:
+    """Автодополнение по началу любого слова названия.
+
+    Хвосты канонических названий (canonical, начиная с каждого слова)
+    лежат в отсортированном массиве, и префикс находится двумя бинарными
+    поисками. Результаты префиксов кэшируются (LRU на cache_size
+    запросов): при наборе «бл» → «бло» новый результат получается
+    фильтрацией кэшированного результата «бл», а не новым поиском по
+    массиву. Любое изменение записей сбрасывает кэш.
+    """
+
+    def __init__(self, key=record_key, cache_size=256):
+        self.key = key
+        self.cache_size = cache_size
+        self._keys = []  # отсортированные хвосты названий
+        self._ranks = []  # ранг записи для каждого хвоста из _keys
+        self._entries = {}  # (каталог, ключ записи) -> _Entry
+        self._by_rank = {}  # ранг -> _Entry
+        self._cache = OrderedDict()  # префикс -> ранги совпавших записей по возрастанию
+        self._seq = 0
+        self.cache_hits = 0
+        self.narrowed = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, catalog, record):
+        """Добавить или обновить запись"""
+        entry = self._insert(catalog, record)
+        if entry is not None:
+            for suffix in entry.suffixes:
+                position = bisect.bisect_right(self._keys, suffix)
+                self._keys.insert(position, suffix)
+                self._ranks.insert(position, entry.rank)
+
+    def _insert(self, catalog, record):
+        """Завести запись (без вставки хвостов в массив)"""
+        self.remove(catalog, record)
+        self._cache.clear()
+        name = canonical(record.get("name") or "")
+        if not name:
+            return None
+        words = name.split()
+        suffixes = tuple(" ".join(words[i:]) for i in range(len(words)))
+        self._seq += 1
+        # Короткие названия выше; при равной длине — порядок добавления
+        rank = (len(name) << 32) | self._seq
+        entry = _Entry(catalog, record, name, suffixes, rank)
+        self._entries[(catalog, self.key(record))] = entry
+        self._by_rank[rank] = entry
+        return entry
+
+    def remove(self, catalog, record):
+        entry = self._entries.pop((catalog, self.key(record)), None)
+        if entry is None:
+            return
+        del self._by_rank[entry.rank]
+        for suffix in entry.suffixes:
+            position = bisect.bisect_left(self._keys, suffix)
+            while self._ranks[position] != entry.rank:
+                position += 1
+            del self._keys[position]
+            del self._ranks[position]
+        self._cache.clear()
+
+    def load(self, catalog, records):
+        """Заменить все записи каталога; массив пересортировывается один раз"""
+        for entry in [e for e in self._entries.values() if e.catalog == catalog]:
+            self.remove(catalog, entry.record)
+        pairs = list(zip(self._keys, self._ranks))
+        for record in {self.key(record): record for record in records}.values():
+            entry = self._insert(catalog, record)
+            if entry is not None:
+                pairs.extend((suffix, entry.rank) for suffix in entry.suffixes)
+        pairs = sort_in_chunks(pairs)
+        self._keys = [suffix for suffix, _ in pairs]
+        self._ranks = [rank for _, rank in pairs]
+
+    def apply_diff(self, catalog, diff):
+        for record in diff.removed:
+            self.remove(catalog, record)
+        for record in [*diff.added, *diff.updated]:
+            self.add(catalog, record)
+
+    def _match(self, prefix):
+        """Ранги записей, у которых какое-то слово начинается с prefix, по возрастанию"""
+        cached = self._cache.get(prefix)
+        if cached is not None:
+            self._cache.move_to_end(prefix)
+            self.cache_hits += 1
+            return cached
+
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + "\uffff", start)
+        matched = set(self._ranks[start:end])
+        # Ближайший закэшированный более короткий префикс: новый результат — его подмножество,
+        # уже упорядоченное по рангу. Отбор из него по множеству диапазона дешевле сортировки,
+        # пока он не намного больше диапазона
+        parent = None
+        for length in range(len(prefix) - 1, 0, -1):
+            parent = self._cache.get(prefix[:length])
+            if parent is not None:
+                break
+        if parent is not None and len(parent) <= 4 * len(matched):
+            self.narrowed += 1
+            ranks = [rank for rank in parent if rank in matched]
+        else:
+            self.misses += 1
+            ranks = sorted(matched)
+
+        self._cache[prefix] = ranks
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return ranks
+
+    def complete(self, query, limit=10):
+        """До limit записей, какое-то слово которых начинается с query: [(каталог, запись)]"""
+        prefix = canonical(query)
+        if not prefix:
+            return []
+        return [(self._by_rank[rank].catalog, self._by_rank[rank].record) for rank in self._match(prefix)[:limit]]
+
+
+_index = None
+
+
+def load_prefix_index(snapshot):
+    """Индекс автодополнения по снимку каталогов {имя каталога: [записи]} (см. catalog_snapshot)"""
+    index = PrefixIndex()
+    for name in CATALOGS:
+        index.load(name, snapshot.get(name, []))
+    return index
+
+
+def get_prefix_index(data_dir="data"):
+    """Общий индекс автодополнения; если его ещё не построил IndexBuilder, строится здесь же"""
+    global _index
+    if _index is None:
+        _index = load_prefix_index(catalog_snapshot(CATALOGS, data_dir))
+    return _index
+
+
+def set_prefix_index(index):
+    """Установить общий индекс автодополнения (построенный в фоне)"""
+    global _index
+    _index = index
+
+
+def apply_catalog_diff(name, diff):
+    """Передать индексу изменение каталога, если индекс уже построен"""
+    if _index is not None and name in CATALOGS:
+        _index.apply_diff(name, diff)
@@ -0,0 +1,322 @@
+import bisect
+import heapq
+import itertools
+import math
+import re
+from collections import Counter
+
+from core.catalog_diff import record_key
+from core.catalog_store import catalog_snapshot
+
+# Каталоги, по которым идёт поиск, в порядке показа при равной оценке
+CATALOGS = ("apps", "games", "sites", "chats")
+# По сколько элементов сортируется за раз при загрузке каталога (см. sort_in_chunks)
+SORT_CHUNK = 10000
+
+_TRANSLIT = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ж": "zh", "з": "z",
+    "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p",
+    "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "h", "ц": "c", "ч": "ch",
+    "ш": "sh", "щ": "sch", "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+}
+_TRANSLIT_TABLE = str.maketrans(_TRANSLIT)
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize(text):
+    """Сложить регистр (в том числе кириллицы), заменить ё на е и знаки на пробелы"""
+    return _SEPARATORS.sub(" ", text.casefold().replace("ё", "е")).strip()
+
+
+def canonical(text):
+    """Каноническая форма для индекса: нормализованный текст в латинской транслитерации.
+
+    Так «Блокнот», «блокнот» и «bloknot» дают одну и ту же строку.
+    """
+    return normalize(text).translate(_TRANSLIT_TABLE)
+
+
+def sort_in_chunks(items, chunk=SORT_CHUNK):
+    """Отсортированная копия items: куски по chunk сортируются отдельно и сливаются.
+
+    Один sort всего массива держит GIL, и при построении индексов в фоне
+    (IndexBuilder) поток GUI стоял бы всё это время.
+    """
+    return list(heapq.merge(*(sorted(items[i:i + chunk]) for i in range(0, len(items), chunk))))
+
+
+def word_trigrams(words, last_is_prefix=False):
+    """Триграммы слов с двумя пробелами в начале и одним в конце слова.
+
+    Если last_is_prefix, у последнего слова нет конечного пробела: набираемое
+    слово совпадает с началом слова в названии.
+    """
+    grams = set()
+    for position, word in enumerate(words):
+        padded = "  " + word
+        if not (last_is_prefix and position == len(words) - 1):
+            padded += " "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def searchable_text(catalog, record):
+    """Текст записи, по которому она ищется"""
+    text = record.get("name") or ""
+    if catalog == "sites" and record.get("url"):
+        # Домен сайта без схемы и www: «github» находит GitHub
+        host = re.sub(r"^[a-z]+://(www\.)?", "", record["url"].lower()).split("/", 1)[0]
+        text = f"{text} {host}"
+    return text
+
+
+class _Document:
+    __slots__ = ("catalog", "record", "text", "grams", "rank")
+
+    def __init__(self, catalog, record, text, grams, seq):
+        self.catalog = catalog
+        self.record = record
+        self.text = text
+        self.grams = grams
+        # Порядок при равной оценке: короче название, раньше каталог в CATALOGS, раньше добавлен.
+        # Одно число, уникальное для документа: им документ представлен в индексе
+        catalog_rank = CATALOGS.index(catalog) if catalog in CATALOGS else len(CATALOGS)
+        self.rank = ((len(text) * (len(CATALOGS) + 1) + catalog_rank) << 32) | seq
+
+
+class SearchIndex:
+    """Нечёткий поиск по приложениям, играм, сайтам и чатам.
+
+    Названия приводятся к канонической форме (canonical) и раскладываются на
+    триграммы. Для каждой триграммы хранится множество документов (для
+    пересечений) и тот же список, упорядоченный по рангу документа: короткие
+    названия раньше. Запрос, все триграммы которого есть в документе, —
+    точное совпадение; если их мало, ищутся опечатки: при длине запроса от
+    4 символов одна, от 8 — две, каждая портит не больше трёх триграмм.
+    Кандидаты с опечатками набираются подсчётом по редким триграммам, а не
+    перебором индекса. Обновляется записями по одной (add, remove) или
+    разницей каталога (apply_diff).
+    """
+
+    MIN_OVERLAP = 0.5  # доля общих триграмм, без которой совпадение не считается опечаткой
+    MAX_PROBE = 2000  # самый длинный список триграммы, по которому считаются нечёткие кандидаты
+    MAX_CANDIDATES = 500  # сколько нечётких кандидатов оценивается полностью
+    MAX_SCAN = 3000  # сколько документов частой триграммы просматривается в поисках точных совпадений
+
+    def __init__(self, key=record_key):
+        self.key = key
+        self._docs = {}  # (каталог, ключ записи) -> _Document
+        self._by_rank = {}  # ранг -> _Document
+        self._postings = {}  # триграмма -> множество рангов документов
+        self._ranked = {}  # триграмма -> отсортированный список рангов документов
+        self._texts = []  # отсортированные канонические названия: начала находятся бинарным поиском
+        self._text_ranks = []  # ранг документа для каждого названия из _texts
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, catalog, record):
+        """Добавить или обновить запись каталога"""
+        doc = self._insert(catalog, record)
+        if doc is not None:
+            for gram in doc.grams:
+                bisect.insort(self._ranked.setdefault(gram, []), doc.rank)
+            position = bisect.bisect_right(self._texts, doc.text)
+            self._texts.insert(position, doc.text)
+            self._text_ranks.insert(position, doc.rank)
+
+    def _insert(self, catalog, record):
+        """Завести документ и добавить его во множества триграмм (без списков по рангу)"""
+        self.remove(catalog, record)
+        text = canonical(searchable_text(catalog, record))
+        if not text:
+            return None
+        self._seq += 1
+        doc = _Document(catalog, record, text, frozenset(word_trigrams(text.split())), self._seq)
+        self._docs[(catalog, self.key(record))] = doc
+        self._by_rank[doc.rank] = doc
+        for gram in doc.grams:
+            self._postings.setdefault(gram, set()).add(doc.rank)
+        return doc
+
+    def remove(self, catalog, record):
+        doc = self._docs.pop((catalog, self.key(record)), None)
+        if doc is None:
+            return
+        del self._by_rank[doc.rank]
+        position = bisect.bisect_left(self._texts, doc.text)
+        while self._text_ranks[position] != doc.rank:
+            position += 1
+        del self._texts[position]
+        del self._text_ranks[position]
+        for gram in doc.grams:
+            posting = self._postings[gram]
+            posting.discard(doc.rank)
+            ranked = self._ranked[gram]
+            del ranked[bisect.bisect_left(ranked, doc.rank)]
+            if not posting:
+                del self._postings[gram]
+                del self._ranked[gram]
+
+    def load(self, catalog, records):
+        """Заменить все записи каталога; списки по рангу сортируются один раз в конце"""
+        for doc in [d for d in self._docs.values() if d.catalog == catalog]:
+            self.remove(catalog, doc.record)
+        # Повторы ключа схлопываются заранее: удаление из ещё не отсортированного списка невозможно
+        unique = {self.key(record): record for record in records}
+        touched = {}
+        texts = list(zip(self._texts, self._text_ranks))
+        for record in unique.values():
+            doc = self._insert(catalog, record)
+            if doc is not None:
+                for gram in doc.grams:
+                    touched[gram] = self._ranked.setdefault(gram, [])
+                    touched[gram].append(doc.rank)
+                texts.append((doc.text, doc.rank))
+        for ranked in touched.values():
+            ranked.sort()
+        texts = sort_in_chunks(texts)
+        self._texts = [text for text, _ in texts]
+        self._text_ranks = [rank for _, rank in texts]
+
+    def apply_diff(self, catalog, diff):
+        """Обновить индекс по CatalogDiff: только добавленные, удалённые и изменённые записи"""
+        for record in diff.removed:
+            self.remove(catalog, record)
+        for record in [*diff.added, *diff.updated]:
+            self.add(catalog, record)
+
+    def search(self, query, limit=20):
+        """До limit лучших совпадений: [(каталог, запись)]"""
+        text = canonical(query)
+        if not text:
+            return []
+        query_grams = word_trigrams(text.split(), last_is_prefix=True)
+        total = len(query_grams)
+        grams = sorted(query_grams, key=lambda gram: len(self._postings.get(gram, ())))
+        postings = [self._postings.get(gram, ()) for gram in grams]
+
+        typos = 0 if len(text) < 4 else 1 if len(text) < 8 else 2
+
+        # Точные совпадения (все триграммы запроса); если их хватает, опечатки не ищутся
+        if len(postings[0]) > self.MAX_PROBE:
+            # Даже самая редкая триграмма частая: вместо пересечения больших множеств
+            # её список просматривается по рангу с ограничением MAX_SCAN
+            scored, complete = self._scan_exact(text, query_grams, grams[0], limit)
+            if len(scored) >= limit or typos == 0 or not complete:
+                return [(doc.catalog, doc.record) for *_, doc in heapq.nsmallest(limit, scored)]
+            exact = {rank for _, rank, _ in scored}
+        else:
+            exact = set(postings[0])
+            for posting in postings[1:]:
+                if not exact:
+                    break
+                exact.intersection_update(posting)
+            if len(exact) >= limit or typos == 0:
+                scored = [(-self._bonus(doc, text), doc.rank, doc) for doc in map(self._by_rank.__getitem__, exact)]
+                return [(doc.catalog, doc.record) for *_, doc in heapq.nsmallest(limit, scored)]
+
+        required = max(1, total - 3 * typos, math.ceil(total * self.MIN_OVERLAP))
+        # Частые триграммы (начала слов, распространённые слоги) дают огромные списки:
+        # по редким считается, в скольких из них есть документ, а частые учитываются
+        # только при оценке. Документ с required общими триграммами встречается
+        # хотя бы в required - (число частых) редких списках.
+        rare = [posting for posting in postings if len(posting) <= self.MAX_PROBE]
+        min_hits = max(1, required - (total - len(rare)))
+        # Документ хотя бы из min_hits редких списков есть хотя бы в одном из
+        # len(rare) - min_hits + 1 самых коротких: если их объединение невелико,
+        # оно и есть кандидаты, и считать вхождения по всем спискам не нужно
+        shortest = rare[:len(rare) - min_hits + 1]
+        if sum(map(len, shortest)) <= self.MAX_CANDIDATES:
+            candidates = exact.union(*shortest)
+        else:
+            counts = Counter()
+            for posting in rare:
+                counts.update(posting)
+            # Оцениваются только документы, встретившиеся в наибольшем числе редких списков:
+            # порог поднимается по гистограмме вхождений, пока кандидатов больше MAX_CANDIDATES
+            histogram = Counter(counts.values())
+            threshold = min_hits
+            above = sum(count for hits, count in histogram.items() if hits >= threshold)
+            while above > self.MAX_CANDIDATES and threshold < len(rare):
+                above -= histogram[threshold]
+                threshold += 1
+            candidates = {rank for rank, hits in counts.items() if hits >= threshold}
+            if threshold > min_hits and above < self.MAX_CANDIDATES:
+                # Оставшиеся места — документам с числом вхождений на единицу меньше порога
+                tied = (rank for rank, hits in counts.items() if hits == threshold - 1)
+                candidates.update(itertools.islice(tied, self.MAX_CANDIDATES - above))
+            candidates |= exact
+        if not rare:
+            # Все триграммы частые: кандидаты — начало списка самой редкой по рангу
+            candidates.update(self._ranked.get(grams[0], ())[:self.MAX_CANDIDATES])
+
+        bonus = self._bonus
+        shared = ((doc, len(query_grams & doc.grams)) for doc in map(self._by_rank.__getitem__, candidates))
+        scored = [(-bonus(doc, text) - 2 * hits / total, doc.rank, doc) for doc, hits in shared if hits >= required]
+        return [(doc.catalog, doc.record) for *_, doc in heapq.nsmallest(limit, scored)]
+
+    @staticmethod
+    def _bonus(doc, text):
+        """2 — название начинается с запроса, 1 — содержит его, 0 — совпали только триграммы"""
+        return 2 if doc.text.startswith(text) else 1 if text in doc.text else 0
+
+    def _scan_exact(self, text, query_grams, gram, limit):
+        """Точные совпадения для частой триграммы gram.
+
+        Названия, начинающиеся с запроса (лучшая оценка), находятся двумя
+        бинарными поисками по _texts: если их не меньше limit, список
+        триграммы не просматривается. Иначе остальные места заполняются из
+        первых MAX_SCAN документов списка gram в порядке ранга. Возвращает
+        оценённые совпадения и признак того, что список просмотрен целиком.
+        """
+        start = bisect.bisect_left(self._texts, text)
+        end = bisect.bisect_left(self._texts, text + "\uffff", start)
+        by_rank = self._by_rank
+        ranked = self._ranked[gram]
+        if end - start > self.MAX_PROBE:
+            # Начинающихся с запроса много (запрос из одной-двух букв): они часто
+            # встречаются и в начале списка gram, упорядоченного по рангу
+            docs = (doc for doc in map(by_rank.__getitem__, ranked) if doc.text.startswith(text))
+            return [(-2, doc.rank, doc) for doc in itertools.islice(docs, limit)], False
+        leading = self._text_ranks[start:end]
+        if len(leading) >= limit:
+            return [(-2, rank, by_rank[rank]) for rank in heapq.nsmallest(limit, leading)], False
+        scored = [(-2, rank, by_rank[rank]) for rank in leading]
+        leading = set(leading)
+        docs = [doc for doc in map(by_rank.__getitem__, ranked[:self.MAX_SCAN])
+                if query_grams <= doc.grams and doc.rank not in leading]
+        scored.extend((-1 if text in doc.text else 0, doc.rank, doc) for doc in docs)
+        return scored, len(ranked) <= self.MAX_SCAN
+
+
+_index = None
+
+
+def load_search_index(snapshot):
+    """Индекс поиска по снимку каталогов {имя каталога: [записи]} (см. catalog_snapshot)"""
+    index = SearchIndex()
+    for name in CATALOGS:
+        index.load(name, snapshot.get(name, []))
+    return index
+
+
+def get_search_index(data_dir="data"):
+    """Общий индекс поиска; если его ещё не построил IndexBuilder, строится здесь же"""
+    global _index
+    if _index is None:
+        _index = load_search_index(catalog_snapshot(CATALOGS, data_dir))
+    return _index
+
+
+def set_search_index(index):
+    """Установить общий индекс поиска (построенный в фоне)"""
+    global _index
+    _index = index
+
+
+def apply_catalog_diff(name, diff):
+    """Передать индексу изменение каталога, если индекс уже построен"""
+    if _index is not None and name in CATALOGS:
+        _index.apply_diff(name, diff)
@@ -0,0 +1,200 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict, deque
+
+# Виды событий запуска
+APP = "app"
+GAME = "game"
+SITE = "site"
+
+USAGE_DB = os.path.join("data", "usage.db")
+
+
+def usage_key(kind, target):
+    """Ключ записи: нормализованный путь для приложений и игр, URL для сайтов"""
+    if kind == SITE:
+        return target.strip()
+    return os.path.normcase(os.path.abspath(target))
+
+
+class UsageAggregate:
+    """Итоги по одной записи каталога: число запусков, последний запуск и
+    медиана времени запуска по последним DURATION_WINDOW замерам"""
+
+    DURATION_WINDOW = 64
+
+    __slots__ = ("kind", "key", "count", "last_ts", "durations")
+
+    def __init__(self, kind, key, count=0, last_ts=0.0, durations=()):
+        self.kind = kind
+        self.key = key
+        self.count = count
+        self.last_ts = last_ts
+        self.durations = deque(durations, maxlen=self.DURATION_WINDOW)
+
+    def add(self, ts, duration_ms):
+        self.count += 1
+        self.last_ts = max(self.last_ts, ts)
+        if duration_ms is not None:
+            self.durations.append(duration_ms)
+
+    def median_ms(self):
+        if not self.durations:
+            return None
+        ordered = sorted(self.durations)
+        middle = len(ordered) // 2
+        return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+    def as_dict(self):
+        return {
+            "kind": self.kind,
+            "key": self.key,
+            "count": self.count,
+            "last_ts": self.last_ts,
+            "median_ms": self.median_ms(),
+        }
+
+
+class UsageStats:
+    """История запусков приложений, игр и сайтов.
+
+    Каждое событие дописывается в журнал events (SQLite), и в той же
+    транзакции обновляется строка итогов aggregates. Итоги целиком держатся
+    в памяти: recent() идёт по OrderedDict в порядке последнего запуска, а
+    most_used() берёт заранее отсортированный список, который
+    пересчитывается только после новых событий, — журнал при запросах не
+    читается. Раз в COMPACT_EVERY событий старые записи журнала сверх
+    keep_events удаляются: итоги от этого не меняются. Работает только из
+    GUI-потока.
+    """
+
+    COMPACT_EVERY = 500
+
+    def __init__(self, db_path=USAGE_DB, keep_events=10000):
+        self.db_path = db_path
+        self.keep_events = keep_events
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts REAL NOT NULL,
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                duration_ms REAL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS aggregates (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                last_ts REAL NOT NULL,
+                durations TEXT NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+        """)
+        self._by_recent = OrderedDict()  # (вид, ключ) -> UsageAggregate, последний запуск в конце
+        self._ranked = None  # итоги по убыванию числа запусков; None — пересчитать
+        self._since_compact = 0
+        self.listeners = []  # callback(UsageAggregate) после каждого события
+        rows = self._conn.execute("SELECT kind, key, count, last_ts, durations FROM aggregates ORDER BY last_ts")
+        for kind, key, count, last_ts, durations in rows:
+            self._by_recent[(kind, key)] = UsageAggregate(kind, key, count, last_ts, json.loads(durations))
+
+    def record(self, kind, target, duration_ms=None, ts=None):
+        """Записать запуск target; duration_ms — время от нажатия до старта процесса"""
+        ts = time.time() if ts is None else ts
+        key = usage_key(kind, target)
+        aggregate = self._by_recent.pop((kind, key), None) or UsageAggregate(kind, key)
+        aggregate.add(ts, duration_ms)
+        self._by_recent[(kind, key)] = aggregate
+        self._ranked = None
+        try:
+            self._conn.execute("BEGIN")
+            self._conn.execute("INSERT INTO events (ts, kind, key, duration_ms) VALUES (?, ?, ?, ?)",
+                               (ts, kind, key, duration_ms))
+            self._conn.execute("INSERT OR REPLACE INTO aggregates VALUES (?, ?, ?, ?, ?)",
+                               (kind, key, aggregate.count, aggregate.last_ts, json.dumps(list(aggregate.durations))))
+            self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            logging.error(f"Не удалось записать событие запуска {key}: {e}")
+
+        self._since_compact += 1
+        if self._since_compact >= self.COMPACT_EVERY:
+            self.compact()
+        for listener in list(self.listeners):
+            try:
+                listener(aggregate)
+            except Exception as e:
+                logging.error(f"Ошибка обработчика статистики запусков: {e}")
+        return aggregate
+
+    def get(self, kind, target):
+        return self._by_recent.get((kind, usage_key(kind, target)))
+
+    def most_used(self, n=10, kind=None):
+        """n самых частых записей (все виды или только kind)"""
+        if self._ranked is None:
+            self._ranked = sorted(self._by_recent.values(), key=lambda a: (a.count, a.last_ts), reverse=True)
+        result = []
+        for aggregate in self._ranked:
+            if kind is None or aggregate.kind == kind:
+                result.append(aggregate)
+                if len(result) == n:
+                    break
+        return result
+
+    def recent(self, n=10, kind=None):
+        """n последних запущенных записей, сначала самые свежие"""
+        result = []
+        for aggregate in reversed(self._by_recent.values()):
+            if kind is None or aggregate.kind == kind:
+                result.append(aggregate)
+                if len(result) == n:
+                    break
+        return result
+
+    def aggregates(self):
+        return list(self._by_recent.values())
+
+    def events(self, since_seq=0):
+        """Сохранившиеся события журнала после since_seq: (seq, ts, вид, ключ, duration_ms)"""
+        return self._conn.execute("SELECT seq, ts, kind, key, duration_ms FROM events WHERE seq > ? ORDER BY seq",
+                                  (since_seq,)).fetchall()
+
+    def compact(self):
+        """Удалить из журнала события старше последних keep_events"""
+        self._since_compact = 0
+        try:
+            removed = self._conn.execute(
+                "DELETE FROM events WHERE seq <= (SELECT MAX(seq) FROM events) - ?", (self.keep_events,)).rowcount
+        except sqlite3.Error as e:
+            logging.error(f"Не удалось сжать журнал запусков: {e}")
+            return 0
+        if removed:
+            logging.info(f"Журнал запусков сжат: удалено {removed} событий")
+        return removed
+
+    def close(self):
+        self._conn.close()
+
+
+_stats = None
+
+
+def get_usage_stats():
+    """Общая статистика запусков (открывается при первом обращении)"""
+    global _stats
+    if _stats is None:
+        _stats = UsageStats()
+    return _stats
@@ -1,6 +1,8 @@
 import json
 import os
 
+from utils.file_storage import atomic_write_json
+
 class DBHandler:
     def __init__(self, db_file):
         self.db_file = db_file
@@ -13,8 +15,7 @@ class DBHandler:
             return json.load(f)
 
     def write(self, data):
-        with open(self.db_file, 'w') as f:
-            json.dump(data, f, indent=4)
+        atomic_write_json(self.db_file, data, indent=4, ensure_ascii=True)
 
     def get(self, key):
         data = self.read()
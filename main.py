@@ -1,16 +1,34 @@
 import logging
 import sys
 
-from PyQt6.QtWidgets import QApplication, QStackedWidget, QMessageBox
-from core.launcher import Launcher
+# Профилировщик включается до остальных импортов, чтобы замерить и их
+from utils import startup_profiler
+startup_profiler.enable_from_args(sys.argv)
+
+from PyQt6.QtWidgets import QApplication, QStackedWidget, QMessageBox  # noqa: E402
+from core.launcher import Launcher  # noqa: E402
+from utils import snapshot, style_manager, write_queue  # noqa: E402
+from utils.pixmap_cache import pixmap_cache  # noqa: E402
 
 
 def main():
     try:
-        app = QApplication(sys.argv)
+        with startup_profiler.span("QApplication"):
+            app = QApplication(sys.argv)
+        with startup_profiler.span("style_manager.apply"):
+            style_manager.apply(app)
+        with startup_profiler.span("snapshot.enable"):
+            snapshot.enable()
+        write_queue.start()
+        app.aboutToQuit.connect(write_queue.stop)
+        app.aboutToQuit.connect(snapshot.refresh)
+        app.aboutToQuit.connect(startup_profiler.finish)
+        app.aboutToQuit.connect(lambda: logging.info(f"Кэш изображений: {pixmap_cache.stats()}"))
         stacked_widget = QStackedWidget()
-        launcher = Launcher(stacked_widget)
-        launcher.show()
+        with startup_profiler.span("Launcher.__init__"):
+            launcher = Launcher(stacked_widget)
+        with startup_profiler.span("Launcher.show"):
+            launcher.show()
         sys.exit(app.exec())
     except Exception as e:
         logging.critical(f"Критическая ошибка: {e}", exc_info=True)
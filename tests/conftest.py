@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import catalog_store  # noqa: E402
+from utils import storage  # noqa: E402
+
+BACKENDS = ("json", "sqlite")
+
+
+def make_backend(kind, data_dir):
+    """Бэкенд хранения для каталогов во временном data_dir (база SQLite — рядом)"""
+    if kind == "sqlite":
+        return storage.SQLiteBackend(os.path.join(os.path.dirname(data_dir), "launcher.db"), data_dir=data_dir)
+    return storage.JsonFileBackend()
+
+
+class Launcher:
+    """Состояние хранения одного «запуска» лаунчера: бэкенд и каталоги в памяти"""
+
+    def __init__(self, kind, data_dir):
+        self.kind = kind
+        self.data_dir = data_dir
+        self.backend = None
+        self.start()
+
+    def path(self, catalog):
+        return os.path.join(self.data_dir, f"{catalog}.json")
+
+    def start(self):
+        self.backend = make_backend(self.kind, self.data_dir)
+        storage.set_backend(self.backend)
+        catalog_store._stores.clear()
+
+    def restart(self):
+        """Перезапуск: новый бэкенд на тех же файлах и пустой кэш каталогов"""
+        self.stop()
+        self.start()
+
+    def stop(self):
+        if hasattr(self.backend, "close"):
+            self.backend.close()
+        storage.set_backend(None)
+        catalog_store._stores.clear()
+
+
+@pytest.fixture(params=BACKENDS)
+def launcher(request, tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    launcher = Launcher(request.param, str(data_dir))
+    yield launcher
+    launcher.stop()
@@ -0,0 +1,33 @@
+"""Импорт каталогов из CSV и JSON Lines и выбор хранилища для --data-dir."""
+import pytest
+
+from catalog_io import import_catalog, open_backend
+
+
+def test_empty_csv_cells_match_missing_jsonl_fields(launcher, tmp_path):
+    csv_path = tmp_path / "games.csv"
+    csv_path.write_text("name,path,icon_path\nCSV,/games/csv,\n", encoding="utf-8")
+    jsonl_path = tmp_path / "games.jsonl"
+    jsonl_path.write_text('{"name": "JSONL", "path": "/games/jsonl"}\n', encoding="utf-8")
+
+    for path in (csv_path, jsonl_path):
+        assert import_catalog("games", str(path), launcher.data_dir).imported == 1
+
+    games = list(launcher.backend.iter_records(launcher.path("games")))
+    assert [(game["name"], game.get("icon_path")) for game in games] == [("CSV", None), ("JSONL", None)]
+
+
+def test_sqlite_data_dir_needs_its_own_database(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    monkeypatch.setenv("LAUNCHER_STORAGE", "sqlite")
+    monkeypatch.delenv("LAUNCHER_DB", raising=False)
+    with pytest.raises(ValueError):
+        open_backend(str(data_dir))
+
+    monkeypatch.setenv("LAUNCHER_DB", str(tmp_path / "other.db"))
+    backend = open_backend(str(data_dir))
+    try:
+        assert backend.data_dir == str(data_dir)
+    finally:
+        backend.close()
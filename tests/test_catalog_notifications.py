@@ -0,0 +1,103 @@
+"""Разница, которую каталог в памяти рассылает подписчикам после записи."""
+import pytest
+
+from core.catalog_store import get_store, reload_store
+
+
+def subscribe(store):
+    diffs = []
+    store.listeners.append(diffs.append)
+    return diffs
+
+
+def ids(records):
+    return sorted(record["id"] for record in records)
+
+
+def test_each_change_notifies_after_write(launcher):
+    store = get_store(launcher.path("games"))
+    diffs = subscribe(store)
+
+    game = store.add({"name": "a"})
+    store.update(game["id"], {"name": "b"})
+    store.delete(game["id"])
+
+    assert [(ids(d.added), ids(d.updated), ids(d.removed)) for d in diffs] == [
+        ([1], [], []), ([], [1], []), ([], [], [1])]
+    assert diffs[1].updated[0]["name"] == "b"
+    assert diffs[2].records == []
+
+
+def test_transaction_notifies_once_with_merged_diff(launcher):
+    store = get_store(launcher.path("games"))
+    first = store.add({"name": "first"})
+    diffs = subscribe(store)
+
+    with store.transaction():
+        kept = store.add({"name": "kept"})
+        dropped = store.add({"name": "dropped"})
+        store.update(kept["id"], {"name": "renamed"})
+        store.update(first["id"], {"name": "changed"})
+        store.delete(dropped["id"])
+
+    assert len(diffs) == 1
+    diff = diffs[0]
+    assert ids(diff.added) == [kept["id"]] and diff.added[0]["name"] == "renamed"
+    assert ids(diff.updated) == [first["id"]]
+    assert diff.removed == []
+    assert ids(diff.records) == [first["id"], kept["id"]]
+
+
+def test_rolled_back_transaction_does_not_notify(launcher):
+    store = get_store(launcher.path("games"))
+    diffs = subscribe(store)
+
+    with pytest.raises(ValueError):
+        with store.transaction():
+            store.add({"name": "a"})
+            raise ValueError("отмена")
+
+    assert diffs == []
+    assert store.all() == []
+
+
+def test_refresh_notifies_only_external_changes(launcher):
+    file_path = launcher.path("chats")
+    store = get_store(file_path)
+    store.add({"name": "a"})
+    diffs = subscribe(store)
+
+    reload_store(file_path)
+    assert diffs == []
+
+    launcher.backend.save(file_path, [{"id": 1, "name": "b"}, {"id": 5, "name": "c"}])
+    reload_store(file_path)
+    assert len(diffs) == 1
+    assert ids(diffs[0].added) == [5] and ids(diffs[0].updated) == [1]
+    assert store.get(1)["name"] == "b"
+
+
+def test_failing_listener_does_not_break_write(launcher):
+    store = get_store(launcher.path("chats"))
+
+    def fail(diff):
+        raise RuntimeError("подписчик")
+
+    store.listeners.append(fail)
+    diffs = subscribe(store)
+    store.add({"name": "a"})
+
+    assert len(diffs) == 1
+    launcher.restart()
+    assert [chat["name"] for chat in get_store(launcher.path("chats")).all()] == ["a"]
+
+
+def test_refresh_after_own_write_does_not_rebuild(launcher, monkeypatch):
+    file_path = launcher.path("apps")
+    store = get_store(file_path)
+    store.add({"name": "a", "category_id": 1})
+    rebuilds = []
+    monkeypatch.setattr(store, "_rebuild", rebuilds.append)
+
+    reload_store(file_path)
+    assert rebuilds == []
@@ -0,0 +1,149 @@
+"""Последовательности id каталогов: хранятся вместе с каталогом и только растут."""
+import multiprocessing
+import threading
+
+import pytest
+
+from conftest import make_backend
+from core.catalog_store import CatalogStore, get_store
+from utils.json_utils import load_json
+
+
+def _reserve(args):
+    """Рабочий процесс: свой бэкенд на общих файлах, id по одному"""
+    kind, data_dir, file_path, count = args
+    backend = make_backend(kind, data_dir)
+    try:
+        return [backend.next_ids(file_path, 1) for _ in range(count)]
+    finally:
+        if hasattr(backend, "close"):
+            backend.close()
+
+
+def test_ids_not_reused_after_delete_and_restart(launcher):
+    store = get_store(launcher.path("apps"))
+    ids = [store.add({"name": f"app{i}", "category_id": 1})["id"] for i in range(3)]
+    assert ids == [1, 2, 3]
+    assert store.delete(3)
+
+    launcher.restart()
+    store = get_store(launcher.path("apps"))
+    assert [record["id"] for record in store.all()] == [1, 2]
+    assert store.add({"name": "new", "category_id": 1})["id"] == 4
+
+
+def test_ids_not_reused_after_deleting_every_record(launcher):
+    store = get_store(launcher.path("games"))
+    for i in range(5):
+        store.add({"name": f"game{i}"})
+    for record in store.all():
+        store.delete(record["id"])
+
+    launcher.restart()
+    assert get_store(launcher.path("games")).add({"name": "new"})["id"] == 6
+
+
+def test_sequence_not_below_catalog_max_id(launcher):
+    file_path = launcher.path("apps")
+    assert launcher.backend.next_ids(file_path) == 1
+    # Каталог изменён в обход последовательности: id в нём уже больше
+    launcher.backend.save(file_path, [{"id": 10, "name": "a"}, {"id": 50, "name": "b"}])
+
+    launcher.restart()
+    assert get_store(file_path).add({"name": "c"})["id"] == 51
+    assert launcher.backend.next_ids(file_path, 1, floor=20) == 52
+
+
+def test_ids_given_to_records_without_id(launcher):
+    file_path = launcher.path("sites")
+    launcher.backend.save(file_path, [{"id": 7, "name": "a", "url": "a"}, {"name": "b", "url": "b"}])
+
+    launcher.restart()
+    store = get_store(file_path)
+    assert [record["id"] for record in store.all()] == [7, 8]
+    assert store.delete(8)
+    assert store.add({"name": "c", "url": "c"})["id"] == 9
+
+
+def test_store_does_not_change_shared_file_data(launcher):
+    file_path = launcher.path("sites")
+    launcher.backend.save(file_path, [{"name": "a", "url": "a"}])
+
+    launcher.restart()
+    shared = load_json(file_path)
+    store = get_store(file_path)
+    store.update(store.all()[0]["id"], {"name": "b"})
+    # Выдача id и правки идут по копиям каталога, а не по данным кэша файлов
+    assert shared == [{"name": "a", "url": "a"}]
+    assert load_json(file_path) == [{"id": 1, "name": "b", "url": "a"}]
+
+
+def test_apply_batch_reserves_ids_in_one_block(launcher, monkeypatch):
+    calls = []
+    next_ids = launcher.backend.next_ids
+
+    def spy(file_path, count=1, floor=0):
+        calls.append(count)
+        return next_ids(file_path, count, floor)
+
+    monkeypatch.setattr(launcher.backend, "next_ids", spy)
+    store = get_store(launcher.path("apps"))
+    store.add({"name": "first", "category_id": 1})
+    calls.clear()
+
+    ops = [("add", {"name": f"app{i}"}) for i in range(5)] + [("update", 1, {"name": "renamed"})]
+    ids = store.apply_batch(ops, defaults={"category_id": 1})
+
+    assert calls == [5]
+    assert ids == [2, 3, 4, 5, 6, 1]
+    assert store.add({"name": "after", "category_id": 1})["id"] == 7
+    assert calls == [5, 1]
+
+
+def test_failed_batch_does_not_reuse_reserved_ids(launcher):
+    store = get_store(launcher.path("apps"))
+
+    def validate(record):
+        if record["name"] == "bad":
+            raise ValueError("bad")
+
+    ops = [("add", {"name": "ok"}), ("add", {"name": "bad"})]
+    with pytest.raises(ValueError):
+        store.apply_batch(ops, validate=validate, defaults={"category_id": 1})
+    assert store.all() == []
+    # Зарезервированные, но не записанные id пропадают, а не выдаются повторно после перезапуска
+    launcher.restart()
+    assert get_store(launcher.path("apps")).add({"name": "ok", "category_id": 1})["id"] == 3
+
+
+def test_concurrent_reservation_between_processes(launcher):
+    file_path = launcher.path("apps")
+    launcher.backend.next_ids(file_path)  # коллекция и последовательность созданы до запуска процессов
+    tasks = [(launcher.kind, launcher.data_dir, file_path, 50)] * 8
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        results = pool.map(_reserve, tasks)
+
+    ids = [record_id for result in results for record_id in result]
+    assert len(set(ids)) == len(ids) == 400
+    assert sorted(ids) == list(range(2, 402))
+    assert launcher.backend.next_ids(file_path) == 402
+
+
+def test_concurrent_reservation_between_threads(launcher):
+    store = CatalogStore(launcher.path("chats"))
+    ids = []
+    ids_lock = threading.Lock()
+
+    def worker():
+        for _ in range(50):
+            record_id = store.next_id()
+            with ids_lock:
+                ids.append(record_id)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(ids)) == len(ids) == 400
@@ -0,0 +1,70 @@
+"""Фоновое построение индексов поиска и автодополнения по снимку каталогов."""
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from core import prefix_index, search_index  # noqa: E402
+from core.catalog_diff import CatalogDiff  # noqa: E402
+from core.catalog_store import get_store  # noqa: E402
+from core.index_builder import IndexBuilder  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def builder(app, launcher):
+    search_index.set_search_index(None)
+    prefix_index.set_prefix_index(None)
+    builder = IndexBuilder(launcher.data_dir)
+    yield builder
+    builder.pool.waitForDone()
+    search_index.set_search_index(None)
+    prefix_index.set_prefix_index(None)
+
+
+def wait_ready(builder):
+    loop = QtCore.QEventLoop()
+    builder.ready.connect(loop.quit)
+    QtCore.QTimer.singleShot(10000, loop.quit)
+    if not builder.is_ready():
+        loop.exec()
+    assert builder.is_ready()
+
+
+def names(results):
+    return [record["name"] for _, record in results]
+
+
+def test_builds_both_indexes_in_background(launcher, builder):
+    get_store(launcher.path("apps")).add({"name": "Калькулятор", "category_id": 1})
+    get_store(launcher.path("sites")).add({"name": "Календарь", "url": "https://example.com"})
+
+    assert not builder.is_ready()
+    builder.start()
+    wait_ready(builder)
+
+    assert sorted(names(search_index.get_search_index().search("кал"))) == ["Календарь", "Калькулятор"]
+    # Сайты в автодополнение не входят
+    assert names(prefix_index.get_prefix_index().complete("кал")) == ["Калькулятор"]
+
+
+def test_changes_during_build_reach_index(launcher, builder):
+    store = get_store(launcher.path("games"))
+    old = store.add({"name": "Старая игра"})
+    builder.start()
+    # Разница приходит раньше, чем готов индекс: она применяется к нему после установки
+    new = store.add({"name": "Новая игра"})
+    builder.apply_catalog_diff("games", CatalogDiff(None, added=[new]))
+    store.delete(old["id"])
+    builder.apply_catalog_diff("games", CatalogDiff(None, removed=[old]))
+    wait_ready(builder)
+
+    assert names(search_index.get_search_index().search("игра")) == ["Новая игра"]
+    assert names(prefix_index.get_prefix_index().complete("игр")) == ["Новая игра"]
+
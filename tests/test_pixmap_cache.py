@@ -0,0 +1,21 @@
+"""Ключи общего кэша иконок."""
+import os
+
+from utils.pixmap_cache import PixmapCache
+
+
+def test_key_changes_when_file_is_replaced(tmp_path):
+    path = tmp_path / "icon.png"
+    path.write_bytes(b"old")
+    before = PixmapCache.key(str(path), 64, 64, 1.0)
+    assert PixmapCache.key(str(path), 64, 64, 1.0) == before
+
+    path.write_bytes(b"new")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert PixmapCache.key(str(path), 64, 64, 1.0) != before
+
+
+def test_key_of_missing_file(tmp_path):
+    path = str(tmp_path / "missing.png")
+    assert PixmapCache.key(path, 32, 32, 2.0) == (os.path.abspath(path), None, 32, 32, 2.0)
@@ -1,10 +1,11 @@
-import os
-import webbrowser
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel,
                              QHBoxLayout, QMessageBox)
-from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import Qt, QSize
-from utils.json_utils import load_json, save_json
+from core.catalog_store import get_store
+from utils.launcher_tools import open_site
+from utils.icon_loader import get_icon_loader
+from utils.style_manager import set_role
+from ui.components.keyed_layout import KeyedLayout
 
 
 class BrowserMenu(QWidget):
@@ -13,6 +14,7 @@ class BrowserMenu(QWidget):
         self.switch_to = switch_to
         self.is_admin = is_admin  # Флаг администратора
         self.sites_file = "data/sites.json"  # Путь к JSON файлу с сайтами
+        self.site_items = None  # KeyedLayout строк с сайтами
         self.init_ui()
         self.setup_styles()
         self.load_sites()
@@ -48,96 +50,40 @@ class BrowserMenu(QWidget):
         self.setLayout(self.layout)
 
     def setup_styles(self):
-        """Устанавливает стили для всех элементов"""
-        self.setStyleSheet("""
-            QWidget {
-                background-color: rgba(40, 40, 40, 0.8);
-            }
-        """)
-
-        self.title.setStyleSheet("""
-            QLabel {
-                color: #ffffff;
-                font-size: 24px;
-                font-weight: bold;
-                padding: 10px;
-            }
-        """)
-
-        self.button_style = """
-            QPushButton {
-                background-color: rgba(70, 130, 180, 0.85);
-                color: white;
-                font-size: 16px;
-                padding: 12px;
-                border-radius: 6px;
-                border: 1px solid #4682B4;
-                text-align: left;
-                padding-left: 15px;
-            }
-            QPushButton:hover {
-                background-color: rgba(90, 150, 200, 0.9);
-            }
-        """
-
-        self.back_btn.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(180, 70, 70, 0.85);
-                color: white;
-                font-size: 16px;
-                padding: 12px;
-                border-radius: 6px;
-                border: 1px solid #B22222;
-                margin-top: 20px;
-            }
-            QPushButton:hover {
-                background-color: rgba(200, 90, 90, 0.9);
-            }
-        """)
-
+        """Назначает роли элементам для общей таблицы стилей (assets/styles.qss)"""
+        self.setObjectName("browserMenu")
+        set_role(self.title, "title")
+        set_role(self.back_btn, "back")
         if hasattr(self, 'add_btn'):
-            self.add_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: rgba(100, 180, 100, 0.85);
-                    color: white;
-                    font-size: 16px;
-                    padding: 12px;
-                    border-radius: 6px;
-                    border: 1px solid #64B464;
-                    margin-top: 10px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(120, 200, 120, 0.9);
-                }
-            """)
+            set_role(self.add_btn, "add")
 
     def load_sites(self):
-        """Загрузка сайтов из JSON файла"""
-        sites = load_json(self.sites_file) or []
+        """Загрузка сайтов из каталога (записям без id он выдаёт id, по которым сайты удаляются)"""
+        sites = get_store(self.sites_file).all()
 
-        # Очищаем текущий список
-        for i in reversed(range(self.sites_layout.count())):
-            item = self.sites_layout.itemAt(i)
-            if item.widget():
-                item.widget().deleteLater()
+        # Очищаем текущий список и добавляем сайты
+        if self.site_items is None:
+            self.site_items = KeyedLayout(self.sites_layout, self.add_site_button)
+        self.site_items.populate(sites)
 
-        # Добавляем сайты
         if not sites:
             self.show_info_message("Информация", "Список сайтов пуст!")
-        for site in sites:
-            self.add_site_button(site)
+
+    def apply_catalog_diff(self, name, diff):
+        """Точечное обновление списка сайтов после изменения каталога сайтов"""
+        if name == "sites" and self.site_items is not None:
+            self.site_items.apply_diff(diff)
 
     def add_site_button(self, site):
-        """Добавляет кнопку сайта в интерфейс"""
+        """Создаёт строку с кнопкой сайта (возвращает layout строки)"""
         btn_layout = QHBoxLayout()
 
         # Основная кнопка сайта
         site_btn = QPushButton(site.get("name", "Без имени"))
-        site_btn.setStyleSheet(self.button_style)
+        set_role(site_btn, "entry")
 
-        if site.get("icon_path") and os.path.exists(site["icon_path"]):
-            site_btn.setIcon(QIcon(site["icon_path"]))
-            site_btn.setIconSize(QSize(32, 32))
+        if site.get("icon_path"):
+            get_icon_loader().set_button_icon(site_btn, site["icon_path"], QSize(32, 32))
 
         site_btn.clicked.connect(lambda _, u=site.get("url", ""): self.open_site(u))
         btn_layout.addWidget(site_btn, stretch=1)
@@ -154,24 +100,19 @@ class BrowserMenu(QWidget):
             delete_btn.clicked.connect(lambda: self.delete_site(site))
             btn_layout.addWidget(delete_btn)
 
-        self.sites_layout.addLayout(btn_layout)
+        return btn_layout
 
     def open_site(self, url):
         """Открывает сайт в браузере по умолчанию"""
         if not url:
             self.show_error_message("Ошибка", "URL не указан!")
             return
-        try:
-            webbrowser.open(url)
-        except Exception as e:
-            self.show_error_message("Ошибка", f"Не удалось открыть сайт:\n{str(e)}")
+        open_site(url, self)
 
     def add_site_dialog(self):
         """Диалог добавления нового сайта"""
-        sites = load_json(self.sites_file) or []
-        new_site = {"id": len(sites) + 1, "name": "Новый сайт", "url": "", "icon_path": ""}
-        sites.append(new_site)
-        save_json(self.sites_file, sites)
+        # id выдаёт последовательность каталога: после удалений номера не повторяются
+        get_store(self.sites_file).add({"id": None, "name": "Новый сайт", "url": "", "icon_path": ""})
         self.load_sites()
 
     def edit_site(self, site):
@@ -182,14 +123,12 @@ class BrowserMenu(QWidget):
         """Удаление сайта"""
         reply = QMessageBox.question(
             self, 'Подтверждение',
-            f'Вы уверены, что хотите удалить сайт: {site.get('name', 'Без имени')}?',
+            f'Вы уверены, что хотите удалить сайт: {site.get("name", "Без имени")}?',
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            sites = load_json(self.sites_file) or []
-            sites = [s for s in sites if s["id"] != site["id"]]
-            save_json(self.sites_file, sites)
+            get_store(self.sites_file).delete(site.get("id"))
             self.load_sites()
 
     def show_error_message(self, title, message):
@@ -2,7 +2,9 @@ import os
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel,
                              QHBoxLayout, QMessageBox)
 from PyQt6.QtCore import Qt
-from utils.json_utils import load_json, save_json
+from core.catalog_store import get_store
+from utils.style_manager import set_role
+from ui.components.keyed_layout import KeyedLayout
 
 
 class ChatMenu(QWidget):
@@ -11,11 +13,13 @@ class ChatMenu(QWidget):
         self.switch_to = switch_to
         self.is_admin = is_admin  # Флаг администратора
         self.chats_file = "data/chats.json"  # Путь к JSON-файлу с чатами
+        self.chat_items = None  # KeyedLayout кнопок чатов
         self.init_ui()
         self.load_chats()
 
     def init_ui(self):
         """Инициализация пользовательского интерфейса"""
+        self.setObjectName("chatMenu")
         self.layout = QVBoxLayout()
         self.layout.setSpacing(15)
         self.layout.setContentsMargins(30, 30, 30, 30)
@@ -23,14 +27,7 @@ class ChatMenu(QWidget):
         # Заголовок
         self.title = QLabel("Чаты")
         self.title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.title.setStyleSheet("""
-            QLabel {
-                color: #ffffff;
-                font-size: 24px;
-                font-weight: bold;
-                padding: 10px;
-            }
-        """)
+        set_role(self.title, "title")
         self.layout.addWidget(self.title)
 
         # Контейнер для списка чатов
@@ -41,82 +38,43 @@ class ChatMenu(QWidget):
 
         # Кнопка "Назад"
         self.back_btn = QPushButton("Назад")
-        self.back_btn.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(180, 70, 70, 0.85);
-                color: white;
-                font-size: 16px;
-                padding: 12px;
-                border-radius: 6px;
-                border: 1px solid #B22222;
-                margin-top: 20px;
-            }
-            QPushButton:hover {
-                background-color: rgba(200, 90, 90, 0.9);
-            }
-        """)
+        set_role(self.back_btn, "back")
         self.back_btn.clicked.connect(lambda: self.switch_to("main"))
         self.layout.addWidget(self.back_btn)
 
         # Кнопка "Добавить чат" (только для админа)
         if self.is_admin:
             self.add_btn = QPushButton("Добавить чат")
-            self.add_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: rgba(100, 180, 100, 0.85);
-                    color: white;
-                    font-size: 16px;
-                    padding: 12px;
-                    border-radius: 6px;
-                    border: 1px solid #64B464;
-                    margin-top: 10px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(120, 200, 120, 0.9);
-                }
-            """)
+            set_role(self.add_btn, "add")
             self.add_btn.clicked.connect(self.add_chat_dialog)
             self.layout.addWidget(self.add_btn)
 
         self.setLayout(self.layout)
 
     def load_chats(self):
-        """Загрузка чатов из JSON-файла"""
-        chats = load_json(self.chats_file) or []
+        """Загрузка чатов из каталога"""
+        chats = get_store(self.chats_file).all()
 
-        # Очищаем текущий список чатов
-        for i in reversed(range(self.chats_layout.count())):
-            item = self.chats_layout.itemAt(i)
-            if item.widget():
-                item.widget().deleteLater()
+        # Очищаем текущий список чатов и добавляем чаты
+        if self.chat_items is None:
+            self.chat_items = KeyedLayout(self.chats_layout, self.add_chat_button)
+        self.chat_items.populate(chats)
 
-        # Добавляем чаты
         if not chats:
             self.show_info_message("Информация", "Список чатов пуст!")
-        for chat in chats:
-            self.add_chat_button(chat)
+
+    def apply_catalog_diff(self, name, diff):
+        """Точечное обновление списка чатов после изменения каталога чатов"""
+        if name == "chats" and self.chat_items is not None:
+            self.chat_items.apply_diff(diff)
 
     def add_chat_button(self, chat):
-        """Добавляет кнопку чата в интерфейс"""
+        """Создаёт кнопку чата"""
         chat_name = chat.get("name", "Без имени")
         chat_button = QPushButton(chat_name)
-        chat_button.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(70, 130, 180, 0.85);
-                color: white;
-                font-size: 16px;
-                padding: 12px;
-                border-radius: 6px;
-                border: 1px solid #4682B4;
-                text-align: left;
-                padding-left: 15px;
-            }
-            QPushButton:hover {
-                background-color: rgba(90, 150, 200, 0.9);
-            }
-        """)
+        set_role(chat_button, "entry")
         chat_button.clicked.connect(lambda: self.open_chat(chat))
-        self.chats_layout.addWidget(chat_button)
+        return chat_button
 
     def open_chat(self, chat):
         """Открывает чат (заглушка)"""
@@ -124,10 +82,8 @@ class ChatMenu(QWidget):
 
     def add_chat_dialog(self):
         """Диалог добавления нового чата"""
-        chats = load_json(self.chats_file) or []
-        new_chat = {"id": len(chats) + 1, "name": "Новый чат"}
-        chats.append(new_chat)
-        save_json(self.chats_file, chats)
+        # id выдаёт последовательность каталога: после удалений номера не повторяются
+        get_store(self.chats_file).add({"id": None, "name": "Новый чат"})
         self.load_chats()
 
     def show_info_message(self, title, message):
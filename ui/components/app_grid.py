@@ -0,0 +1,237 @@
+from PyQt6 import sip
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRectF, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPainter
+from PyQt6.QtWidgets import QListView, QStyle, QStyledItemDelegate, QAbstractItemView
+
+from core.catalog_diff import diff_records, record_key
+from core.launch_service import get_launch_service
+from utils.icon_loader import get_icon_loader
+
+DEFAULT_BG_COLOR = "#4682B4"
+HOVER_BG_COLOR = "#5A9BD5"
+RUNNING_COLOR = "#3CC864"
+ICON_SIZE = 32
+
+RecordRole = Qt.ItemDataRole.UserRole + 1
+BgColorRole = Qt.ItemDataRole.UserRole + 2
+IsSquareRole = Qt.ItemDataRole.UserRole + 3
+PathRole = Qt.ItemDataRole.UserRole + 4
+RunningRole = Qt.ItemDataRole.UserRole + 5
+
+
+class AppListModel(QAbstractListModel):
+    """Модель плиток приложений (или игр) поверх списка записей каталога.
+
+    Хранит только записи; иконки загружаются в фоне при первом запросе
+    отрисовки, т.е. лишь для видимых плиток, до загрузки видна заглушка.
+    Сами изображения живут в общем pixmap_cache, а не в модели.
+    """
+
+    def __init__(self, records=(), key=record_key, default_bg_color=DEFAULT_BG_COLOR, parent=None):
+        super().__init__(parent)
+        self.key = key
+        self.default_bg_color = default_bg_color
+        self._records = list(records)
+        self._loading = set()  # пути иконок, которые сейчас загружаются
+        self._missing = set()  # пути, по которым иконку загрузить не удалось
+        get_launch_service().running_changed.connect(self._running_changed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._records):
+            return None
+        record = self._records[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return record.get("name", "Без имени")
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.icon(record.get("icon_path"))
+        if role == RecordRole:
+            return record
+        if role == BgColorRole:
+            return record.get("bg_color") or self.default_bg_color
+        if role == IsSquareRole:
+            return bool(record.get("is_square", False))
+        if role == PathRole:
+            return record.get("path", "")
+        if role == RunningRole:
+            path = record.get("path")
+            return bool(path) and get_launch_service().is_running(path)
+        return None
+
+    def icon(self, path):
+        """QPixmap иконки, заглушка до её загрузки или None"""
+        if not path or path in self._missing:
+            return None
+        loader = get_icon_loader()
+        size = QSize(ICON_SIZE, ICON_SIZE)
+        pixmap = loader.cached(path, size)
+        if pixmap is not None:
+            return pixmap
+        if path not in self._loading:
+            self._loading.add(path)
+            loader.load(path, size, lambda pixmap, p=path: self._icon_loaded(p, pixmap))
+        return loader.placeholder(size)
+
+    def _icon_loaded(self, path, pixmap):
+        if sip.isdeleted(self):
+            return
+        self._loading.discard(path)
+        if pixmap is None:
+            self._missing.add(path)
+        if self._records:
+            # Перерисуются только видимые плитки
+            self.dataChanged.emit(self.index(0), self.index(len(self._records) - 1),
+                                  [Qt.ItemDataRole.DecorationRole])
+
+    def _running_changed(self, key, running):
+        if sip.isdeleted(self) or not self._records:
+            return
+        self.dataChanged.emit(self.index(0), self.index(len(self._records) - 1), [RunningRole])
+
+    def record(self, row):
+        return self._records[row]
+
+    def records(self):
+        return list(self._records)
+
+    def set_records(self, records):
+        """Заменить все записи"""
+        self.beginResetModel()
+        self._records = list(records)
+        self._missing.clear()
+        self.endResetModel()
+
+    def reconcile(self, records, updated=()):
+        """Привести модель к списку records построчными изменениями.
+
+        updated — записи, изменённые на месте: сравнение с прежними их не заметит.
+        """
+        diff = diff_records(self._records, records, self.key)
+        diff.updated.extend(updated)
+        if not diff.is_empty():
+            self.apply_diff(diff)
+
+    def apply_diff(self, diff, accept=None):
+        """Применить CatalogDiff строками модели; accept(record) отбирает отображаемые записи"""
+        accept = accept or (lambda record: True)
+        target = [r for r in diff.records if accept(r)]
+        if diff.reordered:
+            self.set_records(target)
+            return
+
+        target_keys = {self.key(r) for r in target}
+        # Каталог в памяти меняет записи на месте: изменённая запись может быть тем же объектом
+        updated = {self.key(r) for r in diff.updated}
+        for row in reversed(range(len(self._records))):
+            if self.key(self._records[row]) not in target_keys:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._records[row]
+                self.endRemoveRows()
+
+        # Порядок общих записей не изменился, поэтому текущие строки — подпоследовательность target
+        for row, record in enumerate(target):
+            if row < len(self._records) and self.key(self._records[row]) == self.key(record):
+                if self._records[row] != record or self.key(record) in updated:
+                    self._missing.discard(record.get("icon_path"))
+                    self._records[row] = record
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+            else:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._records.insert(row, record)
+                self.endInsertRows()
+
+
+class AppTileDelegate(QStyledItemDelegate):
+    """Отрисовка плитки: цветной фон (bg_color), форма по is_square, иконка и подпись"""
+
+    TILE_WIDTH = 160
+    TILE_HEIGHT = 100
+    PILL_HEIGHT = 64
+    ICON_SIZE = ICON_SIZE
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QFont()
+        self.font.setPixelSize(14)
+
+    def sizeHint(self, option, index):
+        return QSize(self.TILE_WIDTH, self.TILE_HEIGHT)
+
+    def tile_rect(self, rect, is_square):
+        """Прямоугольник плитки внутри ячейки сетки"""
+        if is_square:
+            side = min(rect.width(), rect.height())
+            return QRectF(rect.x() + (rect.width() - side) / 2, rect.y() + (rect.height() - side) / 2, side, side)
+        height = min(self.PILL_HEIGHT, rect.height())
+        return QRectF(rect.x(), rect.y() + (rect.height() - height) / 2, rect.width(), height)
+
+    def paint(self, painter, option, index):
+        is_square = index.data(IsSquareRole)
+        rect = self.tile_rect(option.rect.adjusted(4, 4, -4, -4), is_square)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        radius = 10 if is_square else min(32, rect.height() / 2)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(HOVER_BG_COLOR if hovered else index.data(BgColorRole)))
+        painter.drawRoundedRect(rect, radius, radius)
+
+        if index.data(RunningRole):
+            # Метка запущенного приложения в правом верхнем углу
+            painter.setBrush(QColor(RUNNING_COLOR))
+            dot = 8
+            inset = radius / 3 + 4
+            painter.drawEllipse(QRectF(rect.right() - inset - dot, rect.y() + inset, dot, dot))
+
+        text_rect = rect.adjusted(8, 4, -8, -4)
+        icon = index.data(Qt.ItemDataRole.DecorationRole)  # QPixmap
+        if icon is not None:
+            if is_square:
+                icon_rect = QRectF(rect.center().x() - self.ICON_SIZE / 2, rect.y() + 10, self.ICON_SIZE, self.ICON_SIZE)
+                text_rect.setTop(icon_rect.bottom() + 4)
+            else:
+                icon_rect = QRectF(rect.x() + radius / 2, rect.center().y() - self.ICON_SIZE / 2, self.ICON_SIZE, self.ICON_SIZE)
+                text_rect.setLeft(icon_rect.right() + 6)
+            painter.drawPixmap(icon_rect.toRect(), icon)
+
+        painter.setFont(self.font)
+        painter.setPen(QColor("white"))
+        name = painter.fontMetrics().elidedText(index.data(), Qt.TextElideMode.ElideRight, int(text_rect.width()) * 2)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap, name)
+        painter.restore()
+
+
+class AppGridView(QListView):
+    """Виртуализированная сетка плиток: отрисовываются только видимые элементы.
+
+    Все ячейки одного размера (uniformItemSizes), поэтому прокрутка не
+    зависит от числа записей. Нажатие на плитку испускает app_activated(record).
+    """
+
+    app_activated = pyqtSignal(dict)
+
+    def __init__(self, model=None, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setWrapping(True)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(500)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setFrameShape(QListView.Shape.NoFrame)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+
+        self.delegate = AppTileDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.setGridSize(QSize(AppTileDelegate.TILE_WIDTH + 10, AppTileDelegate.TILE_HEIGHT + 10))
+        self.setModel(model or AppListModel(parent=self))
+        self.clicked.connect(lambda index: self.app_activated.emit(index.data(RecordRole)))
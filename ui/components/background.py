@@ -0,0 +1,68 @@
+import logging
+import math
+from collections import OrderedDict
+
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QImageReader, QPixmap
+
+
+class BackgroundRenderer:
+    """Масштабирование фонового изображения под размер окна.
+
+    Исходник декодируется один раз, и каждый вариант строится из него, а
+    не из предыдущей уменьшенной копии. Размер окна округляется вверх до
+    корзины bucket пикселей; сглаженные варианты кэшируются по корзине,
+    быстрые (FastTransformation, для времени перетаскивания) не хранятся.
+    """
+
+    def __init__(self, path, bucket=64, max_variants=4):
+        self.path = path
+        self.bucket = bucket
+        self.max_variants = max_variants
+        self._original = None
+        self._variants = OrderedDict()  # (ширина, высота) корзины -> QPixmap
+
+    def load(self):
+        """Декодировать исходное изображение; False, если это не удалось"""
+        reader = QImageReader(self.path)
+        reader.setAutoTransform(True)
+        image = reader.read()
+        if image.isNull():
+            logging.warning(f"Не удалось загрузить фоновое изображение: {self.path} ({reader.errorString()})")
+            return False
+        self._original = QPixmap.fromImage(image)
+        self._variants.clear()
+        return True
+
+    def is_loaded(self):
+        return self._original is not None
+
+    def bucket_size(self, size):
+        width = max(self.bucket, math.ceil(size.width() / self.bucket) * self.bucket)
+        height = max(self.bucket, math.ceil(size.height() / self.bucket) * self.bucket)
+        return QSize(width, height)
+
+    def has_smooth(self, size):
+        target = self.bucket_size(size)
+        return (target.width(), target.height()) in self._variants
+
+    def pixmap(self, size, smooth=True):
+        """Фон, покрывающий size; smooth=False — быстрое масштабирование без кэша"""
+        if self._original is None:
+            return None
+        target = self.bucket_size(size)
+        if not smooth:
+            return self._original.scaled(target, Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                                         Qt.TransformationMode.FastTransformation)
+
+        key = (target.width(), target.height())
+        pixmap = self._variants.get(key)
+        if pixmap is None:
+            pixmap = self._original.scaled(target, Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                                           Qt.TransformationMode.SmoothTransformation)
+            self._variants[key] = pixmap
+            while len(self._variants) > self.max_variants:
+                self._variants.popitem(last=False)
+        else:
+            self._variants.move_to_end(key)
+        return pixmap
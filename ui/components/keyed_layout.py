@@ -0,0 +1,154 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QLayout, QListWidgetItem
+
+from core.catalog_diff import record_key
+
+
+def dispose(item):
+    """Удалить элемент layout: виджет или вложенный layout со всем содержимым"""
+    widget = item.widget()
+    if widget is not None:
+        widget.deleteLater()
+        return
+    layout = item.layout()
+    if layout is not None:
+        while layout.count():
+            dispose(layout.takeAt(0))
+        layout.deleteLater()
+
+
+class KeyedLayout:
+    """Элементы layout, привязанные к ключам записей каталога.
+
+    reconcile() сравнивает новый список записей с уже созданными
+    элементами по ключу и только вставляет, удаляет, переставляет или
+    пересоздаёт изменившиеся, вместо очистки и полной перестройки layout.
+    factory(record) возвращает QWidget или QLayout; offset — число
+    неключевых элементов в начале layout.
+    """
+
+    def __init__(self, layout, factory, key=record_key, offset=0):
+        self.layout = layout
+        self.factory = factory
+        self.key = key
+        self.offset = offset
+        self._keys = []  # ключи в порядке следования в layout
+        self._items = {}  # ключ -> QWidget или QLayout
+        self._records = {}  # ключ -> копия записи, по которой построен элемент
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._keys)
+
+    def item(self, key):
+        return self._items.get(key)
+
+    def clear(self):
+        """Удалить все ключевые элементы"""
+        for key in list(self._keys):
+            self.remove(key)
+
+    def populate(self, records):
+        """Заполнить layout записями (существующие элементы переиспользуются)"""
+        self.reconcile(records)
+
+    def reconcile(self, records):
+        """Привести layout к списку records с минимумом изменений"""
+        unique = {}
+        for record in records:
+            unique.setdefault(self.key(record), record)
+        records = list(unique.values())
+
+        for key in [k for k in self._keys if k not in unique]:
+            self.remove(key)
+
+        # Элементы до position уже на своих местах, поэтому текущая позиция ключа не меньше position
+        for position, record in enumerate(records):
+            key = self.key(record)
+            if key not in self._items:
+                self.insert(position, record)
+                continue
+            current = self._keys.index(key, position)
+            if current != position:
+                self.move(current, position)
+            if self._records[key] != record:
+                self.replace(record)
+
+    def insert(self, position, record):
+        key = self.key(record)
+        if key in self._items:
+            self.remove(key)
+        item = self.factory(record)
+        if isinstance(item, QLayout):
+            self.layout.insertLayout(self.offset + position, item)
+        else:
+            self.layout.insertWidget(self.offset + position, item)
+        self._keys.insert(position, key)
+        self._items[key] = item
+        self._records[key] = dict(record)
+        return item
+
+    def move(self, source, target):
+        """Переставить элемент без пересоздания"""
+        item = self.layout.takeAt(self.offset + source)
+        self.layout.insertItem(self.offset + target, item)
+        self._keys.insert(target, self._keys.pop(source))
+
+    def remove(self, key):
+        if key not in self._items:
+            return False
+        position = self._keys.index(key)
+        dispose(self.layout.takeAt(self.offset + position))
+        del self._keys[position]
+        del self._items[key]
+        del self._records[key]
+        return True
+
+    def replace(self, record):
+        """Пересоздать элемент записи на прежнем месте"""
+        key = self.key(record)
+        if key not in self._items:
+            return None
+        position = self._keys.index(key)
+        self.remove(key)
+        return self.insert(position, record)
+
+    def apply_diff(self, diff, accept=None):
+        """Применить CatalogDiff; accept(record) отбирает записи, которые должны отображаться"""
+        accept = accept or (lambda record: True)
+        self.reconcile([r for r in diff.records if accept(r)])
+
+
+def reconcile_list_widget(list_widget, records, text, key=record_key):
+    """Привести QListWidget к списку records по ключу (ключ хранится в UserRole).
+
+    Строки переиспользуются: удаляются лишние, добавляются новые,
+    переставляются сдвинутые и обновляется текст изменённых.
+    """
+    unique = {}
+    for record in records:
+        unique.setdefault(key(record), record)
+
+    for row in reversed(range(list_widget.count())):
+        if list_widget.item(row).data(Qt.ItemDataRole.UserRole) not in unique:
+            list_widget.takeItem(row)
+
+    existing = {list_widget.item(row).data(Qt.ItemDataRole.UserRole): list_widget.item(row)
+                for row in range(list_widget.count())}
+    for position, (record_id, record) in enumerate(unique.items()):
+        item = existing.get(record_id)
+        if item is None:
+            item = QListWidgetItem(text(record))
+            item.setData(Qt.ItemDataRole.UserRole, record_id)
+            list_widget.insertItem(position, item)
+            continue
+        row = list_widget.row(item)
+        if row != position:
+            current = list_widget.currentItem() is item
+            list_widget.insertItem(position, list_widget.takeItem(row))
+            if current:
+                list_widget.setCurrentItem(item)
+        if item.text() != text(record):
+            item.setText(text(record))
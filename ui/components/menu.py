@@ -1,10 +1,12 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton,
-                             QHBoxLayout, QMessageBox)
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QIcon
-import sqlite3
+                             QMessageBox, QSizePolicy, QSpacerItem)
+from PyQt6.QtCore import Qt
 import os
-import webbrowser
+from utils.json_utils import load_json
+from ui.components.app_grid import AppGridView, AppListModel
+from ui.components.keyed_layout import dispose
+from utils.launcher_tools import safe_launch
+from utils.style_manager import set_role
 
 
 class MainMenu(QWidget):
@@ -41,7 +43,7 @@ class MainMenu(QWidget):
         for category in categories:
             # Добавляем заголовок категории
             category_label = QLabel(category.get("name", "Без имени"))
-            category_label.setStyleSheet("font-size: 20px; color: white; margin-top: 20px;")
+            set_role(category_label, "section")
             self.layout.addWidget(category_label)
 
             # Фильтруем приложения по категории
@@ -49,22 +51,15 @@ class MainMenu(QWidget):
 
             if not category_apps:
                 empty_label = QLabel("(Нет приложений в категории)")
-                empty_label.setStyleSheet("font-size: 14px; color: gray;")
+                set_role(empty_label, "empty")
                 self.layout.addWidget(empty_label)
                 continue
 
-            # Создаем контейнер для приложений
-            apps_container = QWidget()
-            apps_layout = QHBoxLayout()
-            apps_layout.setSpacing(10)
-            apps_layout.setContentsMargins(0, 10, 0, 10)  # Отступы для кнопок
-            apps_container.setLayout(apps_layout)
-
-            for app in category_apps:
-                app_btn = self.create_app_button(app)
-                apps_layout.addWidget(app_btn)
-
-            self.layout.addWidget(apps_container)
+            # Сетка плиток приложений: отрисовываются только видимые
+            apps_grid = AppGridView(AppListModel(category_apps))
+            apps_grid.setContentsMargins(0, 10, 0, 10)
+            apps_grid.app_activated.connect(lambda app: self.launch_app(app.get("path", "")))
+            self.layout.addWidget(apps_grid)
 
             # Добавляем разделитель между категориями
             spacer = QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
@@ -72,71 +67,21 @@ class MainMenu(QWidget):
 
         # Кнопка для входа в админ-панель
         admin_btn = QPushButton("Админ-панель")
-        admin_btn.setStyleSheet("""
-            QPushButton {
-                font-size: 16px;
-                background-color: #4CAF50;
-                color: white;
-                padding: 10px;
-                border-radius: 5px;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: #45A049;
-            }
-        """)
+        admin_btn.setObjectName("adminPanelButton")
         admin_btn.clicked.connect(self.admin_auth_callback)
         self.layout.addWidget(admin_btn, alignment=Qt.AlignmentFlag.AlignCenter)
 
-    def create_app_button(self, app):
-        """
-        Создает кнопку для приложения.
-        :param app: Словарь с данными приложения (name, path, icon_path, bg_color, is_square).
-        :return: QPushButton
-        """
-        app_name = app.get("name", "Без имени")
-        app_path = app.get("path", "")
-        bg_color = app.get("bg_color", "#4682B4")
-        is_square = app.get("is_square", False)
-
-        app_btn = QPushButton(app_name)
-        app_btn.setToolTip(app_name)
-
-        # Изменяем размер кнопки для адаптации
-        if is_square:
-            app_btn.setMinimumSize(80, 80)  # Минимальный размер кнопки
-            app_btn.setMaximumSize(150, 150)  # Максимальный размер кнопки
-        else:
-            app_btn.setMinimumHeight(64)  # Минимальная высота для не квадратных кнопок
-
-        app_btn.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-
-        app_btn.setStyleSheet(f"""
-            QPushButton {{
-                font-size: 16px;
-                background-color: {bg_color};
-                color: white;
-                padding: 10px;
-                border-radius: {'10px' if is_square else '32px'};
-                border: none;
-            }}
-            QPushButton:hover {{
-                background-color: #5A9BD5;
-            }}
-        """)
-
-        app_btn.clicked.connect(lambda _, p=app_path: self.launch_app(p))
-        return app_btn
-
     def launch_app(self, path):
         """Запуск приложения"""
-        try:
-            if os.path.exists(path):
-                os.startfile(path)
-            else:
-                QMessageBox.critical(self, "Ошибка", f"Приложение не найдено по пути: {path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Не удалось запустить приложение:\n{e}")
+        if os.path.exists(path):
+            safe_launch(path, self)
+        else:
+            QMessageBox.critical(self, "Ошибка", f"Приложение не найдено по пути: {path}")
+
+    def clear_layout(self, layout):
+        """Очищает layout от всех элементов."""
+        while layout.count():
+            dispose(layout.takeAt(0))
 
     def show_message(self, message):
         """Отображение сообщения"""
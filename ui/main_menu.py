@@ -1,11 +1,114 @@
-from PyQt6.QtGui import QIcon, QPixmap
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QMessageBox, QSizePolicy
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox, QStackedWidget,
+                             QCompleter)
+from PyQt6.QtCore import Qt, QSize, QStringListModel
 import os
-from utils.json_utils import load_json
+from core import prefix_index, search_index
+from core.index_builder import get_index_builder
+from core.app_manager import get_all_apps, get_apps_by_category
+from core.catalog_diff import record_key
+from core.category_manager import get_all_categories
+from core.favorites import get_favorites
+from core.usage_stats import APP, GAME, usage_key
+from ui.components.app_grid import AppGridView, AppListModel, AppTileDelegate
+from ui.components.keyed_layout import KeyedLayout
+from utils.icon_loader import get_icon_loader
+from utils.launcher_tools import open_site, safe_launch
+from utils.style_manager import set_role
+
+
+class CategoryPage(QWidget):
+    """Экран приложений одной категории; создаётся один раз и переиспользуется."""
+
+    def __init__(self, category, launch_callback, back_callback):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Заголовок категории
+        self.title = QLabel()
+        set_role(self.title, "heading")
+        layout.addWidget(self.title)
+
+        # Сетка плиток приложений: отрисовываются только видимые
+        self.model = AppListModel()
+        self.grid = AppGridView(self.model)
+        self.grid.app_activated.connect(lambda app: launch_callback(app.get("path", "")))
+        layout.addWidget(self.grid, stretch=1)
+
+        self.empty_label = QLabel("(Нет приложений в категории)")
+        set_role(self.empty_label, "empty")
+        layout.addWidget(self.empty_label)
+
+        # Кнопка "Назад"
+        back_button = QPushButton("Назад")
+        set_role(back_button, "primary")
+        back_button.clicked.connect(back_callback)
+        layout.addWidget(back_button)
+
+        self.category = None
+        self.set_category(category)
+        self.update_empty()
+
+    def set_category(self, category):
+        self.category = category
+        self.title.setText(f"Категория: {category.get('name', 'Без имени')}")
+
+    def set_apps(self, apps):
+        """Обновить плитки по новому списку приложений (только изменившиеся строки)"""
+        self.model.reconcile(apps)
+        self.update_empty()
+
+    def apply_apps_diff(self, diff):
+        category_id = self.category.get("id")
+        self.model.apply_diff(diff, accept=lambda app: app.get("category_id") == category_id)
+        self.update_empty()
+
+    def update_empty(self):
+        has_apps = self.model.rowCount() > 0
+        self.grid.setVisible(has_apps)
+        self.empty_label.setVisible(not has_apps)
+
+
+class SearchPage(QWidget):
+    """Результаты поиска по всем каталогам"""
+
+    def __init__(self, open_callback):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Плитки строятся по копиям записей с полем catalog; id записей разных каталогов совпадают
+        self.model = AppListModel(key=lambda tile: (tile["catalog"], record_key(tile)))
+        self.grid = AppGridView(self.model)
+        self.grid.app_activated.connect(lambda tile: open_callback(tile["catalog"], tile))
+        layout.addWidget(self.grid, stretch=1)
+
+        self.empty_label = QLabel("Ничего не найдено")
+        set_role(self.empty_label, "empty")
+        layout.addWidget(self.empty_label)
+
+    def set_results(self, results):
+        """results — [(каталог, запись)] в порядке релевантности"""
+        self.model.reconcile([dict(record, catalog=catalog) for catalog, record in results])
+        self.empty_label.setText("Ничего не найдено")
+        has_results = self.model.rowCount() > 0
+        self.grid.setVisible(has_results)
+        self.empty_label.setVisible(not has_results)
+
+    def show_indexing(self):
+        """Индекс поиска ещё строится в фоне"""
+        self.empty_label.setText("Индексация…")
+        self.grid.setVisible(False)
+        self.empty_label.setVisible(True)
 
 
 class MainMenu(QWidget):
+    FAVORITES_COUNT = 6  # плиток в домашнем ряду
+    SEARCH_LIMIT = 40  # результатов поиска на экране
+    COMPLETION_LIMIT = 8  # подсказок автодополнения под строкой поиска
+
     def __init__(self, switch_callback, admin_auth_callback):
         """
         Конструктор для главного меню.
@@ -15,150 +118,235 @@ class MainMenu(QWidget):
         super().__init__()
         self.switch_callback = switch_callback
         self.admin_auth_callback = admin_auth_callback
+        self.setObjectName("mainMenu")
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
         self.current_category = None  # Для отслеживания текущей категории
+        self.category_pages = {}  # id категории -> CategoryPage (экраны не уничтожаются при возврате)
+        self.apps_by_path = None  # usage_key пути -> приложение; None — перестроить
+        self.page_before_search = None  # страница, на которую вернуться после очистки поиска
+        self.completions = {}  # название подсказки -> (каталог, запись)
         self.init_ui()
 
     def init_ui(self):
         """Инициализация интерфейса."""
         self.layout.setSpacing(15)
         self.layout.setContentsMargins(20, 20, 20, 20)
+
+        # Поиск по приложениям, играм, сайтам и чатам
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Поиск приложений, игр, сайтов и чатов")
+        self.search_edit.setClearButtonEnabled(True)
+        set_role(self.search_edit, "search")
+        self.search_edit.textChanged.connect(self.on_search_changed)
+        get_index_builder().ready.connect(self.on_indexes_ready)
+        self.layout.addWidget(self.search_edit)
+
+        # Автодополнение названий приложений и игр: подсказки даёт префиксный индекс,
+        # поэтому сам QCompleter ничего не фильтрует
+        self.completion_model = QStringListModel(self)
+        self.completer = QCompleter(self.completion_model, self)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.completer.activated[str].connect(self.on_completion_activated)
+        self.search_edit.setCompleter(self.completer)
+
+        self.pages = QStackedWidget()
+        self.layout.addWidget(self.pages)
+
+        self.search_page = SearchPage(self.open_search_result)
+        self.pages.addWidget(self.search_page)
+
+        # Страница со списком категорий
+        self.categories_page = QWidget()
+        self.categories_layout = QVBoxLayout(self.categories_page)
+        self.categories_layout.setSpacing(15)
+        self.categories_layout.setContentsMargins(0, 0, 0, 0)
+        self.pages.addWidget(self.categories_page)
+
+        # Домашний ряд: самые используемые приложения, одна строка с прокруткой
+        self.favorites_label = QLabel("Часто используемые")
+        set_role(self.favorites_label, "heading")
+        self.categories_layout.addWidget(self.favorites_label)
+        self.favorites_model = AppListModel()
+        self.favorites_grid = AppGridView(self.favorites_model)
+        self.favorites_grid.setWrapping(False)
+        self.favorites_grid.setFixedHeight(AppTileDelegate.TILE_HEIGHT + 30)
+        self.favorites_grid.app_activated.connect(lambda app: self.launch_app(app.get("path", "")))
+        self.categories_layout.addWidget(self.favorites_grid)
+        get_favorites().listeners.append(self.update_favorites)
+
+        self.category_items = KeyedLayout(self.categories_layout, self.create_category_button, offset=2)
+
         self.show_categories()
 
     def show_categories(self):
         """Отображение списка категорий."""
-        self.clear_layout(self.layout)
+        self.current_category = None
+        self.pages.setCurrentWidget(self.categories_page)
 
         try:
-            categories = load_json("data/categories.json") or []
+            categories = get_all_categories()
         except Exception as e:
             self.show_message(f"Ошибка загрузки данных категорий: {str(e)}")
             return
 
+        self.update_favorites()
+
+        # Кнопки категорий сверяются по id: меняются только изменившиеся
+        self.category_items.reconcile(categories)
+        self.sync_category_pages(categories)
+
         if not categories:
             self.show_message("Категории не найдены в JSON-файле.")
+
+    def update_favorites(self, updated=()):
+        """Обновить домашний ряд по рейтингу запусков (рейтинг поддерживается кучей, без сортировки каталога)"""
+        if self.apps_by_path is None:
+            self.apps_by_path = {usage_key(APP, app["path"]): app for app in get_all_apps() if app.get("path")}
+
+        # Ключи удалённых из каталога приложений пропускаются, поэтому при нехватке берём больше
+        favorites = get_favorites()
+        count = self.FAVORITES_COUNT
+        while True:
+            keys = favorites.top_keys(count)
+            apps = [self.apps_by_path[key] for key in keys if key in self.apps_by_path]
+            if len(apps) >= self.FAVORITES_COUNT or len(keys) < count:
+                break
+            count *= 2
+
+        self.favorites_model.reconcile(apps[:self.FAVORITES_COUNT], updated)
+        has_favorites = self.favorites_model.rowCount() > 0
+        self.favorites_label.setVisible(has_favorites)
+        self.favorites_grid.setVisible(has_favorites)
+
+    def on_search_changed(self, text):
+        """Поиск на каждое нажатие клавиши; пустой запрос возвращает на прежнюю страницу"""
+        self.update_completions(text)
+        if not text.strip():
+            if self.pages.currentWidget() is self.search_page:
+                page = self.page_before_search
+                if page is None or self.pages.indexOf(page) == -1:
+                    page = self.categories_page
+                self.pages.setCurrentWidget(page)
             return
 
-        # Заголовок
+        if self.pages.currentWidget() is not self.search_page:
+            self.page_before_search = self.pages.currentWidget()
+            self.pages.setCurrentWidget(self.search_page)
+        builder = get_index_builder()
+        if not builder.is_ready():
+            # Результаты покажет on_indexes_ready
+            builder.start()
+            self.search_page.show_indexing()
+            return
+        self.search_page.set_results(search_index.get_search_index().search(text, self.SEARCH_LIMIT))
 
+    def on_indexes_ready(self):
+        """Показать результаты и подсказки для запроса, набранного, пока индексы строились"""
+        if self.search_edit.text().strip():
+            self.on_search_changed(self.search_edit.text())
 
-        # Создание кнопок категорий
-        for category in categories:
-            category_button = QPushButton(category.get("name", "Без имени"))
+    def update_completions(self, text):
+        """Подсказки по началу слов; следующее нажатие сужает закэшированный результат предыдущего"""
+        matches = []
+        # Пока индекс строится в фоне, подсказок нет: их даст повтор запроса в on_indexes_ready
+        if text.strip() and get_index_builder().is_ready():
+            matches = prefix_index.get_prefix_index().complete(text, self.COMPLETION_LIMIT)
+        self.completions = {record.get("name", ""): (catalog, record) for catalog, record in matches}
+        self.completion_model.setStringList(list(self.completions))
 
-            # Загрузка изображения для кнопки
-            icon = QIcon(QPixmap("path_to_image.png"))  # Укажите путь к изображению
-            category_button.setIcon(icon)
-            category_button.setIconSize(QSize(32, 32))  # Размер иконки
+    def on_completion_activated(self, name):
+        """Выбранная подсказка сразу открывает свою запись"""
+        match = self.completions.get(name)
+        if match is not None:
+            self.open_search_result(*match)
 
-            # Уменьшение текстового отступа, если нужно
-            category_button.setStyleSheet("""
-                QPushButton {
-                    font-size: 16px;
-                    padding: 5px 10px;  /* Уменьшаем padding, если есть иконка */
-                    border-radius: 5px;
-                    border: none;
-                    margin-bottom: 10px;
-                    background-color: transparent;  # Прозрачный фон
-                }
-                QPushButton:hover {
-                    background-color: rgba(0, 0, 0, 0.1);  # Лёгкий эффект при наведении
-                }
-            """)
+    def open_search_result(self, catalog, record):
+        """Открыть найденную запись так же, как с её собственного экрана"""
+        if catalog == "apps":
+            self.launch_app(record.get("path", ""))
+        elif catalog == "games":
+            path = record.get("path", "")
+            if path and os.path.exists(path):
+                safe_launch(path, self, kind=GAME)
+            else:
+                self.show_message(f"Файл игры не найден: {path}")
+        elif catalog == "sites":
+            if record.get("url"):
+                open_site(record["url"], self)
+            else:
+                self.show_message("URL не указан!")
+        elif catalog == "chats":
+            self.switch_callback("chat")
 
-            category_button.clicked.connect(lambda _, c=category: self.show_apps(c))
-            self.layout.addWidget(category_button)
+    def create_category_button(self, category):
+        """Создает кнопку категории."""
+        category_button = QPushButton(category.get("name", "Без имени"))
 
-    def show_apps(self, category):
-        """Отображение приложений из выбранной категории."""
-        self.clear_layout(self.layout)
+        # Иконка категории загружается в фоне
+        if category.get("icon_path"):
+            get_icon_loader().set_button_icon(category_button, category["icon_path"], QSize(32, 32))
 
-        # Заголовок категории
-        category_label = QLabel(f"Категория: {category.get('name', 'Без имени')}")
-        category_label.setStyleSheet("font-size: 20px; color: white;")
-        self.layout.addWidget(category_label)
+        set_role(category_button, "category")
+
+        category_button.clicked.connect(lambda _, c=category: self.show_apps(c))
+        return category_button
 
+    def show_apps(self, category):
+        """Отображение приложений из выбранной категории."""
         try:
-            apps = load_json("data/apps.json") or []
+            category_apps = get_apps_by_category(category.get("id"))
         except Exception as e:
             self.show_message(f"Ошибка загрузки данных приложений: {str(e)}")
             return
 
-        # Фильтруем приложения по категории
-        category_apps = [app for app in apps if app.get("category_id") == category.get("id")]
-
-        if not category_apps:
-            empty_label = QLabel("(Нет приложений в категории)")
-            empty_label.setStyleSheet("font-size: 14px; color: gray;")
-            self.layout.addWidget(empty_label)
+        page = self.category_pages.get(category.get("id"))
+        if page is None:
+            page = CategoryPage(category, self.launch_app, self.show_categories)
+            self.pages.addWidget(page)
+            self.category_pages[category.get("id")] = page
         else:
-            # Создаём кнопки для приложений
-            apps_container = QWidget()
-            apps_layout = QHBoxLayout()
-            apps_layout.setSpacing(10)
-            apps_container.setLayout(apps_layout)
+            page.set_category(category)
+        page.set_apps(category_apps)
 
-            for app in category_apps:
-                app_btn = self.create_app_button(app)
-                apps_layout.addWidget(app_btn)
+        self.current_category = category
+        self.pages.setCurrentWidget(page)
 
-            self.layout.addWidget(apps_container)
+    def sync_category_pages(self, categories):
+        """Обновить заголовки сохранённых экранов категорий и удалить экраны исчезнувших"""
+        by_id = {category.get("id"): category for category in categories}
+        for category_id in list(self.category_pages):
+            if category_id in by_id:
+                self.category_pages[category_id].set_category(by_id[category_id])
+                continue
+            page = self.category_pages.pop(category_id)
+            if self.pages.currentWidget() is page:
+                self.current_category = None
+                self.pages.setCurrentWidget(self.categories_page)
+            self.pages.removeWidget(page)
+            page.deleteLater()
 
-        # Кнопка "Назад"
-        back_button = QPushButton("Назад")
-        back_button.setStyleSheet("""
-            QPushButton {
-                font-size: 16px;
-                background-color: #4CAF50;
-                color: white;
-                padding: 10px;
-                border-radius: 5px;
-                border: none;
-                margin-top: 20px;
-            }
-            QPushButton:hover {
-                background-color: #45A049;
-            }
-        """)
-        back_button.clicked.connect(self.show_categories)
-        self.layout.addWidget(back_button)
-
-    def create_app_button(self, app):
+    def apply_catalog_diff(self, name, diff):
         """
-        Создает кнопку для приложения.
-        :param app: Словарь с данными приложения (name, path, icon_path, bg_color, is_square).
-        :return: QPushButton
+        Точечное обновление экрана после изменения каталога.
+        :param name: Имя каталога ("apps", "categories").
+        :param diff: CatalogDiff с изменёнными записями.
         """
-        app_name = app.get("name", "Без имени")
-        app_path = app.get("path", "")
-        bg_color = app.get("bg_color", "#4682B4")
-        is_square = app.get("is_square", False)
-
-        app_btn = QPushButton(app_name)
-        app_btn.setToolTip(app_name)
-
-        # Настройки размеров
-        app_btn.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        if is_square:
-            app_btn.setFixedSize(100, 100)
-
-        app_btn.setStyleSheet(f"""
-            QPushButton {{
-                font-size: 14px;
-                background-color: {bg_color};
-                color: white;
-                padding: 5px;
-                border-radius: {'10px' if is_square else '32px'};
-                border: none;
-            }}
-            QPushButton:hover {{
-                background-color: #5A9BD5;
-            }}
-        """)
-
-        app_btn.clicked.connect(lambda _, p=app_path: self.launch_app(p))
-        return app_btn
+        get_index_builder().apply_catalog_diff(name, diff)
+        if self.search_edit.text().strip():
+            self.on_search_changed(self.search_edit.text())
+
+        if name == "categories":
+            self.category_items.apply_diff(diff)
+            self.sync_category_pages(diff.records)
+            if self.current_category is not None:
+                self.current_category = self.category_pages[self.current_category.get("id")].category
+        elif name == "apps":
+            for page in self.category_pages.values():
+                page.apply_apps_diff(diff)
+            self.apps_by_path = None
+            self.update_favorites(diff.updated)
 
     def launch_app(self, path):
         """
@@ -170,23 +358,11 @@ class MainMenu(QWidget):
             return
 
         if os.path.exists(path):
-            try:
-                if os.name == 'nt':  # Windows
-                    os.startfile(path)
-                elif os.name == 'posix':  # Linux, Mac
-                    os.system(f'xdg-open "{path}"')
-            except Exception as e:
-                self.show_message(f"Не удалось запустить приложение: {str(e)}")
+            # Запуск не блокирует интерфейс; повторы и лимит проверяет сервис запуска
+            safe_launch(path, self)
         else:
             self.show_message(f"Приложение не найдено по пути: {path}")
 
-    def clear_layout(self, layout):
-        """Очищает layout от всех виджетов."""
-        while layout.count():
-            child = layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
     def show_message(self, message):
         """
         Отображение сообщения пользователю.
@@ -4,7 +4,8 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel,
                              QFileDialog, QMessageBox, QInputDialog)
 from PyQt6.QtGui import QFont, QColor
 from PyQt6.QtCore import Qt
-from utils.json_utils import load_json, save_json
+from utils.json_utils import load_json, save_json_deferred
+from utils.style_manager import set_property
 
 
 class SettingsMenu(QWidget):
@@ -20,6 +21,7 @@ class SettingsMenu(QWidget):
 
     def init_ui(self):
         """Инициализация пользовательского интерфейса"""
+        self.setObjectName("settingsMenu")
         self.layout = QVBoxLayout()
         self.layout.setSpacing(20)
         self.layout.setContentsMargins(50, 50, 50, 50)
@@ -63,32 +65,12 @@ class SettingsMenu(QWidget):
         settings = {
             "theme": self.current_theme,
         }
-        save_json(self.settings_file, settings)
+        save_json_deferred(self.settings_file, settings)
 
     def setup_styles(self):
         """Установка стилей на основе текущей темы"""
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {'#333333' if self.current_theme == 'dark' else '#f0f0f0'};
-                color: {'white' if self.current_theme == 'dark' else 'black'};
-            }}
-            QPushButton {{
-                background-color: rgba(150, 100, 200, 0.85);
-                color: white;
-                font-size: 16px;
-                padding: 10px;
-                border-radius: 8px;
-                border: 2px solid #9664C8;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(170, 120, 220, 0.9);
-            }}
-            QLabel {{
-                font-size: 24px;
-                font-weight: bold;
-                padding: 10px;
-            }}
-        """)
+        # Оформление тем описано в assets/styles.qss (#settingsMenu[theme=...])
+        set_property(self, "theme", self.current_theme)
 
     def show_main_settings(self):
         """Показ основных настроек"""
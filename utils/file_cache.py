@@ -0,0 +1,90 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+def file_signature(file_path):
+    """(st_mtime_ns, st_size, st_ino) файла или None, если файла нет"""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def copy_data(data):
+    """Неглубокая копия данных файла: список записей копируется по записям"""
+    if isinstance(data, list):
+        return [dict(item) if isinstance(item, dict) else item for item in data]
+    if isinstance(data, dict):
+        return dict(data)
+    return data
+
+
+class JsonFileCache:
+    """LRU-кэш разобранных файлов с проверкой (mtime, размер, inode).
+
+    Пока файл на диске не изменился, повторные чтения возвращают уже
+    разобранный объект. Возвращаемые данные общие для всех читателей и
+    не изменяются: кто меняет записи, работает с копией (copy_data), а
+    put запоминает копию записанного.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # абсолютный путь -> (сигнатура, данные)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, file_path, loader):
+        """Данные файла из кэша или результат loader(file_path) при промахе"""
+        key = os.path.abspath(file_path)
+        signature = file_signature(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if signature is not None and entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        data = loader(file_path)
+        if signature is not None and data is not None and file_signature(file_path) == signature:
+            self._store(key, signature, data)
+        return data
+
+    def put(self, file_path, data):
+        """Запомнить копию данных, только что записанных в файл (записавший может менять их дальше)"""
+        signature = file_signature(file_path)
+        if signature is not None:
+            self._store(os.path.abspath(file_path), signature, copy_data(data))
+
+    def invalidate(self, file_path=None):
+        """Сбросить запись для файла или весь кэш"""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(file_path), None)
+
+    def _store(self, key, signature, data):
+        with self._lock:
+            self._entries[key] = (signature, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        """Счётчики попаданий, промахов и вытеснений"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+json_cache = JsonFileCache(int(os.getenv("LAUNCHER_JSON_CACHE_SIZE", "32")))
@@ -1,5 +1,166 @@
+import atexit
 import json
 import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# Политика надёжности записи:
+#   "always"  — fsync файла и каталога после каждой записи;
+#   "batched" — fsync не чаще раза в BATCH_INTERVAL секунд (накопленные файлы синхронизируются пачкой);
+#   "never"   — без fsync, только атомарное переименование.
+DURABILITY_MODES = ("always", "batched", "never")
+BATCH_INTERVAL = 1.0
+
+_durability = os.getenv("LAUNCHER_FSYNC", "always")
+_pending_sync = set()
+_last_sync = 0.0
+_sync_lock = threading.Lock()
+
+_umask = os.umask(0)
+os.umask(_umask)
+
+
+def set_durability(mode):
+    """Установить политику fsync для атомарной записи"""
+    global _durability
+    if mode not in DURABILITY_MODES:
+        raise ValueError(f"Неизвестная политика записи: {mode}")
+    if mode != "batched":
+        sync_pending()
+    _durability = mode
+
+
+def get_durability():
+    """Текущая политика fsync"""
+    return _durability
+
+
+def _fsync_path(path):
+    """fsync файла или каталога по пути"""
+    flags = os.O_RDONLY
+    if os.path.isdir(path):
+        if os.name == "nt":
+            return  # Windows не позволяет открыть каталог для fsync
+        flags |= getattr(os, "O_DIRECTORY", 0)
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def sync_pending():
+    """Принудительно синхронизировать файлы, накопленные в режиме batched"""
+    global _last_sync
+    with _sync_lock:
+        paths = list(_pending_sync)
+        _pending_sync.clear()
+        _last_sync = time.monotonic()
+    for path in paths:
+        try:
+            _fsync_path(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[ERROR] Ошибка fsync {path}: {e}")
+
+
+atexit.register(sync_pending)
+
+
+def atomic_write_json(file_path, data, indent=4, ensure_ascii=False):
+    """Атомарная запись JSON: временный файл рядом с целевым, fsync и переименование.
+
+    При сбое посреди записи целевой файл остаётся в прежнем состоянии.
+    """
+    _atomic_write(file_path, lambda file: json.dump(data, file, indent=indent, ensure_ascii=ensure_ascii))
+
+
+def atomic_write_json_stream(file_path, items, indent=4, ensure_ascii=False):
+    """Атомарная запись JSON-массива из итератора: элементы пишутся по одному, без списка в памяти.
+
+    Результат совпадает с json.dump(list(items), indent=indent). Исключение из
+    итератора отменяет запись, как и любой другой сбой.
+    """
+    def write(file):
+        file.write("[")
+        separator = "\n"
+        for item in items:
+            text = json.dumps(item, indent=indent, ensure_ascii=ensure_ascii)
+            file.write(separator + " " * indent + text.replace("\n", "\n" + " " * indent))
+            separator = ",\n"
+        file.write("\n]" if separator != "\n" else "]")
+
+    _atomic_write(file_path, write)
+
+
+def _atomic_write(file_path, write):
+    """Записать файл функцией write(file) во временный файл и атомарно подменить целевой"""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(file_path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            # mkstemp создаёт файл с правами 0600 — сохраняем права исходного файла
+            try:
+                mode = os.stat(file_path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o666 & ~_umask
+            os.chmod(tmp_path, mode)
+            write(file)
+            file.flush()
+            if _durability == "always":
+                os.fsync(file.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if _durability == "always":
+        _fsync_path(directory)
+    elif _durability == "batched":
+        with _sync_lock:
+            _pending_sync.update((os.path.abspath(file_path), directory))
+            due = time.monotonic() - _last_sync >= BATCH_INTERVAL
+        if due:
+            sync_pending()
+
+
+@contextmanager
+def file_lock(lock_path):
+    """Монопольная блокировка между процессами на время блока (файл-замок lock_path).
+
+    Внутри процесса потоки тоже ждут друг друга: каждый открывает свой дескриптор.
+    """
+    with open(lock_path, "a+b") as file:
+        if os.name == "nt":
+            file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK сдаётся через 10 попыток — ждём дальше
+            try:
+                yield
+            finally:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
 
 
 def load_json(file_path):
@@ -18,7 +179,6 @@ def load_json(file_path):
 def save_json(file_path, data):
     """Сохраняет данные в JSON-файл."""
     try:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=4, ensure_ascii=False)
+        atomic_write_json(file_path, data)
     except Exception as e:
-        print(f"[ERROR] Ошибка записи в файл {file_path}: {e}")
\ No newline at end of file
+        print(f"[ERROR] Ошибка записи в файл {file_path}: {e}")
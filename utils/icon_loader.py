@@ -0,0 +1,244 @@
+import hashlib
+import logging
+import os
+import tempfile
+
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QRunnable, Qt, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QColor, QGuiApplication, QIcon, QImage, QImageReader, QPainter, QPixmap
+
+from utils.pixmap_cache import pixmap_cache
+
+THUMBNAIL_DIR = os.path.join("data", ".thumbnails")
+# Предел размера кэша миниатюр; лишнее удаляется при запуске, начиная с давно не использованных
+THUMBNAIL_LIMIT_BYTES = int(os.getenv("LAUNCHER_THUMBNAILS_MB", "64")) * 1024 * 1024
+
+
+def _thumbnail_path(cache_dir, path, st, width, height):
+    """Файл миниатюры: ключ — путь, mtime и размер исходника и размер миниатюры"""
+    key = f"{os.path.abspath(path)}\0{st.st_mtime_ns}\0{st.st_size}\0{width}x{height}"
+    return os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+
+def decode_scaled(path, width, height, cache_dir=THUMBNAIL_DIR):
+    """Уменьшенное изображение файла (QImage) или None.
+
+    Сначала ищется готовая миниатюра на диске; иначе исходник декодируется
+    сразу в нужном размере (QImageReader.setScaledSize), а результат
+    сохраняется в кэш миниатюр. Безопасно вызывать не из GUI-потока.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    thumbnail = _thumbnail_path(cache_dir, path, st, width, height) if cache_dir else None
+    if thumbnail and os.path.exists(thumbnail):
+        image = QImage(thumbnail)
+        if not image.isNull():
+            try:
+                os.utime(thumbnail)  # mtime — время последнего использования для prune_thumbnails
+            except OSError:
+                pass
+            return image
+
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    source_size = reader.size()
+    if source_size.isValid() and (source_size.width() > width or source_size.height() > height):
+        reader.setScaledSize(source_size.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        logging.warning(f"Не удалось декодировать изображение {path}: {reader.errorString()}")
+        return None
+
+    if thumbnail:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".png")
+            os.close(fd)
+            if image.save(tmp_path, "PNG"):
+                os.replace(tmp_path, thumbnail)
+            else:
+                os.unlink(tmp_path)
+        except OSError as e:
+            logging.warning(f"Не удалось сохранить миниатюру {path}: {e}")
+    return image
+
+
+def prune_thumbnails(cache_dir=THUMBNAIL_DIR, max_bytes=THUMBNAIL_LIMIT_BYTES):
+    """Удалить самые давно использованные миниатюры, пока кэш больше max_bytes.
+
+    Миниатюры сменившихся или удалённых иконок больше не читаются и уходят
+    первыми. Возвращает число удалённых файлов.
+    """
+    entries = []
+    total = 0
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                    total += st.st_size
+    except FileNotFoundError:
+        return 0
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+            removed += 1
+        except OSError as e:
+            logging.warning(f"Не удалось удалить миниатюру {path}: {e}")
+    if removed:
+        logging.info(f"Кэш миниатюр: удалено {removed} файлов, осталось {total / 1024 / 1024:.1f} МБ")
+    return removed
+
+
+class _PruneTask(QRunnable):
+    def __init__(self, cache_dir):
+        super().__init__()
+        self.cache_dir = cache_dir
+
+    def run(self):
+        try:
+            prune_thumbnails(self.cache_dir)
+        except Exception as e:
+            logging.error(f"Ошибка очистки кэша миниатюр: {e}")
+
+
+class _Signals(QObject):
+    finished = pyqtSignal(object, object)  # ключ кэша, QImage или None
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, key, path, width, height, cache_dir, signals):
+        super().__init__()
+        self.key = key
+        self.path = path
+        self.width = width
+        self.height = height
+        self.cache_dir = cache_dir
+        self.signals = signals
+
+    def run(self):
+        try:
+            image = decode_scaled(self.path, self.width, self.height, self.cache_dir)
+        except Exception as e:
+            logging.error(f"Ошибка загрузки иконки {self.path}: {e}")
+            image = None
+        self.signals.finished.emit(self.key, image)
+
+
+class IconLoader(QObject):
+    """Фоновая загрузка иконок на QThreadPool.
+
+    load() сразу возвращает управление; callback(QPixmap или None)
+    вызывается в GUI-потоке, когда изображение готово. Готовые изображения
+    берутся из общего pixmap_cache без обращения к пулу; одновременные
+    запросы одного файла и размера объединяются в одно декодирование.
+    """
+
+    def __init__(self, cache_dir=THUMBNAIL_DIR, max_threads=2, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._signals = _Signals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._waiting = {}  # ключ -> [callback]
+        self._placeholders = {}
+        if cache_dir:
+            self.pool.start(_PruneTask(cache_dir))
+
+    @staticmethod
+    def device_pixel_ratio():
+        app = QGuiApplication.instance()
+        return app.devicePixelRatio() if app is not None else 1.0
+
+    def cache_key(self, path, size):
+        """Ключ pixmap_cache для логического размера size с учётом device pixel ratio"""
+        dpr = self.device_pixel_ratio()
+        return pixmap_cache.key(path, round(size.width() * dpr), round(size.height() * dpr), dpr)
+
+    def cached(self, path, size):
+        """Готовая иконка из общего кэша или None"""
+        return pixmap_cache.get(self.cache_key(path, size)) if path else None
+
+    def load(self, path, size, callback):
+        """Загрузить иконку path размером size (QSize в логических пикселях)"""
+        if not path:
+            callback(None)
+            return
+        key = self.cache_key(path, size)
+        pixmap = pixmap_cache.get(key)
+        if pixmap is not None:
+            callback(pixmap)
+            return
+        if key in self._waiting:
+            self._waiting[key].append(callback)
+            return
+        self._waiting[key] = [callback]
+        _, _, width, height, _ = key
+        self.pool.start(_DecodeTask(key, path, width, height, self.cache_dir, self._signals))
+
+    def _on_finished(self, key, image):
+        pixmap = None
+        if image is not None:
+            pixmap = QPixmap.fromImage(image)
+            pixmap.setDevicePixelRatio(key[-1])
+            pixmap_cache.put(key, pixmap)
+        for callback in self._waiting.pop(key, []):
+            try:
+                callback(pixmap)
+            except Exception as e:
+                logging.error(f"Ошибка обработчика иконки: {e}")
+
+    def placeholder(self, size):
+        """Заглушка, показываемая до загрузки иконки"""
+        key = (size.width(), size.height())
+        if key not in self._placeholders:
+            pixmap = QPixmap(size)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(255, 255, 255, 60))
+            painter.drawRoundedRect(pixmap.rect().adjusted(2, 2, -2, -2), 6, 6)
+            painter.end()
+            self._placeholders[key] = pixmap
+        return self._placeholders[key]
+
+    def set_button_icon(self, button, path, size):
+        """Поставить кнопке заглушку и заменить её иконкой после загрузки"""
+        button.setIconSize(size)
+        pixmap = self.cached(path, size)
+        if pixmap is not None:
+            button.setIcon(QIcon(pixmap))
+            return
+        button.setIcon(QIcon(self.placeholder(size)))
+
+        def apply(pixmap):
+            if sip.isdeleted(button):
+                return
+            if pixmap is None:
+                logging.warning(f"Иконка не найдена: {path}")
+                button.setIcon(QIcon())
+            else:
+                button.setIcon(QIcon(pixmap))
+
+        self.load(path, size, apply)
+
+
+_loader = None
+
+
+def get_icon_loader():
+    """Общий загрузчик иконок (создаётся при первом обращении, нужен QApplication)"""
+    global _loader
+    if _loader is None:
+        _loader = IconLoader()
+    return _loader
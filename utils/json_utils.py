@@ -8,6 +8,9 @@ from typing import Any, List, Dict
 
 from PyQt6.QtWidgets import QMessageBox
 
+from utils import startup_profiler, write_queue
+from utils.storage import get_backend
+
 
 # В utils/json_manager.py добавьте:
 def load_data(filename: str) -> List[Dict[str, Any]]:
@@ -26,30 +29,28 @@ def load_data(filename: str) -> List[Dict[str, Any]]:
         sys.exit(1)
 
 def load_json(file_path: str) -> Any:
-    """Загружает данные из JSON-файла."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            logging.info(f"Чтение JSON-файла: {file_path}")
-            return json.load(file)
-    except FileNotFoundError:
-        logging.error(f"Файл {file_path} не найден.")
-        return None
-    except json.JSONDecodeError as e:
-        logging.error(f"Ошибка чтения JSON из {file_path}: {e}")
-        return None
-    except Exception as e:
-        logging.error(f"Неизвестная ошибка при загрузке JSON из {file_path}: {e}")
-        return None
+    """Загружает данные из JSON-файла (или из активного бэкенда хранения)."""
+    queue = write_queue.get_queue()
+    if queue is not None:
+        found, data = queue.pending(file_path)
+        if found:
+            return data
+    with startup_profiler.span(file_path, "json"):
+        return get_backend().load(file_path)
 
 
 def save_json(file_path: str, data: Any) -> None:
-    """Сохраняет данные в JSON-файл."""
-    try:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=4, ensure_ascii=False)
-            logging.info(f"Данные успешно сохранены в файл: {file_path}")
-    except Exception as e:
-        logging.error(f"Ошибка записи в файл {file_path}: {e}")
+    """Сохраняет данные в JSON-файл (или в активный бэкенд хранения)."""
+    get_backend().save(file_path, data)
+
+
+def save_json_deferred(file_path: str, data: Any) -> None:
+    """Сохраняет данные через очередь отложенной записи, если она включена."""
+    queue = write_queue.get_queue()
+    if queue is None:
+        save_json(file_path, data)
+    else:
+        queue.submit(file_path, data)
 
 
 def setup_logging(log_level=logging.INFO) -> None:
@@ -1,13 +1,41 @@
-import subprocess
+import time
+import webbrowser
+
 from PyQt6.QtWidgets import QMessageBox
 
-def safe_launch(path_or_command, parent=None):
+from core.launch_service import ALREADY_RUNNING, FAILED, LIMIT_REACHED, STARTED, get_launch_service
+from core.usage_stats import APP, SITE, get_usage_stats
+
+
+def safe_launch(path_or_command, parent=None, kind=APP):
+    """Запуск через общий сервис запуска с сообщением пользователю о проблеме.
+
+    Успешный запуск записывается в статистику использования как событие kind.
+    """
+    service = get_launch_service()
+    start = time.perf_counter()
+    result = service.launch(path_or_command)
+    if result == STARTED:
+        get_usage_stats().record(kind, path_or_command, (time.perf_counter() - start) * 1000)
+    elif result == ALREADY_RUNNING:
+        show_info("Программа уже запущена.", parent)
+    elif result == LIMIT_REACHED:
+        show_error(f"Одновременно можно запустить не больше {service.max_running} программ. "
+                   f"Закройте одну из них.", parent)
+    elif result == FAILED:
+        show_error("Программа не найдена или не запускается. Убедись, что она установлена.", parent)
+    return result
+
+def open_site(url, parent=None):
+    """Открыть сайт в браузере по умолчанию и записать это в статистику использования"""
     try:
-        subprocess.Popen(path_or_command)
-    except FileNotFoundError:
-        show_error("Программа не найдена. Убедись, что она установлена.", parent)
+        start = time.perf_counter()
+        webbrowser.open(url)
     except Exception as e:
-        show_error(f"Ошибка запуска: {str(e)}", parent)
+        show_error(f"Не удалось открыть сайт:\n{e}", parent)
+        return False
+    get_usage_stats().record(SITE, url, (time.perf_counter() - start) * 1000)
+    return True
 
 def show_error(message, parent=None):
     msg = QMessageBox(parent)
@@ -15,3 +43,10 @@ def show_error(message, parent=None):
     msg.setWindowTitle("Ошибка запуска")
     msg.setText(message)
     msg.exec()
+
+def show_info(message, parent=None):
+    msg = QMessageBox(parent)
+    msg.setIcon(QMessageBox.Icon.Information)
+    msg.setWindowTitle("Запуск")
+    msg.setText(message)
+    msg.exec()
@@ -0,0 +1,81 @@
+import os
+from collections import OrderedDict
+
+
+class PixmapCache:
+    """Общий LRU-кэш QPixmap, ограниченный суммарным объёмом в байтах.
+
+    Ключ — (абсолютный путь, mtime файла, ширина, высота, device pixel
+    ratio), так что одна и та же картинка в разных размерах хранится
+    отдельно, а файл, заменённый на диске, получает новый ключ (как и
+    миниатюры в icon_loader). Работает только из GUI-потока, как и сами
+    QPixmap.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # ключ -> (QPixmap, байты)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(path, width, height, dpr):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        return os.path.abspath(path), mtime, width, height, round(dpr, 2)
+
+    @staticmethod
+    def cost(pixmap):
+        """Объём пикселей изображения в байтах"""
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, pixmap):
+        cost = self.cost(pixmap)
+        if cost > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+        self._entries[key] = (pixmap, cost)
+        self.total_bytes += cost
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted_cost) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_cost
+            self.evictions += 1
+
+    def invalidate(self, path=None):
+        """Сбросить все размеры одного файла или весь кэш"""
+        if path is None:
+            self._entries.clear()
+            self.total_bytes = 0
+            return
+        path = os.path.abspath(path)
+        for key in [k for k in self._entries if k[0] == path]:
+            self.total_bytes -= self._entries.pop(key)[1]
+
+    def stats(self):
+        """Счётчики попаданий, промахов и вытеснений"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+pixmap_cache = PixmapCache(int(os.getenv("LAUNCHER_PIXMAP_CACHE_MB", "64")) * 1024 * 1024)
@@ -0,0 +1,135 @@
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+
+from core.usage_stats import APP, GAME, get_usage_stats, usage_key
+from utils.json_utils import load_json
+
+CATALOG_FILES = (os.path.join("data", "apps.json"), os.path.join("data", "games.json"))
+CHUNK_SIZE = 1024 * 1024
+
+_LDD_LINE = re.compile(r"(?:=>\s*)?(/\S+)\s+\(0x[0-9a-f]+\)")
+
+
+def frequent_paths(limit, catalog_files=CATALOG_FILES):
+    """Пути из каталогов приложений и игр, отсортированные по числу запусков"""
+    paths = set()
+    for file_path in catalog_files:
+        records = load_json(file_path)
+        if isinstance(records, list):
+            paths.update(usage_key(APP, r["path"]) for r in records if isinstance(r, dict) and r.get("path"))
+    stats = get_usage_stats()
+    ranked = sorted((a for kind in (APP, GAME) for a in stats.most_used(limit, kind) if a.key in paths),
+                    key=lambda a: a.count, reverse=True)
+    return [a.key for a in ranked[:limit]]
+
+
+def shared_libraries(path):
+    """Разделяемые библиотеки исполняемого файла.
+
+    В Linux список даёт ldd; в других системах берутся библиотеки (.dll,
+    .dylib, .so) из каталога программы — так обычно поставляются игры.
+    """
+    if os.name == "posix" and os.path.isfile("/usr/bin/ldd"):
+        try:
+            output = subprocess.run(["ldd", path], capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            logging.warning(f"ldd не отработал для {path}: {e}")
+            return []
+        return [m.group(1) for m in map(_LDD_LINE.search, output.splitlines()) if m]
+
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return [os.path.join(directory, n) for n in sorted(names) if n.lower().endswith((".dll", ".dylib", ".so"))]
+
+
+def plan(paths, budget_bytes):
+    """[(файл, байты)] для прогрева: программы по убыванию частоты, затем их библиотеки.
+
+    Общие библиотеки учитываются один раз; файлы, не помещающиеся в
+    остаток бюджета, прогреваются частично.
+    """
+    result = []
+    seen = set()
+    remaining = budget_bytes
+    for path in paths:
+        for file_path in [path, *shared_libraries(path)]:
+            real = os.path.realpath(file_path)
+            if real in seen or remaining <= 0:
+                continue
+            seen.add(real)
+            try:
+                size = os.path.getsize(real)
+            except OSError:
+                continue
+            amount = min(size, remaining)
+            result.append((real, amount))
+            remaining -= amount
+    return result
+
+
+def warm_file(path, length):
+    """Подгрузить первые length байт файла в страничный кэш ОС"""
+    with open(path, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            # Асинхронное опережающее чтение ядром, без копирования в процесс
+            os.posix_fadvise(f.fileno(), 0, length, os.POSIX_FADV_WILLNEED)
+            return length
+        done = 0
+        while done < length:
+            chunk = f.read(min(CHUNK_SIZE, length - done))
+            if not chunk:
+                break
+            done += len(chunk)
+        return done
+
+
+def evict_file(path):
+    """Попросить ОС выбросить файл из страничного кэша (для замеров холодного запуска)"""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    with open(path, "rb", buffering=0) as f:
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    return True
+
+
+def prewarm(paths, budget_bytes):
+    """Прогреть программы paths и их библиотеки в пределах budget_bytes; возвращает число байт"""
+    start = time.perf_counter()
+    total = 0
+    files = plan(paths, budget_bytes)
+    for file_path, length in files:
+        try:
+            total += warm_file(file_path, length)
+        except OSError as e:
+            logging.warning(f"Не удалось прогреть {file_path}: {e}")
+    logging.info(f"Прогрето {len(files)} файлов, {total / 1024 / 1024:.1f} МБ "
+                 f"за {(time.perf_counter() - start) * 1000:.0f} мс")
+    return total
+
+
+def start_background(limit=None, budget_mb=None):
+    """Запустить прогрев частых программ в фоновом потоке.
+
+    Режим необязательный: включается переменной LAUNCHER_PREWARM=1, бюджет
+    задаёт LAUNCHER_PREWARM_MB (по умолчанию 256), число программ —
+    LAUNCHER_PREWARM_TOP (по умолчанию 4).
+    """
+    limit = limit or int(os.getenv("LAUNCHER_PREWARM_TOP", "4"))
+    budget_mb = budget_mb or int(os.getenv("LAUNCHER_PREWARM_MB", "256"))
+    paths = [p for p in frequent_paths(limit) if os.path.isfile(p)]
+    if not paths:
+        return None
+    thread = threading.Thread(target=prewarm, args=(paths, budget_mb * 1024 * 1024), name="prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def enabled():
+    return os.getenv("LAUNCHER_PREWARM", "0") == "1"
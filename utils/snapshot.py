@@ -0,0 +1,200 @@
+import json
+import logging
+import marshal
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+
+# Формат снимка:
+#   MAGIC | версия формата (B) | версия marshal (B) | длина заголовка (I) | заголовок | данные
+# Заголовок (marshal): {"python": (major, minor), "entries": {имя файла: (mtime_ns, size, inode, смещение, длина)}}
+# Данные каждого файла — marshal-представление разобранного JSON; смещения считаются от начала данных.
+MAGIC = b"MKLSNAP"
+FORMAT_VERSION = 1
+SNAPSHOT_NAME = ".catalog.snapshot"
+_PREFIX = struct.Struct("<BBI")
+
+
+def _signature(st):
+    """Признаки неизменности исходного файла"""
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class Snapshot:
+    """Скомпилированный снимок data/*.json для быстрого холодного старта.
+
+    Исходными данными остаются JSON-файлы: запись снимка считается
+    действительной, только пока mtime, размер и inode исходного файла
+    совпадают с сохранёнными (атомарная запись всегда меняет inode). Файл снимка отображается в память, а каждая запись
+    разбирается лениво при первом обращении.
+    """
+
+    def __init__(self, data_dir="data", path=None):
+        self.data_dir = os.path.abspath(data_dir)
+        self.path = path or os.path.join(self.data_dir, SNAPSHOT_NAME)
+        self._lock = threading.RLock()
+        self._file = None
+        self._mm = None
+        self._entries = {}
+        self._payload_start = 0
+
+    def open(self):
+        """Открыть снимок. Возвращает False, если его нет или формат не подходит"""
+        with self._lock:
+            self.close()
+            try:
+                file = open(self.path, "rb")
+            except FileNotFoundError:
+                return False
+            mm = None
+            try:
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                header_start = len(MAGIC) + _PREFIX.size
+                if mm[:len(MAGIC)] != MAGIC:
+                    raise ValueError("неверная сигнатура")
+                version, marshal_version, header_len = _PREFIX.unpack_from(mm, len(MAGIC))
+                if version != FORMAT_VERSION or marshal_version != marshal.version:
+                    raise ValueError(f"версия {version}/{marshal_version} не поддерживается")
+                header = marshal.loads(mm[header_start:header_start + header_len])
+                if tuple(header["python"]) != tuple(sys.version_info[:2]):
+                    raise ValueError("снимок создан другой версией Python")
+            except (ValueError, EOFError, KeyError, TypeError, OSError) as e:
+                logging.warning(f"Снимок каталога {self.path} не используется: {e}")
+                if mm is not None:
+                    mm.close()
+                file.close()
+                return False
+            self._file = file
+            self._mm = mm
+            self._entries = header["entries"]
+            self._payload_start = header_start + header_len
+            logging.debug(f"Снимок каталога открыт: {len(self._entries)} файлов")
+            return True
+
+    def close(self):
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._file.close()
+            self._mm = None
+            self._file = None
+            self._entries = {}
+
+    def _entry_name(self, file_path):
+        directory, name = os.path.split(os.path.abspath(file_path))
+        return name if directory == self.data_dir else None
+
+    def lookup(self, file_path):
+        """(True, данные), если снимок актуален для файла, иначе (False, None)"""
+        with self._lock:
+            entry = self._entries.get(self._entry_name(file_path))
+            if entry is None or self._mm is None:
+                return False, None
+            *signature, offset, length = entry
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return False, None
+            if _signature(st) != tuple(signature):
+                return False, None
+            start = self._payload_start + offset
+            with memoryview(self._mm) as view, view[start:start + length] as chunk:
+                data = marshal.loads(chunk)
+            return True, data
+
+    def stale_files(self):
+        """Файлы data/*.json, для которых снимок отсутствует или устарел"""
+        stale = []
+        with self._lock:
+            for name in sorted(os.listdir(self.data_dir)):
+                if not name.endswith(".json"):
+                    continue
+                entry = self._entries.get(name)
+                st = os.stat(os.path.join(self.data_dir, name))
+                if entry is None or _signature(st) != tuple(entry[:3]):
+                    stale.append(name)
+        return stale
+
+    def rebuild(self):
+        """Пересобрать снимок из JSON-файлов и открыть его заново"""
+        entries = {}
+        chunks = []
+        offset = 0
+        for name in sorted(os.listdir(self.data_dir)):
+            if not name.endswith(".json"):
+                continue
+            file_path = os.path.join(self.data_dir, name)
+            try:
+                before = os.stat(file_path)
+                with open(file_path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                after = os.stat(file_path)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Файл {file_path} пропущен при сборке снимка: {e}")
+                continue
+            if _signature(before) != _signature(after):
+                continue  # файл меняется прямо сейчас — пусть читается из JSON
+            payload = marshal.dumps(data)
+            entries[name] = _signature(after) + (offset, len(payload))
+            chunks.append(payload)
+            offset += len(payload)
+
+        header = marshal.dumps({"python": tuple(sys.version_info[:2]), "entries": entries})
+        fd, tmp_path = tempfile.mkstemp(dir=self.data_dir, prefix=f"{SNAPSHOT_NAME}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(MAGIC)
+                file.write(_PREFIX.pack(FORMAT_VERSION, marshal.version, len(header)))
+                file.write(header)
+                for chunk in chunks:
+                    file.write(chunk)
+            with self._lock:
+                self.close()  # в Windows нельзя заменить файл, отображённый в память
+                os.replace(tmp_path, self.path)
+                self.open()
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        logging.info(f"Снимок каталога пересобран: {len(entries)} файлов, {offset} байт")
+
+
+_snapshot = None
+
+
+def enable(data_dir="data"):
+    """Включить снимок каталога (отключается LAUNCHER_SNAPSHOT=0).
+
+    Если снимок отсутствует или устарел, он пересобирается в фоновом потоке.
+    """
+    global _snapshot
+    if os.getenv("LAUNCHER_SNAPSHOT", "1") == "0" or not os.path.isdir(data_dir):
+        return None
+    _snapshot = Snapshot(data_dir)
+    _snapshot.open()
+    if _snapshot.stale_files():
+        threading.Thread(target=refresh, name="snapshot-rebuild", daemon=True).start()
+    return _snapshot
+
+
+def lookup(file_path):
+    """Данные файла из активного снимка: (True, данные) или (False, None)"""
+    if _snapshot is None:
+        return False, None
+    return _snapshot.lookup(file_path)
+
+
+def refresh():
+    """Пересобрать активный снимок, если исходные файлы изменились"""
+    if _snapshot is None:
+        return
+    try:
+        if _snapshot.stale_files():
+            _snapshot.rebuild()
+    except Exception as e:
+        logging.error(f"Ошибка пересборки снимка каталога: {e}")
@@ -0,0 +1,215 @@
+import importlib.abc
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Профилировщик холодного старта.
+# Включается переменной окружения LAUNCHER_PROFILE_STARTUP (1 или префикс пути отчёта)
+# либо флагом командной строки --profile-startup[=префикс].
+# Отчёт: <префикс>.json в формате Chrome Trace (chrome://tracing, Perfetto) и <префикс>.txt.
+ENV_VAR = "LAUNCHER_PROFILE_STARTUP"
+CLI_FLAG = "--profile-startup"
+DEFAULT_PREFIX = "startup_trace"
+
+
+class StartupProfiler:
+    """Монотонные отметки фаз запуска, времени импорта модулей и чтения JSON"""
+
+    def __init__(self, prefix=DEFAULT_PREFIX):
+        self.prefix = prefix
+        self.origin = time.perf_counter_ns()
+        self.events = []  # (категория, имя, начало нс, длительность нс, поток)
+        self.finished = False
+        self._lock = threading.Lock()
+        self._import_hook = None
+
+    def _now(self):
+        return time.perf_counter_ns() - self.origin
+
+    def record(self, category, name, start, duration):
+        with self._lock:
+            self.events.append((category, name, start, duration, threading.get_ident()))
+
+    @contextmanager
+    def span(self, name, category="phase"):
+        start = self._now()
+        try:
+            yield
+        finally:
+            self.record(category, name, start, self._now() - start)
+
+    def mark(self, name):
+        """Мгновенная отметка (например, первая отрисовка)"""
+        self.record("mark", name, self._now(), 0)
+
+    def install_import_hook(self):
+        if self._import_hook is None:
+            self._import_hook = _ImportTimer(self)
+            sys.meta_path.insert(0, self._import_hook)
+
+    def remove_import_hook(self):
+        if self._import_hook is not None and self._import_hook in sys.meta_path:
+            sys.meta_path.remove(self._import_hook)
+        self._import_hook = None
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        trace = []
+        for category, name, start, duration, tid in self.events:
+            event = {"name": name, "cat": category, "ts": start / 1000, "pid": pid, "tid": tid}
+            if category == "mark":
+                event.update(ph="i", s="g")
+            else:
+                event.update(ph="X", dur=duration / 1000)
+            trace.append(event)
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def summary(self, top=15):
+        def ms(ns):
+            return ns / 1_000_000
+
+        lines = ["Профиль запуска (мс от старта процесса профилирования)", ""]
+        lines.append("Фазы:")
+        for category, name, start, duration, _ in sorted(self.events, key=lambda e: e[2]):
+            if category == "phase":
+                lines.append(f"  {name:<40} начало {ms(start):9.1f}  длительность {ms(duration):9.1f}")
+            elif category == "mark":
+                lines.append(f"  {name:<40} отметка {ms(start):8.1f}")
+
+        for category, title in (("import", "Импорты"), ("json", "Чтение JSON")):
+            events = [e for e in self.events if e[0] == category]
+            if not events:
+                continue
+            total = _covered(events)
+            lines.append("")
+            lines.append(f"{title}: {len(events)}, всего {ms(total):.1f}")
+            for _, name, _, duration, _ in sorted(events, key=lambda e: e[3], reverse=True)[:top]:
+                lines.append(f"  {name:<60} {ms(duration):9.2f}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self):
+        """Записать Chrome Trace и текстовую сводку"""
+        self.finished = True
+        self.remove_import_hook()
+        trace_path = f"{self.prefix}.json"
+        summary_path = f"{self.prefix}.txt"
+        try:
+            with open(trace_path, "w", encoding="utf-8") as file:
+                json.dump(self.chrome_trace(), file, ensure_ascii=False)
+            with open(summary_path, "w", encoding="utf-8") as file:
+                file.write(self.summary())
+            logging.info(f"Профиль запуска сохранён: {trace_path}, {summary_path}")
+        except OSError as e:
+            logging.error(f"Не удалось сохранить профиль запуска: {e}")
+
+
+def _covered(events):
+    """Суммарное время, покрытое событиями (вложенные импорты не считаются дважды)"""
+    total = 0
+    end = -1
+    for _, _, start, duration, _ in sorted(events, key=lambda e: e[2]):
+        if start + duration <= end:
+            continue
+        total += start + duration - max(start, end)
+        end = start + duration
+    return total
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Замер времени выполнения модулей при импорте (включая вложенные импорты)"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self._busy = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._busy, "active", False):
+            return None
+        self._busy.active = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._busy.active = False
+
+        loader = spec.loader
+        # Встроенные и замороженные модули загружаются общим классом-загрузчиком, его не трогаем
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        exec_module = loader.exec_module
+        profiler = self.profiler
+
+        def timed_exec_module(module):
+            with profiler.span(fullname, "import"):
+                exec_module(module)
+
+        try:
+            loader.exec_module = timed_exec_module
+        except (AttributeError, TypeError):
+            pass
+        return spec
+
+
+_profiler = None
+
+
+def enable(prefix=DEFAULT_PREFIX):
+    """Включить профилирование запуска"""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler(prefix)
+        _profiler.install_import_hook()
+    return _profiler
+
+
+def enable_from_args(argv):
+    """Включить профилирование по переменной окружения или флагу командной строки.
+
+    Флаг удаляется из argv, чтобы не попасть в QApplication.
+    """
+    prefix = None
+    env = os.getenv(ENV_VAR, "")
+    if env and env != "0":
+        prefix = DEFAULT_PREFIX if env == "1" else env
+    for arg in list(argv[1:]):
+        if arg == CLI_FLAG or arg.startswith(CLI_FLAG + "="):
+            argv.remove(arg)
+            prefix = arg.partition("=")[2] or prefix or DEFAULT_PREFIX
+    if prefix:
+        enable(prefix)
+    return _profiler
+
+
+def get_profiler():
+    return _profiler
+
+
+@contextmanager
+def span(name, category="phase"):
+    """Замер фазы; без включённого профилировщика ничего не делает"""
+    if _profiler is None or _profiler.finished:
+        yield
+        return
+    with _profiler.span(name, category):
+        yield
+
+
+def mark(name):
+    if _profiler is not None and not _profiler.finished:
+        _profiler.mark(name)
+
+
+def finish():
+    """Завершить профилирование и сохранить отчёт (один раз)"""
+    if _profiler is not None and not _profiler.finished:
+        _profiler.dump()
@@ -0,0 +1,405 @@
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from typing import Any, Iterable, Iterator, Optional
+
+from utils import snapshot
+from utils.file_cache import json_cache
+from utils.file_storage import atomic_write_json, atomic_write_json_stream, file_lock
+
+# Файл последовательностей id JSON-бэкенда, рядом с каталогами (имя без .json: это не каталог)
+SEQUENCES_NAME = ".sequences"
+
+
+class JsonFileBackend:
+    """Хранение данных в JSON-файлах (поведение по умолчанию)"""
+
+    name = "json"
+
+    def load(self, file_path: str) -> Any:
+        """Загружает данные из JSON-файла; неизменившиеся файлы отдаются из кэша."""
+        return json_cache.get(file_path, self._read)
+
+    def _read(self, file_path: str) -> Any:
+        """Разбор файла: из актуального снимка каталога или из JSON."""
+        found, data = snapshot.lookup(file_path)
+        if found:
+            return data
+        try:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                logging.info(f"Чтение JSON-файла: {file_path}")
+                return json.load(file)
+        except FileNotFoundError:
+            logging.error(f"Файл {file_path} не найден.")
+            return None
+        except json.JSONDecodeError as e:
+            logging.error(f"Ошибка чтения JSON из {file_path}: {e}")
+            return None
+        except Exception as e:
+            logging.error(f"Неизвестная ошибка при загрузке JSON из {file_path}: {e}")
+            return None
+
+    def save(self, file_path: str, data: Any) -> None:
+        """Сохраняет данные в JSON-файл."""
+        try:
+            atomic_write_json(file_path, data)
+            json_cache.put(file_path, data)
+            logging.info(f"Данные успешно сохранены в файл: {file_path}")
+        except Exception as e:
+            logging.error(f"Ошибка записи в файл {file_path}: {e}")
+
+    def supports_records(self, file_path: str) -> bool:
+        """Поддерживается ли построчное изменение записей"""
+        return False
+
+    def next_ids(self, file_path: str, count: int = 1, floor: int = 0) -> int:
+        """Зарезервировать count новых id коллекции; возвращает первый из них.
+
+        Последовательность хранится в файле .sequences рядом с каталогом и
+        только растёт: id не повторяются после удалений и перезапусков.
+        Резервирование идёт под межпроцессной блокировкой. floor — наибольший
+        id, уже имеющийся в каталоге (последовательность не опускается ниже).
+        """
+        directory, filename = os.path.split(os.path.abspath(file_path))
+        name = os.path.splitext(filename)[0]
+        path = os.path.join(directory, SEQUENCES_NAME)
+        with file_lock(path + ".lock"):
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    sequences = json.load(file)
+            except FileNotFoundError:
+                sequences = {}
+            except (json.JSONDecodeError, OSError) as e:
+                # floor не даёт выдать id, занятые в каталоге
+                logging.error(f"Ошибка чтения последовательностей {path}: {e}")
+                sequences = {}
+            first = max(sequences.get(name, 0), floor) + 1
+            sequences[name] = first + count - 1
+            atomic_write_json(path, sequences)
+        return first
+
+    def iter_records(self, file_path: str) -> Iterator[Any]:
+        """Записи списочной коллекции по порядку (JSON-файл разбирается целиком)"""
+        data = self.load(file_path)
+        return iter(data if isinstance(data, list) else [])
+
+    def append_records(self, file_path: str, records: Iterable[dict], batch_size: int = 1000) -> int:
+        """Дописать записи из итератора в конец коллекции одной атомарной перезаписью файла.
+
+        Новый файл пишется потоком: в памяти только прежние записи. Исключение
+        из итератора оставляет файл нетронутым. Возвращает число дописанных записей.
+        """
+        appended = 0
+
+        def counted():
+            nonlocal appended
+            for record in records:
+                appended += 1
+                yield record
+
+        atomic_write_json_stream(file_path, itertools.chain(self.iter_records(file_path), counted()))
+        # Кэш сверяет файл по mtime, размеру и inode, так что новая версия перечитается
+        logging.info(f"В {file_path} дописано записей: {appended}")
+        return appended
+
+
+class SQLiteBackend:
+    """Хранение коллекций data/*.json в SQLite (режим WAL).
+
+    Списочные коллекции лежат в одноимённых таблицах: порядок записей
+    задаёт position, а id, category_id и sort_order вынесены в отдельные
+    индексируемые столбцы. Настройки хранятся парами ключ-значение.
+    Файлы вне data_dir и неизвестные коллекции обслуживаются JSON-бэкендом.
+    """
+
+    name = "sqlite"
+
+    LIST_COLLECTIONS = ("apps", "categories", "games", "sites", "chats", "admins")
+    DICT_COLLECTIONS = ("settings",)
+
+    def __init__(self, db_path: str = "launcher.db", data_dir: str = "data", fallback=None):
+        self.db_path = db_path
+        self.data_dir = os.path.abspath(data_dir)
+        self.fallback = fallback or JsonFileBackend()
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        if not self._stored_collections():
+            migrate_json_to_sqlite(self, self.data_dir)
+
+    def _create_schema(self):
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            cur.execute("CREATE TABLE IF NOT EXISTS collections (name TEXT PRIMARY KEY, kind TEXT NOT NULL)")
+            for name in self.LIST_COLLECTIONS:
+                cur.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {name} (
+                        position INTEGER PRIMARY KEY,
+                        id INTEGER,
+                        category_id INTEGER,
+                        sort_order INTEGER,
+                        data TEXT NOT NULL
+                    )
+                """)
+                cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_id ON {name}(id)")
+                cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_category ON {name}(category_id, position)")
+                cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_sort ON {name}(sort_order)")
+            for name in self.DICT_COLLECTIONS:
+                cur.execute(f"CREATE TABLE IF NOT EXISTS {name} (key TEXT PRIMARY KEY, value TEXT)")
+            cur.execute("CREATE TABLE IF NOT EXISTS sequences (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            cur.execute("COMMIT")
+
+    def _stored_collections(self):
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT name FROM collections")}
+
+    def collection_for(self, file_path: str) -> Optional[str]:
+        """Имя коллекции для пути к файлу или None, если файл не из data_dir"""
+        directory, filename = os.path.split(os.path.abspath(file_path))
+        name, ext = os.path.splitext(filename)
+        if directory != self.data_dir or ext != ".json":
+            return None
+        if name in self.LIST_COLLECTIONS or name in self.DICT_COLLECTIONS:
+            return name
+        return None
+
+    def load(self, file_path: str) -> Any:
+        name = self.collection_for(file_path)
+        if name is None:
+            return self.fallback.load(file_path)
+        with self._lock:
+            if name not in self._stored_collections():
+                logging.error(f"Коллекция {name} отсутствует в {self.db_path}")
+                return None
+            if name in self.DICT_COLLECTIONS:
+                rows = self._conn.execute(f"SELECT key, value FROM {name}")
+                return {key: json.loads(value) for key, value in rows}
+            rows = self._conn.execute(f"SELECT data FROM {name} ORDER BY position")
+            return [json.loads(data) for (data,) in rows]
+
+    def save(self, file_path: str, data: Any) -> None:
+        name = self.collection_for(file_path)
+        if name is None:
+            return self.fallback.save(file_path, data)
+        try:
+            with self._lock:
+                cur = self._conn.cursor()
+                cur.execute("BEGIN IMMEDIATE")
+                try:
+                    self._write_collection(cur, name, data)
+                    cur.execute("COMMIT")
+                except Exception:
+                    cur.execute("ROLLBACK")
+                    raise
+            logging.info(f"Коллекция {name} сохранена в {self.db_path}")
+        except Exception as e:
+            logging.error(f"Ошибка записи коллекции {name} в {self.db_path}: {e}")
+
+    def _write_collection(self, cur, name, data):
+        if name in self.DICT_COLLECTIONS:
+            if not isinstance(data, dict):
+                raise ValueError(f"Коллекция {name} должна быть объектом")
+            cur.execute(f"DELETE FROM {name}")
+            cur.executemany(
+                f"INSERT INTO {name} (key, value) VALUES (?, ?)",
+                ((key, json.dumps(value, ensure_ascii=False)) for key, value in data.items())
+            )
+            kind = "dict"
+        else:
+            if not isinstance(data, list):
+                raise ValueError(f"Коллекция {name} должна быть списком")
+            cur.execute(f"DELETE FROM {name}")
+            cur.executemany(
+                f"INSERT INTO {name} (position, id, category_id, sort_order, data) VALUES (?, ?, ?, ?, ?)",
+                ((position,) + self._columns(record) for position, record in enumerate(data))
+            )
+            kind = "list"
+        cur.execute("INSERT OR REPLACE INTO collections (name, kind) VALUES (?, ?)", (name, kind))
+
+    @staticmethod
+    def _columns(record):
+        if not isinstance(record, dict):
+            return None, None, None, json.dumps(record, ensure_ascii=False)
+        return (record.get("id"), record.get("category_id"), record.get("sort_order"),
+                json.dumps(record, ensure_ascii=False))
+
+    def supports_records(self, file_path: str) -> bool:
+        name = self.collection_for(file_path)
+        return name in self.LIST_COLLECTIONS and name in self._stored_collections()
+
+    def apply_changes(self, file_path: str, upserts: Iterable[dict] = (), deletes: Iterable[Any] = ()) -> None:
+        """Построчно вставить/обновить записи (по id) и удалить записи по id"""
+        name = self.collection_for(file_path)
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                for record_id in deletes:
+                    cur.execute(f"DELETE FROM {name} WHERE id = ?", (record_id,))
+                for record in upserts:
+                    record_id, category_id, sort_order, data = self._columns(record)
+                    cur.execute(
+                        f"UPDATE {name} SET category_id = ?, sort_order = ?, data = ? WHERE id = ?",
+                        (category_id, sort_order, data, record_id)
+                    )
+                    if cur.rowcount == 0:
+                        cur.execute(
+                            f"INSERT INTO {name} (position, id, category_id, sort_order, data) "
+                            f"VALUES ((SELECT COALESCE(MAX(position), -1) + 1 FROM {name}), ?, ?, ?, ?)",
+                            (record_id, category_id, sort_order, data)
+                        )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    def next_ids(self, file_path: str, count: int = 1, floor: int = 0) -> int:
+        """Зарезервировать count новых id коллекции (таблица sequences); возвращает первый.
+
+        BEGIN IMMEDIATE сериализует резервирование между процессами. Внутри уже
+        открытой транзакции (append_records) резервирование становится её частью.
+        """
+        name = self.collection_for(file_path)
+        if name not in self.LIST_COLLECTIONS:
+            return self.fallback.next_ids(file_path, count, floor)
+        with self._lock:
+            cur = self._conn.cursor()
+            own = not self._conn.in_transaction
+            if own:
+                cur.execute("BEGIN IMMEDIATE")
+            try:
+                row = cur.execute("SELECT value FROM sequences WHERE name = ?", (name,)).fetchone()
+                first = max(row[0] if row else 0, floor) + 1
+                cur.execute("INSERT OR REPLACE INTO sequences (name, value) VALUES (?, ?)", (name, first + count - 1))
+                if own:
+                    cur.execute("COMMIT")
+            except BaseException:
+                if own:
+                    cur.execute("ROLLBACK")
+                raise
+        return first
+
+    def iter_records(self, file_path: str) -> Iterator[Any]:
+        """Записи списочной коллекции по порядку, порциями из курсора"""
+        name = self.collection_for(file_path)
+        if name not in self.LIST_COLLECTIONS:
+            yield from self.fallback.iter_records(file_path)
+            return
+        cur = self._conn.cursor()
+        with self._lock:
+            cur.execute(f"SELECT data FROM {name} ORDER BY position")
+        while True:
+            with self._lock:
+                rows = cur.fetchmany(1000)
+            if not rows:
+                return
+            for (data,) in rows:
+                yield json.loads(data)
+
+    def append_records(self, file_path: str, records: Iterable[dict], batch_size: int = 1000) -> int:
+        """Дописать записи из итератора в конец коллекции одной транзакцией, пачками по batch_size.
+
+        Исключение из итератора откатывает все пачки. Возвращает число дописанных записей.
+        """
+        name = self.collection_for(file_path)
+        if name not in self.LIST_COLLECTIONS:
+            return self.fallback.append_records(file_path, records, batch_size)
+        appended = 0
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                position = cur.execute(f"SELECT COALESCE(MAX(position), -1) + 1 FROM {name}").fetchone()[0]
+                iterator = iter(records)
+                while True:
+                    batch = list(itertools.islice(iterator, batch_size))
+                    if not batch:
+                        break
+                    cur.executemany(
+                        f"INSERT INTO {name} (position, id, category_id, sort_order, data) VALUES (?, ?, ?, ?, ?)",
+                        ((position + i,) + self._columns(record) for i, record in enumerate(batch))
+                    )
+                    position += len(batch)
+                    appended += len(batch)
+                cur.execute("INSERT OR IGNORE INTO collections (name, kind) VALUES (?, 'list')", (name,))
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+        logging.info(f"В коллекцию {name} дописано записей: {appended}")
+        return appended
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_json_to_sqlite(backend: SQLiteBackend, data_dir: str = "data") -> list:
+    """Однократный перенос data/*.json в SQLite. Возвращает список перенесённых коллекций"""
+    migrated = []
+    with backend._lock:
+        cur = backend._conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            for name in backend.LIST_COLLECTIONS + backend.DICT_COLLECTIONS:
+                file_path = os.path.join(data_dir, f"{name}.json")
+                if not os.path.exists(file_path):
+                    continue
+                data = backend.fallback.load(file_path)
+                if data is None:
+                    continue
+                backend._write_collection(cur, name, data)
+                migrated.append(name)
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+    logging.info(f"Перенесены в {backend.db_path}: {', '.join(migrated) or 'нет данных'}")
+    return migrated
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(name: str, data_dir: str = "data"):
+    """Создание бэкенда хранения по имени ("json" или "sqlite") для каталогов data_dir"""
+    if name == "sqlite":
+        return SQLiteBackend(os.getenv("LAUNCHER_DB", "launcher.db"), data_dir)
+    if name == "json":
+        return JsonFileBackend()
+    raise ValueError(f"Неизвестный бэкенд хранения: {name}")
+
+
+def get_backend():
+    """Текущий бэкенд хранения; выбирается переменной окружения LAUNCHER_STORAGE"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(os.getenv("LAUNCHER_STORAGE", "json"))
+                logging.info(f"Бэкенд хранения: {_backend.name}")
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """Явная установка бэкенда хранения"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+if __name__ == "__main__":
+    # python -m utils.storage [launcher.db] — перенос data/*.json в SQLite
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "launcher.db"
+    logging.basicConfig(level=logging.INFO)
+    sqlite_backend = SQLiteBackend(db_path)
+    migrate_json_to_sqlite(sqlite_backend)
+    sqlite_backend.close()
@@ -0,0 +1,91 @@
+import logging
+import re
+
+from PyQt6.QtWidgets import QWidget
+
+from utils.helpers import resource_path
+
+STYLESHEET_PATH = "assets/styles.qss"
+
+# Переменные таблицы стилей ($имя в styles.qss)
+PALETTE = {
+    "accent": "#4682B4",
+    "primary": "#4CAF50",
+    "primary_hover": "#45A049",
+}
+
+_VARIABLE = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
+
+
+class StyleManager:
+    """Единая таблица стилей приложения.
+
+    styles.qss собирается (подстановка переменных палитры) один раз и
+    ставится на QApplication; виджеты получают оформление через
+    objectName и динамическое свойство role, без собственных setStyleSheet.
+    """
+
+    def __init__(self, path=STYLESHEET_PATH, palette=None):
+        self.path = path
+        self.palette = dict(PALETTE, **(palette or {}))
+        self._compiled = None
+
+    def compile(self):
+        """Собранная таблица стилей (кэшируется)"""
+        if self._compiled is None:
+            try:
+                with open(resource_path(self.path), "r", encoding="utf-8") as file:
+                    source = file.read()
+            except OSError as e:
+                logging.error(f"Не удалось загрузить таблицу стилей {self.path}: {e}")
+                source = ""
+            self._compiled = _VARIABLE.sub(self._substitute, source)
+        return self._compiled
+
+    def _substitute(self, match):
+        name = match.group(1)
+        if name not in self.palette:
+            logging.warning(f"Неизвестная переменная стиля: ${name}")
+            return match.group(0)
+        return self.palette[name]
+
+    def apply(self, app):
+        """Поставить таблицу стилей на приложение"""
+        app.setStyleSheet(self.compile())
+
+    def reload(self, app):
+        """Перечитать styles.qss и применить заново"""
+        self._compiled = None
+        self.apply(app)
+
+
+def set_role(widget, role):
+    """Назначить виджету роль для селектора [role="..."]"""
+    widget.setProperty("role", role)
+    return widget
+
+
+def set_property(widget, name, value):
+    """Изменить динамическое свойство уже показанного виджета и обновить его стиль"""
+    widget.setProperty(name, value)
+    repolish(widget)
+
+
+def repolish(widget):
+    """Пересчитать стиль виджета и его потомков после смены свойств"""
+    style = widget.style()
+    for child in [widget] + widget.findChildren(QWidget):
+        style.unpolish(child)
+        style.polish(child)
+        child.update()
+
+
+_manager = StyleManager()
+
+
+def get_style_manager():
+    return _manager
+
+
+def apply(app):
+    _manager.apply(app)
@@ -0,0 +1,140 @@
+import atexit
+import logging
+import os
+import threading
+import time
+
+from utils.file_cache import copy_data
+from utils.storage import get_backend
+
+
+class WriteBehindQueue:
+    """Отложенная запись файлов с объединением изменений.
+
+    Все изменения одного файла, пришедшие в течение окна window (секунды),
+    превращаются в одну запись последней версии данных на фоновом потоке.
+    Пока запись не выполнена, pending() отдаёт ожидающие данные, поэтому
+    чтение через load_json видит несохранённые изменения.
+    """
+
+    def __init__(self, writer=None, window=0.5):
+        self.window = window
+        self._writer = writer or (lambda path, data: get_backend().save(path, data))
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending = {}  # абсолютный путь -> (путь, данные)
+        self._inflight = {}
+        self._deadline = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, file_path, data):
+        """Поставить запись в очередь; предыдущая ожидающая версия файла заменяется"""
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Очередь записи остановлена")
+            # Копия: фоновая запись не должна видеть последующих правок
+            self._pending[os.path.abspath(file_path)] = (file_path, copy_data(data))
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.window
+                self._cond.notify()
+
+    def pending(self, file_path):
+        """(True, данные), если для файла есть несохранённая версия, иначе (False, None)"""
+        key = os.path.abspath(file_path)
+        with self._cond:
+            for source in (self._pending, self._inflight):
+                if key in source:
+                    return True, source[key][1]
+        return False, None
+
+    def _take(self):
+        batch = self._pending
+        self._pending = {}
+        self._deadline = None
+        self._inflight.update(batch)
+        return batch
+
+    def _write(self, batch):
+        for key, (file_path, data) in batch.items():
+            try:
+                self._writer(file_path, data)
+            except Exception as e:
+                logging.error(f"Ошибка отложенной записи {file_path}: {e}")
+            finally:
+                with self._cond:
+                    if self._inflight.get(key, (None, None))[1] is data:
+                        del self._inflight[key]
+
+    def _drain(self):
+        """Забрать ожидающие версии и записать их.
+
+        Взятие и запись идут под одной блокировкой записи: пачка, взятая
+        позже, не может быть записана раньше взятой до неё, и старая версия
+        файла не перезапишет новую.
+        """
+        with self._write_lock:
+            with self._cond:
+                batch = self._take()
+            self._write(batch)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped and (self._deadline is None or time.monotonic() < self._deadline):
+                    timeout = None if self._deadline is None else self._deadline - time.monotonic()
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+            self._drain()
+
+    def flush(self):
+        """Синхронно записать всё, что ожидает в очереди"""
+        self._drain()
+
+    def stop(self):
+        """Записать оставшееся и остановить фоновый поток"""
+        with self._cond:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+
+
+_queue = None
+
+
+def start(window=None):
+    """Включить отложенную запись; окно по умолчанию — LAUNCHER_WRITE_DELAY_MS (500 мс)"""
+    global _queue
+    if _queue is None:
+        if window is None:
+            window = int(os.getenv("LAUNCHER_WRITE_DELAY_MS", "500")) / 1000
+        _queue = WriteBehindQueue(window=window)
+        logging.info(f"Отложенная запись включена, окно {window:.3f} с")
+    return _queue
+
+
+def get_queue():
+    """Активная очередь отложенной записи или None"""
+    return _queue
+
+
+def flush():
+    """Записать все ожидающие изменения (вызывается при завершении)"""
+    if _queue is not None:
+        _queue.flush()
+
+
+def stop():
+    """Остановить очередь, предварительно записав все изменения"""
+    global _queue
+    if _queue is not None:
+        _queue.stop()
+        _queue = None
+
+
+atexit.register(stop)